@@ -0,0 +1,223 @@
+# aura_engine/context_manager.py
+#
+# This module keeps Aurora's working chat history inside a bounded token
+# budget. Every message carries an estimated token count. When the budget is
+# exceeded, the oldest turns are folded into a rolling summary, while the
+# system prompt and the most recent turns are always kept verbatim. This stops
+# prompt-processing cost from growing with the length of a session.
+#
+# Retrieved long-term memories are injected only into the current request and
+# are never stored in the history, so they are not re-processed on every
+# later turn.
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import CONTEXT_TOKEN_BUDGET, CONTEXT_KEEP_RECENT_TURNS, CONTEXT_SUMMARY_MAX_TOKENS
+
+# Compaction shrinks the history to this fraction of the budget, so it does
+# not have to run again on the very next turn.
+_COMPACTION_TARGET_RATIO = 0.75
+
+# Summarizer signature: (previous_summary, turns_to_fold_in) -> new_summary
+HistorySummarizer = Callable[[str, List[Dict]], str]
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the token count of a string without a round trip to the server.
+    Uses the common heuristic of roughly four characters per token.
+    """
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
+
+class ContextWindowManager:
+    """
+    Holds the system prompt, a rolling summary of older turns and the recent
+    turns verbatim, and builds a fresh `lms.Chat` from them for every request.
+    """
+    def __init__(
+        self,
+        system_prompt: str,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        keep_recent_turns: int = CONTEXT_KEEP_RECENT_TURNS,
+        summary_max_tokens: int = CONTEXT_SUMMARY_MAX_TOKENS,
+        summarizer: Optional[HistorySummarizer] = None,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ):
+        """
+        Args:
+            system_prompt (str): Aurora's system prompt. It is never compacted.
+            token_budget (int): The maximum estimated size of the history, in tokens.
+            keep_recent_turns (int): The number of most recent turns always kept verbatim.
+            summary_max_tokens (int): The maximum size of the rolling summary, in tokens.
+            summarizer (Callable): Folds old turns into the rolling summary. If it is
+                missing or fails, a simple extractive summary is used instead.
+            token_counter (Callable): Returns the token count of a string.
+        """
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self.summary_max_tokens = summary_max_tokens
+        self.summarizer = summarizer
+        self.count_tokens = token_counter
+
+        self.system_tokens = self.count_tokens(system_prompt)
+        self.rolling_summary = ""
+        self.summary_tokens = 0
+        self.turns: List[Dict] = []
+        self.compacted_turn_count = 0
+        self.last_tokens_saved = 0
+        self.total_tokens_saved = 0
+        self.transient_context_tokens_saved = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """The estimated size of the whole history that is sent to the model."""
+        return self.system_tokens + self.summary_tokens + sum(turn["tokens"] for turn in self.turns)
+
+    def messages(self, pending_user_message: Optional[str] = None, transient_context: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Returns the history as (role, content) pairs, optionally ending with a new user message.
+        If a transient context is given, it is attached to the new user message only.
+        """
+        system_content = self.system_prompt
+        if self.rolling_summary:
+            system_content += f"\n\n--- SUMMARY OF EARLIER CONVERSATION ---\n{self.rolling_summary}"
+
+        messages = [("system", system_content)]
+        for turn in self.turns:
+            messages.append(("user", turn["user"]))
+            messages.append(("assistant", turn["assistant"]))
+        if pending_user_message is not None:
+            messages.append(("user", _with_transient_context(pending_user_message, transient_context)))
+        return messages
+
+    def build_chat(self, pending_user_message: Optional[str] = None, transient_context: Optional[str] = None) -> 'lms.Chat':
+        """
+        Builds the `lms.Chat` to send to the model for the current request.
+
+        The transient context (e.g. retrieved long-term memories) is visible to
+        the model for this request only. Each call also counts the context
+        tokens of earlier turns that would otherwise have been re-sent.
+        """
+        if transient_context is not None:
+            self.transient_context_tokens_saved += sum(turn["context_tokens"] for turn in self.turns)
+
+        import lmstudio as lms
+        messages = self.messages(pending_user_message, transient_context)
+        chat = lms.Chat(messages[0][1])
+        for role, content in messages[1:]:
+            if role == "user":
+                chat.add_user_message(content)
+            else:
+                chat.add_assistant_response(content)
+        return chat
+
+    def add_turn(self, user_message: str, assistant_response: str, transient_context: Optional[str] = None) -> int:
+        """
+        Records a finished turn and compacts the history if it is over budget.
+        Only the user's actual message is stored; the transient context is not.
+
+        Returns:
+            int: The number of tokens saved by compaction on this turn (0 if none ran).
+        """
+        self.turns.append({
+            "user": user_message,
+            "assistant": assistant_response,
+            "tokens": self.count_tokens(user_message) + self.count_tokens(assistant_response),
+            "context_tokens": self._transient_overhead(user_message, transient_context),
+        })
+
+        self.last_tokens_saved = 0
+        if self.total_tokens > self.token_budget:
+            self.last_tokens_saved = self._compact()
+            self.total_tokens_saved += self.last_tokens_saved
+        return self.last_tokens_saved
+
+    def _transient_overhead(self, user_message: str, transient_context: Optional[str]) -> int:
+        """The extra tokens the transient context added to a user message."""
+        if transient_context is None:
+            return 0
+        with_context = self.count_tokens(_with_transient_context(user_message, transient_context))
+        return max(0, with_context - self.count_tokens(user_message))
+
+    def _compact(self) -> int:
+        """Folds the oldest turns into the rolling summary until the history fits the target size."""
+        tokens_before = self.total_tokens
+        target = int(self.token_budget * _COMPACTION_TARGET_RATIO)
+
+        compactable = max(0, len(self.turns) - self.keep_recent_turns)
+        to_fold = []
+        remaining = tokens_before
+        while len(to_fold) < compactable and remaining > target:
+            turn = self.turns[len(to_fold)]
+            to_fold.append(turn)
+            remaining -= turn["tokens"]
+
+        if not to_fold:
+            # Only the protected recent turns remain; there is nothing we may compact.
+            return 0
+
+        new_summary = self._summarize(to_fold)
+        new_summary_tokens = self.count_tokens(new_summary)
+        # Folding in turns must never make the history bigger than it was.
+        if new_summary_tokens >= self.summary_tokens + sum(turn["tokens"] for turn in to_fold):
+            return 0
+
+        self.rolling_summary = new_summary
+        self.summary_tokens = new_summary_tokens
+        self.turns = self.turns[len(to_fold):]
+        self.compacted_turn_count += len(to_fold)
+        return tokens_before - self.total_tokens
+
+    def _summarize(self, turns: List[Dict]) -> str:
+        """Produces the new rolling summary, falling back to an extractive summary on failure."""
+        summary = None
+        if self.summarizer:
+            try:
+                summary = self.summarizer(self.rolling_summary, turns)
+            except Exception as e:
+                print(f"   ⚠️ History summarization failed: {e}. Falling back to a basic summary.")
+
+        if not summary or not summary.strip():
+            lines = [self.rolling_summary] if self.rolling_summary else []
+            for turn in turns:
+                lines.append(f"Ben said: '{_first_sentence(turn['user'])}'. Aurora replied: '{_first_sentence(turn['assistant'])}'.")
+            summary = "\n".join(lines)
+
+        return self._truncate_summary(summary.strip())
+
+    def _truncate_summary(self, summary: str) -> str:
+        """Keeps the most recent part of the summary if it exceeds its token limit."""
+        if self.count_tokens(summary) <= self.summary_max_tokens:
+            return summary
+        lines = summary.split("\n")
+        while len(lines) > 1 and self.count_tokens("\n".join(lines)) > self.summary_max_tokens:
+            lines.pop(0)
+        summary = "\n".join(lines)
+        # A single oversized line is cut down by characters as a last resort.
+        while summary and self.count_tokens(summary) > self.summary_max_tokens:
+            summary = summary[len(summary) // 4:]
+        return summary
+
+
+def _with_transient_context(user_message: str, transient_context: Optional[str]) -> str:
+    """Prefixes a user message with the long-term memory context for the current request."""
+    if transient_context is None:
+        return user_message
+    return (
+        f"--- LONG-TERM MEMORY CONTEXT ---\n{transient_context}\n--------------------\n\n"
+        f"Ben's current prompt is: \"{user_message}\" "
+    )
+
+
+def _first_sentence(text: str, max_chars: int = 160) -> str:
+    """Returns the first sentence of a message, capped at a maximum length."""
+    text = " ".join(text.split())
+    for terminator in (". ", "! ", "? "):
+        index = text.find(terminator)
+        if index != -1:
+            text = text[:index + 1]
+            break
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "..."
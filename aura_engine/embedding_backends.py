@@ -0,0 +1,141 @@
+# aura_engine/embedding_backends.py
+#
+# Pluggable embedding backends for the MemoryManager. Every backend turns a
+# list of texts into one vector per text and names the model it uses, which
+# the embedding cache uses to keep vectors from different models apart.
+#
+#   - "lmstudio": the embedding model served by LM Studio (the default).
+#   - "sentence_transformers": an in-process model on the CPU, encoded in
+#     batches on a small thread pool. No server round trip.
+#   - "hashing": a deterministic feature-hashing embedder with no model at all.
+#     It is meant for tests and benchmarks that must run without a server.
+#
+# The backend is chosen with EMBEDDING_BACKEND in config.py.
+
+import hashlib
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+from config import (
+    EMBEDDING_BACKEND, EMBEDDING_MODEL_IDENTIFIER,
+    SENTENCE_TRANSFORMER_MODEL, SENTENCE_TRANSFORMER_DEVICE,
+    EMBEDDING_BATCH_SIZE, EMBEDDING_WORKERS, HASHING_EMBEDDING_DIMENSIONS
+)
+
+class EmbeddingBackend:
+    """The interface shared by all embedding backends."""
+    name = "base"
+    model_id = ""
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Returns one vector per text, in order."""
+        raise NotImplementedError
+
+    def close(self):
+        """Releases the backend's resources."""
+
+
+class LMStudioEmbeddingBackend(EmbeddingBackend):
+    """Embeds through the embedding model served by LM Studio."""
+    name = "lmstudio"
+
+    def __init__(self, client: 'lms.Client', identifier: str = EMBEDDING_MODEL_IDENTIFIER):
+        self.model_id = identifier
+        self.model = client.embedding.model(identifier)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        # Use correct LM Studio SDK embedding method signature
+        embedding_response = self.model.embed(texts)
+        # Extract the embedding vectors directly from the response
+        return [vector if isinstance(vector, list) else vector.embedding for vector in embedding_response]
+
+
+class SentenceTransformerEmbeddingBackend(EmbeddingBackend):
+    """
+    Embeds in-process with sentence-transformers. Large requests are split into
+    batches that are encoded in parallel; the model releases the GIL while it
+    computes, so the batches really run side by side.
+    """
+    name = "sentence_transformers"
+
+    def __init__(
+        self,
+        model_name: str = SENTENCE_TRANSFORMER_MODEL,
+        device: str = SENTENCE_TRANSFORMER_DEVICE,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        workers: int = EMBEDDING_WORKERS,
+    ):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_id = f"sentence-transformers:{model_name}"
+        self.batch_size = max(1, batch_size)
+        self.model = SentenceTransformer(model_name, device=device)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="embedding")
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True)
+        return [vector.tolist() for vector in vectors]
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) <= self.batch_size:
+            return self._encode(texts)
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        vectors = []
+        for batch_vectors in self.executor.map(self._encode, batches):
+            vectors.extend(batch_vectors)
+        return vectors
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    A deterministic embedder based on feature hashing. Words and character
+    trigrams are hashed into signed buckets and the result is L2-normalized, so
+    texts that share words are close to each other. It needs no model and no
+    server, and the same text always gets the same vector.
+    """
+    name = "hashing"
+
+    def __init__(self, dimensions: int = HASHING_EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+        self.model_id = f"hashing-{dimensions}"
+
+    def _features(self, text: str) -> List[str]:
+        words = re.findall(r"\w+", text.lower())
+        trigrams = [f"#{word[i:i + 3]}" for word in words for i in range(max(1, len(word) - 2))]
+        return words + trigrams
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else vector
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+
+def create_embedding_backend(backend: str = EMBEDDING_BACKEND, client: Optional[Any] = None) -> EmbeddingBackend:
+    """
+    Creates the embedding backend named in the config.
+
+    Args:
+        backend (str): "lmstudio", "sentence_transformers" or "hashing".
+        client (lms.Client): The LM Studio client. Required for the "lmstudio" backend.
+    """
+    if backend == "lmstudio":
+        if client is None:
+            raise ValueError("The 'lmstudio' embedding backend requires an LM Studio client.")
+        return LMStudioEmbeddingBackend(client)
+    if backend == "sentence_transformers":
+        return SentenceTransformerEmbeddingBackend()
+    if backend == "hashing":
+        return HashingEmbeddingBackend()
+    raise ValueError(f"Unknown embedding backend '{backend}'. Expected 'lmstudio', 'sentence_transformers' or 'hashing'.")
@@ -0,0 +1,173 @@
+# aura_engine/embedding_cache.py
+#
+# A persistent, content-addressed cache for embedding vectors. Vectors are
+# keyed by the embedding model id and a SHA-256 hash of the normalized text, so
+# repeated greetings, re-ingested facts and repeated queries are embedded only
+# once. Lookups go through an in-memory LRU first and fall back to a small
+# SQLite file that stores each vector as packed float32 bytes.
+#
+# Each cache instance reads and writes the vectors of one embedding model, so
+# vectors from two models are never mixed. Several models can share the file:
+# switching models (e.g. during an embedding migration, or back again) keeps
+# the vectors of the others.
+
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from config import EMBEDDING_CACHE_MEMORY_ENTRIES
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes Unicode and collapses whitespace, so texts that only differ in
+    spacing share a vector. Case is kept, because the model sees it.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_key(text: str) -> str:
+    """Returns the content address of a text: the SHA-256 hex digest of its normalized form."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    An LRU of embedding vectors backed by SQLite.
+
+    The cache is safe to use from the chat loop and the background memory
+    pipeline at the same time.
+    """
+    def __init__(
+        self,
+        model_id: str,
+        path: Optional[str] = None,
+        max_memory_entries: int = EMBEDDING_CACHE_MEMORY_ENTRIES,
+    ):
+        """
+        Args:
+            model_id (str): The embedding model the cached vectors belong to.
+            path (str): The SQLite file. None keeps the cache in memory only.
+            max_memory_entries (int): The size of the in-memory LRU.
+        """
+        self.model_id = model_id
+        self.path = path
+        self.max_memory_entries = max(0, max_memory_entries)
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open(path) if path else None
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        """Opens the SQLite store, creating it if it does not exist yet."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model_id TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model_id, text_hash))"
+        )
+        db.commit()
+        return db
+
+    def get_many(self, texts: List[str]) -> Dict[int, List[float]]:
+        """
+        Looks up several texts at once.
+
+        Returns:
+            Dict[int, List[float]]: The cached vectors, keyed by the text's position.
+            Positions that are missing from the result must be embedded.
+        """
+        keys = [text_key(text) for text in texts]
+        found: Dict[int, List[float]] = {}
+        with self._lock:
+            missing = []
+            for position, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[position] = vector
+                else:
+                    missing.append(position)
+
+            if missing and self._db is not None:
+                stored = self._load([keys[position] for position in missing])
+                for position in missing:
+                    vector = stored.get(keys[position])
+                    if vector is not None:
+                        found[position] = vector
+                        self._remember(keys[position], vector)
+
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]):
+        """Stores freshly computed vectors for the given texts."""
+        keys = [text_key(text) for text in texts]
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, list(vector))
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model_id, text_hash, vector) VALUES (?, ?, ?)",
+                    [(self.model_id, key, array("f", vector).tobytes()) for key, vector in zip(keys, vectors)]
+                )
+                self._db.commit()
+
+    def _load(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Reads this model's vectors from SQLite in chunks that stay below SQLite's parameter limit."""
+        stored = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model_id = ? AND text_hash IN ({placeholders})",
+                [self.model_id] + chunk
+            ).fetchall()
+            for key, blob in rows:
+                vector = array("f")
+                vector.frombytes(blob)
+                stored[key] = vector.tolist()
+        return stored
+
+    def _remember(self, key: str, vector: List[float]):
+        """Adds a vector to the in-memory LRU, evicting the least recently used entry."""
+        if self.max_memory_entries == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the hit/miss counters and the number of vectors cached for this model."""
+        with self._lock:
+            stored = (self._db.execute("SELECT COUNT(*) FROM embeddings WHERE model_id = ?", (self.model_id,)).fetchone()[0]
+                      if self._db else len(self._memory))
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "memory_entries": len(self._memory),
+                "stored_entries": stored,
+            }
+
+    def close(self):
+        """Closes the SQLite store."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
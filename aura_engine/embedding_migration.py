@@ -0,0 +1,224 @@
+# aura_engine/embedding_migration.py
+#
+# Re-embeds long-term memory when the embedding model changes. Vectors from
+# two models cannot be compared, so every memory is stamped with the id of the
+# model that embedded it (`embedding_model` in its metadata), and a migration
+# rebuilds the whole store with the new model:
+#
+#   1. Memories are re-embedded in batches into a shadow collection named
+#      after the new model. The live collection is never modified, so queries
+#      keep working throughout.
+#   2. After every batch a small checkpoint file records the progress. The
+#      shadow collection itself is the record of what is done, so an
+#      interrupted migration resumes with the memories that are still missing.
+#   3. Memories stored, changed or deleted while the migration ran are caught
+#      up, then the shadow collection becomes the active one by atomically
+#      replacing the pointer file that names it. The old collection is kept.
+#      The last catch-up and the swap run under the MemoryManager's write lock,
+#      so no memory stored in this process can land in the old collection.
+#
+# Other processes that have the same database open (e.g. a running Aurora
+# while the migration runs as a script) notice the new pointer file on their
+# next write. If they embed with the new model, they switch to the new
+# collection; otherwise they refuse to write until they are restarted with it.
+# Their writes between the last catch-up and the swap are not caught up, so
+# stop Aurora before migrating from another process.
+
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import ACTIVE_COLLECTION_FILENAME, MIGRATION_CHECKPOINT_FILENAME, MIGRATION_BATCH_SIZE
+from .vector_stores import NumpyVectorStore, VectorStore, create_vector_store
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def write_json_atomic(path: str, data: Dict[str, Any]):
+    """Writes a JSON file through a temporary file and a rename, so readers never see a partial file."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file, indent=2)
+        json_file.flush()
+        os.fsync(json_file.fileno())
+    os.replace(temp_path, path)
+
+
+def read_active_pointer(db_path: str) -> Optional[Dict[str, Any]]:
+    """Returns the pointer file of the last completed migration (`collection`, `embedding_model`, ...), or None."""
+    return _read_json(os.path.join(db_path, ACTIVE_COLLECTION_FILENAME))
+
+
+def read_active_collection(db_path: str, default: str) -> str:
+    """Returns the name of the active collection, as recorded by the last completed migration."""
+    pointer = read_active_pointer(db_path)
+    return pointer["collection"] if pointer else default
+
+
+def migration_status(db_path: str) -> Optional[Dict[str, Any]]:
+    """Returns the checkpoint of an unfinished migration, or None."""
+    return _read_json(os.path.join(db_path, MIGRATION_CHECKPOINT_FILENAME))
+
+
+def shadow_collection_name(base: str, model_id: str) -> str:
+    """The collection that holds `base` re-embedded with a model. Valid for ChromaDB and as a directory name."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", model_id).strip("-")[:40]
+    digest = hashlib.sha1(model_id.encode("utf-8")).hexdigest()[:8]
+    return f"{base}-{slug}-{digest}"
+
+
+def open_store_like(memory_manager: 'MemoryManager', name: str) -> VectorStore:
+    """Opens a store of the same kind as the active one."""
+    backend = "native" if isinstance(memory_manager.collection, NumpyVectorStore) else "chroma"
+    return create_vector_store(memory_manager.db_path, name, backend=backend)
+
+
+def _migrate_batch(source: VectorStore, target: VectorStore, backend: 'EmbeddingBackend', doc_ids: List[str]) -> int:
+    """
+    Copies a batch into the target store. Memories that were already embedded
+    with the target model keep their vectors; the rest are re-embedded.
+    """
+    records = source.get(ids=doc_ids, include=["documents", "metadatas", "embeddings"])
+    if not records["ids"]:
+        return 0
+    metadatas = [dict(metadata or {}) for metadata in records["metadatas"]]
+    stale = [i for i, metadata in enumerate(metadatas) if metadata.get("embedding_model") != backend.model_id]
+    vectors = list(np.asarray(records["embeddings"], dtype=np.float32))
+    if stale:
+        fresh = backend.embed([records["documents"][i] for i in stale])
+        if len(fresh) != len(stale):
+            raise ValueError(f"Expected {len(stale)} embeddings, received {len(fresh)}.")
+        for i, vector in zip(stale, fresh):
+            vectors[i] = vector
+    for metadata in metadatas:
+        metadata["embedding_model"] = backend.model_id
+    target.upsert(ids=records["ids"], embeddings=np.asarray(vectors, dtype=np.float32),
+                  documents=records["documents"], metadatas=metadatas)
+    return len(records["ids"])
+
+
+def _sync_metadatas(source: VectorStore, target: VectorStore, model_id: str) -> int:
+    """Copies metadata that changed in the source while the migration ran, e.g. by compaction."""
+    source_records = source.get(include=["metadatas"])
+    target_records = target.get(include=["metadatas"])
+    target_metadatas = dict(zip(target_records["ids"], target_records["metadatas"]))
+    ids, metadatas = [], []
+    for doc_id, metadata in zip(source_records["ids"], source_records["metadatas"]):
+        wanted = {**(metadata or {}), "embedding_model": model_id}
+        if doc_id in target_metadatas and target_metadatas[doc_id] != wanted:
+            ids.append(doc_id)
+            metadatas.append(wanted)
+    if ids:
+        target.update(ids=ids, metadatas=metadatas)
+    return len(ids)
+
+
+def _catch_up(source: VectorStore, target: VectorStore, backend: 'EmbeddingBackend', batch_size: int,
+              checkpoint: Dict[str, Any], checkpoint_path: str, report: Dict[str, Any]) -> int:
+    """
+    One pass of copying the memories that are missing from the target and
+    removing those deleted from the source. Returns the number of memories copied.
+    """
+    source_ids = source.get(include=[])["ids"]
+    target_ids = set(target.get(include=[])["ids"])
+    current = set(source_ids)
+    deleted = [doc_id for doc_id in target_ids if doc_id not in current]
+    if deleted:
+        target.delete(ids=deleted)
+    pending = [doc_id for doc_id in source_ids if doc_id not in target_ids]
+    if not pending:
+        return 0
+    print(f"-> {len(pending)} memories to re-embed in batches of {batch_size}...")
+    copied_total = 0
+    for batch_start in range(0, len(pending), batch_size):
+        copied = _migrate_batch(source, target, backend, pending[batch_start:batch_start + batch_size])
+        copied_total += copied
+        report["migrated"] += copied
+        checkpoint["migrated"] += copied
+        checkpoint["updated"] = datetime.now().isoformat()
+        write_json_atomic(checkpoint_path, checkpoint)
+        print(f"   -> {checkpoint['migrated']}/{len(source_ids)} memories migrated.")
+    return copied_total
+
+
+def migrate_embeddings(
+    memory_manager: 'MemoryManager',
+    target_backend: Optional['EmbeddingBackend'] = None,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    swap: bool = True,
+) -> Dict[str, Any]:
+    """
+    Re-embeds every memory with the target model into a shadow collection and,
+    when complete, makes it the active collection. Running it again after an
+    interruption resumes where it stopped.
+
+    Args:
+        memory_manager (MemoryManager): The memory store to migrate. It keeps serving queries meanwhile.
+        target_backend (EmbeddingBackend): The new embedding model. Defaults to the manager's own backend,
+            which is the case after EMBEDDING_BACKEND or EMBEDDING_MODEL_IDENTIFIER was changed.
+        batch_size (int): Memories embedded and written per batch (and per checkpoint).
+        swap (bool): Make the shadow collection active when it is complete.
+
+    Returns:
+        Dict: `target` (collection name), `migrated` (memories copied in this run),
+              `total` (memories in the store), `swapped` and `seconds`.
+    """
+    start = time.perf_counter()
+    backend = target_backend or memory_manager.embedding_backend
+    source = memory_manager.collection
+    target_name = shadow_collection_name(memory_manager.base_collection_name, backend.model_id)
+    report = {"target": target_name, "migrated": 0, "total": source.count(), "swapped": False, "seconds": 0.0}
+    print(f"\n--- Migrating Memory Embeddings to '{backend.model_id}' ---")
+    if source.name == target_name:
+        print("   ✅ The active collection already belongs to this model.")
+        return report
+
+    checkpoint_path = os.path.join(memory_manager.db_path, MIGRATION_CHECKPOINT_FILENAME)
+    checkpoint = migration_status(memory_manager.db_path)
+    if checkpoint and checkpoint["target"] == target_name:
+        print(f"-> Resuming the migration started {checkpoint['started']} ({checkpoint['migrated']} memories done).")
+    else:
+        if checkpoint:
+            print(f"   ⚠️ Abandoning the unfinished migration to '{checkpoint['embedding_model']}'.")
+        checkpoint = {"source": source.name, "target": target_name, "embedding_model": backend.model_id,
+                      "started": datetime.now().isoformat(), "migrated": 0}
+        write_json_atomic(checkpoint_path, checkpoint)
+
+    target = open_store_like(memory_manager, target_name)
+    try:
+        # Memories stored meanwhile are caught up without blocking writes, until nothing is missing.
+        while _catch_up(source, target, backend, batch_size, checkpoint, checkpoint_path, report):
+            pass
+        # The last catch-up and the swap hold the write lock, so nothing is stored in between.
+        with memory_manager.write_lock:
+            _catch_up(source, target, backend, batch_size, checkpoint, checkpoint_path, report)
+            _sync_metadatas(source, target, backend.model_id)
+            report["total"] = target.count()
+
+            if swap:
+                write_json_atomic(os.path.join(memory_manager.db_path, ACTIVE_COLLECTION_FILENAME), {
+                    "collection": target_name, "embedding_model": backend.model_id,
+                    "previous": source.name, "switched": datetime.now().isoformat(),
+                })
+                os.remove(checkpoint_path)
+                memory_manager.switch_collection(target, backend)
+                report["swapped"] = True
+    finally:
+        if not report["swapped"]:
+            target.close()
+
+    report["seconds"] = time.perf_counter() - start
+    outcome = f"'{target_name}' is now active" if report["swapped"] else f"'{target_name}' is ready (not activated)"
+    print(f"   ✅ Migrated {report['migrated']} memories in {report['seconds']:.2f}s; {outcome}. "
+          f"The previous collection '{source.name}' was kept.")
+    return report
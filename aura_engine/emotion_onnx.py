@@ -0,0 +1,132 @@
+# aura_engine/emotion_onnx.py
+#
+# A CPU backend for the go_emotions classifier that runs an exported ONNX
+# graph through onnxruntime instead of a full-precision PyTorch pipeline. The
+# graph's weights are quantized to int8 with dynamic quantization (activations
+# stay float and are quantized on the fly), which shrinks the model to about a
+# quarter of its size and speeds up CPU inference, while the labels above the
+# overlay threshold stay the same.
+#
+# The export needs PyTorch once. Afterwards only onnxruntime and the tokenizer
+# are loaded, so a machine that also runs TTS keeps its memory for that.
+#
+# Usage (export ahead of time; otherwise it happens on first use):
+#   python aura_engine/emotion_onnx.py
+#   python aura_engine/emotion_onnx.py --no-quantize
+
+import json
+import os
+import sys
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Add project root to path to allow direct script execution
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import EMOTION_MODEL_IDENTIFIER, EMOTION_ONNX_DIR, EMOTION_ONNX_QUANTIZE
+
+_MODEL_FILENAME = "model.onnx"
+_QUANTIZED_FILENAME = "model.int8.onnx"
+_LABELS_FILENAME = "labels.json"
+# The longest input RoBERTa accepts; longer texts are truncated, as in the pipeline.
+_MAX_TOKENS = 512
+
+def export_onnx_model(model_id: str = EMOTION_MODEL_IDENTIFIER, output_dir: str = EMOTION_ONNX_DIR,
+                      quantize: bool = EMOTION_ONNX_QUANTIZE) -> str:
+    """
+    Exports the Hugging Face classifier to ONNX, with dynamic int8 weights if
+    requested, and saves the tokenizer and labels next to it.
+
+    Returns:
+        str: The path of the graph to load.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    print(f"-> Exporting '{model_id}' to ONNX in '{output_dir}'...")
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSequenceClassification.from_pretrained(model_id).eval()
+    sample = tokenizer(["A sample sentence for the export."], return_tensors="pt")
+    model_path = os.path.join(output_dir, _MODEL_FILENAME)
+    with torch.no_grad():
+        torch.onnx.export(
+            model, (sample["input_ids"], sample["attention_mask"]), model_path,
+            input_names=["input_ids", "attention_mask"], output_names=["logits"],
+            dynamic_axes={"input_ids": {0: "batch", 1: "sequence"},
+                          "attention_mask": {0: "batch", 1: "sequence"},
+                          "logits": {0: "batch"}},
+            opset_version=14,
+        )
+    tokenizer.save_pretrained(output_dir)
+    labels = [model.config.id2label[i] for i in range(model.config.num_labels)]
+    with open(os.path.join(output_dir, _LABELS_FILENAME), "w", encoding="utf-8") as labels_file:
+        json.dump(labels, labels_file)
+
+    if not quantize:
+        print("✅ ONNX export complete (float32).")
+        return model_path
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = os.path.join(output_dir, _QUANTIZED_FILENAME)
+    quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    print(f"✅ ONNX export complete: {os.path.getsize(model_path) / 1e6:.0f} MB float32, "
+          f"{os.path.getsize(quantized_path) / 1e6:.0f} MB int8.")
+    return quantized_path
+
+
+class OnnxEmotionClassifier:
+    """
+    Scores texts with the exported ONNX graph. Called like the transformers
+    pipeline with `top_k=None`: one list of {'label', 'score'} per text,
+    strongest first, so `process_emotions` can use either backend unchanged.
+    """
+    def __init__(self, model_dir: str = EMOTION_ONNX_DIR, quantized: bool = EMOTION_ONNX_QUANTIZE,
+                 model_id: str = EMOTION_MODEL_IDENTIFIER):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        model_path = os.path.join(model_dir, _QUANTIZED_FILENAME if quantized else _MODEL_FILENAME)
+        if not os.path.exists(model_path):
+            model_path = export_onnx_model(model_id, model_dir, quantize=quantized)
+        self.model_path = model_path
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        with open(os.path.join(model_dir, _LABELS_FILENAME), "r", encoding="utf-8") as labels_file:
+            self.labels: List[str] = json.load(labels_file)
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+
+    def scores(self, texts: Sequence[str], truncation: bool = True) -> np.ndarray:
+        """Returns the (n, labels) matrix of sigmoid scores for one padded batch."""
+        encoded = self.tokenizer(list(texts), padding=True, truncation=truncation,
+                                 max_length=_MAX_TOKENS, return_tensors="np")
+        logits = self.session.run(["logits"], {
+            "input_ids": encoded["input_ids"].astype(np.int64),
+            "attention_mask": encoded["attention_mask"].astype(np.int64),
+        })[0]
+        # go_emotions is a multi-label model, so every label is scored independently.
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def __call__(self, texts, batch_size: int = None, truncation: bool = True) -> List[List[Dict[str, float]]]:
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        batch_size = batch_size or len(texts) or 1
+        results = []
+        for start in range(0, len(texts), batch_size):
+            for row in self.scores(texts[start:start + batch_size], truncation):
+                order = np.argsort(-row)
+                results.append([{'label': self.labels[i], 'score': float(row[i])} for i in order])
+        return results
+
+
+# --- Main Execution Block for Standalone Script ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export the go_emotions classifier to (quantized) ONNX.")
+    parser.add_argument("--model", default=EMOTION_MODEL_IDENTIFIER, help="The Hugging Face model to export.")
+    parser.add_argument("--output", default=EMOTION_ONNX_DIR, help="The directory of the exported model.")
+    parser.add_argument("--no-quantize", action="store_true", help="Keep float32 weights.")
+    args = parser.parse_args()
+    export_onnx_model(args.model, args.output, quantize=not args.no_quantize)
@@ -0,0 +1,126 @@
+# aura_engine/emotion_vectors.py
+#
+# Fixed-size emotion vectors for the "Emotional Anchor". Every memory stores
+# the full 28-label go_emotions distribution of the turn it came from as a
+# compact float16 vector (base64 in the `emotion_vector` metadata field), next
+# to the human-readable `emotions` JSON. Aurora keeps a running emotional
+# state, and retrieval can blend semantic relevance with how closely each
+# candidate's emotion vector matches that state. All scoring is done with
+# NumPy matrix operations over the whole candidate set.
+
+import base64
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import EMOTION_STATE_SMOOTHING
+
+# The output labels of SamLowe/roberta-base-go_emotions, in the model's order.
+EMOTION_LABELS = (
+    "admiration", "amusement", "anger", "annoyance", "approval", "caring", "confusion",
+    "curiosity", "desire", "disappointment", "disapproval", "disgust", "embarrassment",
+    "excitement", "fear", "gratitude", "grief", "joy", "love", "nervousness", "optimism",
+    "pride", "realization", "relief", "remorse", "sadness", "surprise", "neutral",
+)
+EMOTION_DIMENSIONS = len(EMOTION_LABELS)
+_LABEL_INDEX = {label: index for index, label in enumerate(EMOTION_LABELS)}
+# The bytes of one encoded vector: 28 float16 values.
+_VECTOR_BYTES = EMOTION_DIMENSIONS * 2
+
+def scores_to_vector(scores: Dict[str, float]) -> np.ndarray:
+    """Turns a label -> score mapping into a 28-dim float32 vector. Unknown labels are ignored."""
+    vector = np.zeros(EMOTION_DIMENSIONS, dtype=np.float32)
+    for label, score in scores.items():
+        index = _LABEL_INDEX.get(label)
+        if index is not None:
+            vector[index] = score
+    return vector
+
+
+def encode_vector(vector: np.ndarray) -> str:
+    """Encodes an emotion vector as base64 float16 (76 characters), small enough for metadata."""
+    return base64.b64encode(np.asarray(vector, dtype="<f2").tobytes()).decode("ascii")
+
+
+def decode_vectors(encoded: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Decodes many encoded vectors into one (n, 28) float32 matrix. Missing or
+    malformed entries become zero rows. A zero row has similarity 0 to every
+    state, which is lower than any stored (non-negative) vector scores, so
+    callers must treat zero rows as "no vector" rather than as a low match.
+    """
+    buffer = bytearray(len(encoded) * _VECTOR_BYTES)
+    for row, value in enumerate(encoded):
+        if not value:
+            continue
+        try:
+            raw = base64.b64decode(value)
+        except (ValueError, TypeError):
+            continue
+        if len(raw) == _VECTOR_BYTES:
+            buffer[row * _VECTOR_BYTES:(row + 1) * _VECTOR_BYTES] = raw
+    return np.frombuffer(bytes(buffer), dtype="<f2").reshape(len(encoded), EMOTION_DIMENSIONS).astype(np.float32)
+
+
+def cosine_similarities(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Returns the cosine similarity of every row of `matrix` to `vector`. Zero rows score 0."""
+    row_norms = np.linalg.norm(matrix, axis=1)
+    vector_norm = np.linalg.norm(vector)
+    if vector_norm == 0:
+        return np.zeros(len(matrix), dtype=np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarities = (matrix @ vector) / (row_norms * vector_norm)
+    return np.nan_to_num(similarities, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def blend_scores(relevance: np.ndarray, emotion_similarity: np.ndarray, weight: float,
+                 has_vector: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Blends relevance with emotion similarity. Relevance is scaled to [0, 1] by
+    its maximum first, so `weight` means the same thing for any retriever.
+    Rows where `has_vector` is False (e.g. facts and summaries, which carry no
+    emotion vector) keep their relevance alone, so they are neither promoted
+    nor demoted by the emotional state.
+    """
+    top = relevance.max() if len(relevance) else 0.0
+    normalized = relevance / top if top > 0 else relevance
+    blended = (1 - weight) * normalized + weight * emotion_similarity
+    if has_vector is None:
+        return blended
+    return np.where(has_vector, blended, normalized)
+
+
+class EmotionalState:
+    """
+    Aurora's running emotional state: an exponential moving average of the
+    emotion vectors of her recent responses. Updated from the background
+    pipeline and read by the chat loop.
+    """
+    def __init__(self, smoothing: float = EMOTION_STATE_SMOOTHING):
+        """
+        Args:
+            smoothing (float): The weight of the newest turn, between 0 and 1.
+        """
+        self.smoothing = smoothing
+        self._vector = np.zeros(EMOTION_DIMENSIONS, dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def update(self, vector: np.ndarray):
+        """Blends the emotion vector of a new turn into the state."""
+        with self._lock:
+            if not self._vector.any():
+                self._vector = np.asarray(vector, dtype=np.float32).copy()
+            else:
+                self._vector = (1 - self.smoothing) * self._vector + self.smoothing * vector
+
+    @property
+    def vector(self) -> np.ndarray:
+        with self._lock:
+            return self._vector.copy()
+
+    def dominant(self, count: int = 3) -> List[str]:
+        """Returns the labels of the strongest emotions in the current state."""
+        vector = self.vector
+        order = np.argsort(vector)[::-1][:count]
+        return [EMOTION_LABELS[index] for index in order if vector[index] > 0]
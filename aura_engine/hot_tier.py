@@ -0,0 +1,195 @@
+# aura_engine/hot_tier.py
+#
+# An in-memory "hot tier" in front of the ChromaDB store. Most memories that
+# matter in a live session come from the same session or the last few days,
+# so their embeddings are kept in a preallocated float32 matrix and searched
+# exactly with one matrix-vector product. ChromaDB remains the complete "cold"
+# tier; the hot tier only ever holds copies, so dropping an entry loses nothing.
+#
+# Promotion and demotion:
+#   - New memories enter the hot tier when they are stored, and recent ones are
+#     loaded at start-up.
+#   - A cold memory is promoted once it has been recalled HOT_TIER_PROMOTE_AFTER times.
+#   - Entries that have not been stored or recalled within HOT_TIER_MAX_AGE_HOURS are
+#     demoted. When the tier is full, the entry with the fewest recalls (oldest first)
+#     is demoted to make room.
+#
+# The tier has its own lock and never waits on ChromaDB, so it keeps serving
+# queries while a cold-tier query is in flight.
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import HOT_TIER_MAX_MB, HOT_TIER_MAX_AGE_HOURS, HOT_TIER_PROMOTE_AFTER
+
+class HotTier:
+    """
+    A fixed-capacity matrix of recent, unit-normalized embeddings with exact
+    top-k cosine search. The matrix is allocated on the first insert, when the
+    embedding size is known, and its size never exceeds `max_bytes`.
+    """
+    def __init__(
+        self,
+        max_bytes: int = int(HOT_TIER_MAX_MB * 1024 * 1024),
+        max_age_hours: float = HOT_TIER_MAX_AGE_HOURS,
+        promote_after: int = HOT_TIER_PROMOTE_AFTER,
+    ):
+        """
+        Args:
+            max_bytes (int): The memory ceiling of the embedding matrix.
+            max_age_hours (float): Entries unused for longer than this are demoted.
+            promote_after (int): The number of recalls after which a cold memory is promoted.
+        """
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_hours * 3600
+        self.promote_after = promote_after
+        self.capacity = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._valid = np.zeros(0, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._cold_recalls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._slots
+
+    def capacity_for(self, dimensions: int) -> int:
+        """The number of embeddings of this size that fit under the memory ceiling."""
+        return max(1, self.max_bytes // (dimensions * 4))
+
+    def _allocate(self, dimensions: int):
+        self.capacity = self.capacity_for(dimensions)
+        self._matrix = np.zeros((self.capacity, dimensions), dtype=np.float32)
+        self._valid = np.zeros(self.capacity, dtype=bool)
+        self._ids = [None] * self.capacity
+
+    def add(self, doc_ids: Sequence[str], vectors: Sequence[Sequence[float]],
+            documents: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        """Promotes memories into the hot tier, demoting the least used entries if it is full."""
+        if not doc_ids:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        now = time.time()
+        with self._lock:
+            if self._matrix is None:
+                self._allocate(vectors.shape[1])
+            if vectors.shape[1] != self._matrix.shape[1]:
+                raise ValueError(f"Expected {self._matrix.shape[1]}-dim embeddings, received {vectors.shape[1]}.")
+            for doc_id, vector, document, metadata in zip(doc_ids, vectors, documents, metadatas):
+                slot = self._slots.get(doc_id)
+                if slot is None:
+                    slot = self._free_slot()
+                self._matrix[slot] = vector
+                self._valid[slot] = True
+                self._ids[slot] = doc_id
+                self._slots[doc_id] = slot
+                self._cold_recalls.pop(doc_id, None)
+                self._entries[doc_id] = {"text": document, "metadata": metadata, "recalls": 0, "last_used": now}
+
+    def _free_slot(self) -> int:
+        """Returns an empty slot, demoting the least recalled (then least recently used) entry if needed."""
+        free = np.flatnonzero(~self._valid)
+        if len(free):
+            return int(free[0])
+        victim = min(self._slots, key=lambda doc_id: (self._entries[doc_id]["recalls"], self._entries[doc_id]["last_used"]))
+        return self._drop(victim)
+
+    def _drop(self, doc_id: str) -> int:
+        slot = self._slots.pop(doc_id)
+        self._valid[slot] = False
+        self._ids[slot] = None
+        self._entries.pop(doc_id, None)
+        return slot
+
+    def search(self, query_vector: Sequence[float], k: int) -> List[Tuple[str, float]]:
+        """
+        Returns up to k (doc_id, cosine similarity) pairs, best first.
+        """
+        with self._lock:
+            if self._matrix is None or not self._slots:
+                return []
+            query = np.asarray(query_vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm == 0 or query.shape[0] != self._matrix.shape[1]:
+                return []
+            similarities = self._matrix @ (query / norm)
+            similarities[~self._valid] = -np.inf
+            k = min(k, len(self._slots))
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top], kind="stable")]
+            return [(self._ids[slot], float(similarities[slot])) for slot in top]
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored text and metadata of a hot memory."""
+        with self._lock:
+            entry = self._entries.get(doc_id)
+            return {"id": doc_id, "text": entry["text"], "metadata": entry["metadata"]} if entry else None
+
+    def get_vectors(self, doc_ids: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Returns copies of the unit-normalized embeddings of the hot memories among `doc_ids`."""
+        with self._lock:
+            return {doc_id: self._matrix[self._slots[doc_id]].copy() for doc_id in doc_ids if doc_id in self._slots}
+
+    def record_recalls(self, doc_ids: Sequence[str], cold_vectors: Dict[str, Any], cold_details: Dict[str, Dict[str, Any]]):
+        """
+        Counts recalls. Hot entries are refreshed; cold memories that reach
+        `promote_after` recalls are promoted, using the embedding the cold query returned.
+        """
+        now = time.time()
+        promote = []
+        with self._lock:
+            for doc_id in doc_ids:
+                entry = self._entries.get(doc_id)
+                if entry is not None:
+                    entry["recalls"] += 1
+                    entry["last_used"] = now
+                    continue
+                self._cold_recalls[doc_id] = self._cold_recalls.get(doc_id, 0) + 1
+                if self._cold_recalls[doc_id] >= self.promote_after and doc_id in cold_vectors:
+                    promote.append(doc_id)
+        if promote:
+            self.add(
+                promote, [cold_vectors[doc_id] for doc_id in promote],
+                [cold_details[doc_id]["text"] for doc_id in promote],
+                [cold_details[doc_id]["metadata"] for doc_id in promote],
+            )
+
+    def demote_expired(self, now: Optional[float] = None) -> int:
+        """Demotes entries that have not been stored or recalled within the maximum age."""
+        now = now or time.time()
+        with self._lock:
+            expired = [doc_id for doc_id, entry in self._entries.items() if now - entry["last_used"] > self.max_age_seconds]
+            for doc_id in expired:
+                self._drop(doc_id)
+        return len(expired)
+
+    def remove(self, doc_ids: Sequence[str]):
+        """Drops deleted memories."""
+        with self._lock:
+            for doc_id in doc_ids:
+                self._cold_recalls.pop(doc_id, None)
+                if doc_id in self._slots:
+                    self._drop(doc_id)
+
+    def update_metadatas(self, doc_ids: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        """Keeps the metadata of hot entries in step with the cold tier."""
+        with self._lock:
+            for doc_id, metadata in zip(doc_ids, metadatas):
+                if doc_id in self._entries:
+                    self._entries[doc_id]["metadata"] = metadata
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            used_bytes = len(self._slots) * (self._matrix.shape[1] * 4 if self._matrix is not None else 0)
+            return {"entries": len(self._slots), "capacity": self.capacity, "bytes": used_bytes}
@@ -0,0 +1,158 @@
+# aura_engine/interaction_pipeline.py
+#
+# This module moves the post-turn memory work (raw log, emotional overlay,
+# narrative summary and vector storage) off the interactive path. Finished
+# turns are placed on a bounded queue and processed, strictly in order, by a
+# single background worker thread, so the next prompt is never blocked by
+# memory writes.
+#
+# An optional flush callback runs on the worker thread whenever the pipeline
+# has been idle for a while, and once more when the pipeline is drained. It is
+# used to flush work that is buffered across turns (e.g. batched summaries).
+
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from config import PIPELINE_QUEUE_SIZE
+
+# Sentinels placed on the queue to tell the worker thread to exit, or to run the flush callback.
+_STOP = object()
+_FLUSH = object()
+
+class InteractionPipeline:
+    """
+    A single-worker background queue for finished conversational turns.
+
+    Ordering: one worker thread processes jobs in the order they were submitted.
+    Backpressure: the queue is bounded, so if the worker falls behind, `submit`
+    blocks until a slot frees up instead of letting unprocessed turns pile up.
+    Shutdown: `drain` waits for every submitted turn to be fully processed.
+    """
+    def __init__(
+        self,
+        processor: Callable[..., None],
+        max_pending: int = PIPELINE_QUEUE_SIZE,
+        flush_callback: Optional[Callable[[], None]] = None,
+        idle_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            processor (Callable): The function that does the post-turn work.
+                It is called with the same arguments that were given to `submit`.
+            max_pending (int): The maximum number of turns waiting in the queue.
+            flush_callback (Callable): Flushes work buffered across turns. It runs on
+                the worker thread after `idle_seconds` without new turns, and on drain.
+            idle_seconds (float): How long the worker waits for a new turn before flushing.
+        """
+        self.processor = processor
+        self.flush_callback = flush_callback
+        self.idle_seconds = idle_seconds
+        self.processed_count = 0
+        self.failed_count = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="interaction-pipeline", daemon=True)
+        self._worker.start()
+
+    @property
+    def pending(self) -> int:
+        """The number of submitted turns that have not finished processing."""
+        return self._queue.unfinished_tasks
+
+    def submit(self, *args, **kwargs):
+        """
+        Queues a finished turn for background processing. Blocks if the queue is full.
+        """
+        if self._closed:
+            raise RuntimeError("The interaction pipeline has been shut down.")
+
+        job = (args, kwargs)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            print("[Memory pipeline is busy, waiting for a free slot...]")
+            self._queue.put(job)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every submitted turn has been processed and, if a flush
+        callback is set, until buffered work has been flushed.
+
+        Returns:
+            bool: True if the queue was fully drained, False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self.flush_callback and self._worker.is_alive():
+            # Runs after every turn queued so far, so buffered work is flushed in order.
+            try:
+                self._queue.put(_FLUSH, timeout=timeout)
+            except queue.Full:
+                return False
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops accepting new turns, drains the queue and stops the worker thread.
+
+        Returns:
+            bool: True if all pending work finished before the worker stopped.
+        """
+        if self._closed:
+            return True
+        self._closed = True
+
+        drained = self.drain(timeout)
+        if drained:
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+        else:
+            print(f"   ⚠️ Memory pipeline did not drain in time ({self.pending} turns still pending).")
+        return drained
+
+    def _run(self):
+        """The worker loop. Runs in the background thread."""
+        has_unflushed_work = False
+        while True:
+            wait = self.idle_seconds if (self.flush_callback and has_unflushed_work) else None
+            try:
+                job = self._queue.get(timeout=wait)
+            except queue.Empty:
+                has_unflushed_work = False
+                self._flush()
+                continue
+
+            try:
+                if job is _STOP:
+                    return
+                if job is _FLUSH:
+                    has_unflushed_work = False
+                    self._flush()
+                    continue
+                has_unflushed_work = True
+                args, kwargs = job
+                try:
+                    self.processor(*args, **kwargs)
+                    self.processed_count += 1
+                except Exception as e:
+                    # A failed turn must never take the worker down with it.
+                    self.failed_count += 1
+                    print(f"   ❌ Background memory processing failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _flush(self):
+        """Runs the flush callback. Like a failed turn, a failed flush never stops the worker."""
+        if self.flush_callback is None:
+            return
+        try:
+            self.flush_callback()
+        except Exception as e:
+            print(f"   ❌ Background memory flush failed: {e}")
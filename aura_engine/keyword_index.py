@@ -0,0 +1,159 @@
+# aura_engine/keyword_index.py
+#
+# A persistent BM25 keyword index that sits next to the Chroma collection.
+# Vector similarity is good at paraphrases but weak at exact terms: names,
+# numbers ("18% efficient") and pet names. This index keeps an inverted index
+# of every stored memory in a small SQLite file, so those lookups can be
+# answered by term match and merged with the vector results using
+# reciprocal rank fusion.
+#
+# The index is maintained incrementally: adding or removing a document only
+# touches that document's postings. Nothing is ever rebuilt from scratch.
+
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from config import BM25_K1, BM25_B
+
+# Words that carry no lookup value. They are not indexed, which keeps the postings small.
+_STOPWORDS = frozenset(
+    "a an and are as at be but by did do does for from had has have he her his how i if in into is it its "
+    "me my of on or our she so that the their them they this to was we were what when where which who why "
+    "will with you your".split()
+)
+# Words, numbers with an optional percent sign, and decimals such as "3.5".
+_TOKEN_PATTERN = re.compile(r"\d+(?:\.\d+)?%?|\w+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases a text and splits it into index terms, dropping stopwords."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class KeywordIndex:
+    """
+    An incrementally maintained BM25 inverted index stored in SQLite.
+    Safe to use from the chat loop and the background memory pipeline at the same time.
+    """
+    def __init__(self, path: str, k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Args:
+            path (str): The SQLite file. ":memory:" keeps the index in memory only.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 document-length normalization.
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (doc_id TEXT PRIMARY KEY, length INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_by_doc ON postings (doc_id);
+        """)
+        self._db.commit()
+
+    def add_documents(self, documents: Iterable[Tuple[str, str]]):
+        """Indexes (doc_id, text) pairs. Re-adding a doc_id replaces its previous postings."""
+        documents = list(documents)
+        if not documents:
+            return
+        with self._lock:
+            self._delete([doc_id for doc_id, _ in documents])
+            for doc_id, text in documents:
+                terms = tokenize(text)
+                self._db.execute("INSERT INTO documents (doc_id, length) VALUES (?, ?)", (doc_id, len(terms)))
+                self._db.executemany(
+                    "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                    [(term, doc_id, tf) for term, tf in Counter(terms).items()]
+                )
+            self._db.commit()
+
+    def remove_documents(self, doc_ids: Sequence[str]):
+        """Removes documents and their postings from the index."""
+        if not doc_ids:
+            return
+        with self._lock:
+            self._delete(list(doc_ids))
+            self._db.commit()
+
+    def _delete(self, doc_ids: List[str]):
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self._db.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", chunk)
+            self._db.execute(f"DELETE FROM documents WHERE doc_id IN ({placeholders})", chunk)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Scores every document that shares a term with the query.
+
+        Returns:
+            List[Tuple[str, float]]: Up to `limit` (doc_id, BM25 score) pairs, best first.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            total_docs, total_length = self._db.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents").fetchone()
+            if not total_docs:
+                return []
+            average_length = total_length / total_docs or 1.0
+
+            placeholders = ",".join("?" * len(terms))
+            rows = self._db.execute(
+                f"""SELECT p.term, p.doc_id, p.tf, d.length FROM postings p
+                    JOIN documents d ON d.doc_id = p.doc_id WHERE p.term IN ({placeholders})""",
+                terms
+            ).fetchall()
+
+        document_frequency = Counter(term for term, _, _, _ in rows)
+        scores: Dict[str, float] = {}
+        for term, doc_id, tf, length in rows:
+            df = document_frequency[term]
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1 - self.b + self.b * length / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def document_ids(self) -> set:
+        """Returns the ids of every indexed document."""
+        with self._lock:
+            return {row[0] for row in self._db.execute("SELECT doc_id FROM documents")}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def reciprocal_rank_fusion(ranked_lists: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Merges several best-first lists of ids. Every list contributes 1 / (k + rank)
+    for each id it contains, so ids ranked well by either retriever rise to the top.
+
+    Returns:
+        List[Tuple[str, float]]: (id, fused score) pairs, best first.
+    """
+    scores: Dict[str, float] = {}
+    for ranked in ranked_lists:
+        for rank, doc_id in enumerate(ranked, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,254 @@
+# aura_engine/memory_compaction.py
+#
+# An offline compaction job for long-term memory. Every turn and every sleep
+# cycle adds documents, and many of them say nearly the same thing ("Ben
+# greeted Aurora..."). Those near-duplicates inflate the collection and crowd
+# the top results. Compaction finds clusters of near-identical memories with
+# blocked, vectorized cosine similarity and merges each cluster into its
+# oldest member. The survivor records the provenance of what it absorbed, and
+# its `last_seen_epoch` keeps it as recent as its newest duplicate. The other
+# members are retired.
+#
+# Duplicate pairs are grown into candidate clusters, which can chain (A ~ B and
+# B ~ C although A and C differ). Before merging, every member is therefore
+# compared with the survivor itself, and members that are not duplicates of it
+# are left untouched.
+#
+# The job is incremental: only vectors added since the last run are compared
+# (against everything), and the ids that have already been checked are kept
+# in a small SQLite file next to the database. Both sides of the comparison
+# are loaded in blocks, so memory use does not grow with the collection.
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Add project root to path to allow direct script execution
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import (
+    COMPACTION_SIMILARITY_THRESHOLD, COMPACTION_BLOCK_SIZE, COMPACTION_STATE_FILENAME,
+    COMPACTION_MAX_PROVENANCE_IDS
+)
+
+class _DisjointSet:
+    """Union-find over document ids, used to grow duplicate pairs into clusters."""
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: str, b: str):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def clusters(self) -> List[List[str]]:
+        groups: Dict[str, List[str]] = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+class CompactionState:
+    """The ids that earlier compaction runs have already checked."""
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS processed (doc_id TEXT PRIMARY KEY)")
+        self._db.commit()
+
+    def processed_ids(self) -> set:
+        return {row[0] for row in self._db.execute("SELECT doc_id FROM processed")}
+
+    def mark(self, doc_ids: List[str]):
+        self._db.executemany("INSERT OR IGNORE INTO processed (doc_id) VALUES (?)", [(doc_id,) for doc_id in doc_ids])
+        self._db.commit()
+
+    def forget(self, doc_ids: List[str]):
+        self._db.executemany("DELETE FROM processed WHERE doc_id = ?", [(doc_id,) for doc_id in doc_ids])
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _load_block(collection: Any, doc_ids: List[str]) -> Dict[str, Any]:
+    """Loads embeddings, documents and metadata for a block of ids, in the given order."""
+    block = collection.get(ids=doc_ids, include=["embeddings", "documents", "metadatas"])
+    position = {doc_id: i for i, doc_id in enumerate(block["ids"])}
+    order = [position[doc_id] for doc_id in doc_ids if doc_id in position]
+    return {
+        "ids": [block["ids"][i] for i in order],
+        "embeddings": np.asarray(block["embeddings"], dtype=np.float32)[order] if order else np.zeros((0, 0), dtype=np.float32),
+        "documents": [block["documents"][i] for i in order],
+        "metadatas": [block["metadatas"][i] or {} for i in order],
+    }
+
+
+def _load_blocks(collection: Any, doc_ids: List[str], block_size: int) -> Dict[str, Any]:
+    """Loads many ids block by block, so no single request grows with the collection."""
+    blocks = [_load_block(collection, doc_ids[start:start + block_size]) for start in range(0, len(doc_ids), block_size)]
+    blocks = [block for block in blocks if block["ids"]]
+    if not blocks:
+        return {"ids": [], "embeddings": np.zeros((0, 0), dtype=np.float32), "documents": [], "metadatas": []}
+    return {
+        "ids": [doc_id for block in blocks for doc_id in block["ids"]],
+        "embeddings": np.vstack([block["embeddings"] for block in blocks]),
+        "documents": [document for block in blocks for document in block["documents"]],
+        "metadatas": [metadata for block in blocks for metadata in block["metadatas"]],
+    }
+
+
+def _stored_bytes(document: str, metadata: Dict[str, Any], dimensions: int) -> int:
+    """Estimates the storage of one memory: text, metadata and a float32 embedding."""
+    return len(document.encode("utf-8")) + len(json.dumps(metadata).encode("utf-8")) + dimensions * 4
+
+
+def _merged_metadata(survivor: Dict[str, Any], retired: List[Dict[str, Any]], retired_ids: List[str]) -> Dict[str, Any]:
+    """Adds the provenance of the retired duplicates to the survivor's metadata."""
+    metadata = dict(survivor)
+    merged_ids = [doc_id for doc_id in metadata.get("merged_ids", "").split(",") if doc_id] + retired_ids
+    sources = {metadata.get("source")} | {item.get("source") for item in retired}
+    metadata["merged_ids"] = ",".join(merged_ids[-COMPACTION_MAX_PROVENANCE_IDS:])
+    metadata["merged_sources"] = ",".join(sorted(source for source in sources if source))
+    metadata["duplicate_count"] = int(metadata.get("duplicate_count", 0)) + len(retired)
+    epochs = [item.get("timestamp_epoch") for item in [survivor] + retired]
+    epochs = [epoch for epoch in epochs if isinstance(epoch, (int, float))] + [metadata.get("last_seen_epoch", 0.0)]
+    metadata["last_seen_epoch"] = float(max(epochs))
+    return metadata
+
+
+def run_compaction(
+    memory_manager: 'MemoryManager',
+    threshold: float = COMPACTION_SIMILARITY_THRESHOLD,
+    block_size: int = COMPACTION_BLOCK_SIZE,
+    state_path: Optional[str] = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Merges near-duplicate memories.
+
+    Args:
+        memory_manager (MemoryManager): The memory store to compact.
+        threshold (float): The cosine similarity at which two memories of the same type are duplicates.
+        block_size (int): The number of stored vectors loaded and compared at a time.
+        state_path (str): The SQLite file that records checked ids. Defaults to one in the memory database directory.
+        full (bool): Re-check every memory, not only those added since the last run.
+
+    Returns:
+        Dict: `checked` (new memories compared), `clusters`, `retired` (documents removed),
+              `bytes_reclaimed` (estimated) and `seconds`.
+    """
+    start = time.perf_counter()
+    print("\n--- Starting Memory Compaction ---")
+    collection = memory_manager.collection
+    state = CompactionState(state_path or os.path.join(memory_manager.db_path, COMPACTION_STATE_FILENAME))
+    try:
+        all_ids = collection.get(include=[])["ids"]
+        processed = set() if full else state.processed_ids()
+        new_ids = [doc_id for doc_id in all_ids if doc_id not in processed]
+        report = {"checked": len(new_ids), "clusters": 0, "retired": 0, "bytes_reclaimed": 0, "seconds": 0.0}
+        if not new_ids:
+            print("   ✅ No new memories since the last compaction.")
+            return report
+        print(f"-> Comparing {len(new_ids)} new memories against {len(all_ids)} stored memories...")
+
+        new_position = {doc_id: i for i, doc_id in enumerate(new_ids)}
+        clusters = _DisjointSet()
+        for new_start in range(0, len(new_ids), block_size):
+            new = _load_block(collection, new_ids[new_start:new_start + block_size])
+            if not new["ids"]:
+                continue
+            new_vectors = _normalize(new["embeddings"])
+            new_types = np.array([metadata.get("type", "") for metadata in new["metadatas"]])
+            for block_start in range(0, len(all_ids), block_size):
+                block = _load_block(collection, all_ids[block_start:block_start + block_size])
+                if not block["ids"]:
+                    continue
+                block_types = np.array([metadata.get("type", "") for metadata in block["metadatas"]])
+                similarities = new_vectors @ _normalize(block["embeddings"]).T
+                # Only memories of the same type can be duplicates of each other.
+                similarities[new_types[:, None] != block_types[None, :]] = -1.0
+                for row, column in zip(*np.nonzero(similarities >= threshold)):
+                    new_id, other_id = new["ids"][row], block["ids"][column]
+                    # Skip self-matches, and count each pair of new memories only once.
+                    if new_id == other_id or new_position.get(other_id, len(new_ids)) < new_position[new_id]:
+                        continue
+                    clusters.union(new_id, other_id)
+
+        retired_ids, survivor_ids, survivor_metadatas = [], [], []
+        for members in clusters.clusters():
+            cluster = _load_blocks(collection, members, block_size)
+            metadatas = dict(zip(cluster["ids"], cluster["metadatas"]))
+            # The oldest memory survives, so ids that were already recalled stay stable.
+            order = sorted(range(len(cluster["ids"])), key=lambda i: (
+                cluster["metadatas"][i].get("timestamp_epoch", float("inf")), cluster["ids"][i]))
+            if len(order) < 2:
+                continue
+            vectors = _normalize(cluster["embeddings"])
+            survivor_row = order[0]
+            similarity = vectors @ vectors[survivor_row]
+            retired_rows = [i for i in order[1:] if similarity[i] >= threshold]
+            if not retired_rows:
+                continue
+            survivor = cluster["ids"][survivor_row]
+            retired = [cluster["ids"][i] for i in retired_rows]
+            survivor_ids.append(survivor)
+            survivor_metadatas.append(_merged_metadata(metadatas[survivor], [metadatas[doc_id] for doc_id in retired], retired))
+            retired_ids.extend(retired)
+            dimensions = vectors.shape[1]
+            report["bytes_reclaimed"] += sum(
+                _stored_bytes(cluster["documents"][i], cluster["metadatas"][i], dimensions) for i in retired_rows)
+
+        if survivor_ids:
+            memory_manager.update_metadatas(survivor_ids, survivor_metadatas)
+            memory_manager.delete_memories(retired_ids)
+        state.forget(retired_ids)
+        retired_set = set(retired_ids)
+        state.mark([doc_id for doc_id in new_ids if doc_id not in retired_set])
+
+        report["clusters"] = len(survivor_ids)
+        report["retired"] = len(retired_ids)
+        report["seconds"] = time.perf_counter() - start
+        print(f"   ✅ Compaction merged {report['clusters']} clusters and retired {report['retired']} memories "
+              f"(~{report['bytes_reclaimed'] / 1024:.1f} KB reclaimed) in {report['seconds']:.2f}s.")
+        return report
+    finally:
+        state.close()
+
+
+# --- Main Execution Block for Standalone Script ---
+if __name__ == "__main__":
+    import argparse
+    from config import EMBEDDING_BACKEND
+    from aura_engine.memory_manager import MemoryManager
+
+    parser = argparse.ArgumentParser(description="Merge near-duplicate memories in the long-term memory store.")
+    parser.add_argument("--threshold", type=float, default=COMPACTION_SIMILARITY_THRESHOLD, help="Duplicate cosine similarity.")
+    parser.add_argument("--full", action="store_true", help="Re-check every memory, not only new ones.")
+    args = parser.parse_args()
+
+    print("--- Running Standalone Memory Compaction Script ---")
+    client = None
+    if EMBEDDING_BACKEND == "lmstudio":
+        import lmstudio as lms
+        client = lms.Client()
+    memory_manager = MemoryManager(client=client)
+    run_compaction(memory_manager, threshold=args.threshold, full=args.full)
+    print("\n--- Standalone Script Finished ---")
@@ -1,9 +1,9 @@
-# aura_engine/memory_consolidation.py (v4.3 - Constrained Narrative)
+# aura_engine/memory_consolidation.py (v4.5 - Batched Storage)
 #
-# This version uses simple prompting and constrains the Narrative Weaver to prevent
-# hallucination. All agents use basic text prompts with strict fact-only instructions.
+# This version stores the verified facts and the narrative summary with a
+# single `add_memories` call: one embedding request and one database insert
+# instead of one of each per fact.
 
-import lmstudio as lms
 import os
 import sys
 import time
@@ -186,19 +186,20 @@ def run_consolidation_pipeline(client: 'lms.Client', memory_manager: 'MemoryMana
 
     print("\n-> Storing consolidated memories in ChromaDB...")
     timestamp = datetime.now().isoformat()
-    if verified_facts:
-        for fact_text in verified_facts:
-            memory_manager.add_memory(
-                text=fact_text,
-                doc_id=str(uuid.uuid4()),
-                metadata={"type": "fact", "source": "consolidation", "timestamp": timestamp}
-            )
-    
-    memory_manager.add_memory(
-        text=narrative_summary,
-        doc_id=str(uuid.uuid4()),
-        metadata={"type": "summary", "source": "consolidation", "timestamp": timestamp}
-    )
+    consolidated_memories = [
+        {
+            "text": fact_text,
+            "doc_id": str(uuid.uuid4()),
+            "metadata": {"type": "fact", "source": "consolidation", "timestamp": timestamp}
+        }
+        for fact_text in verified_facts
+    ]
+    consolidated_memories.append({
+        "text": narrative_summary,
+        "doc_id": str(uuid.uuid4()),
+        "metadata": {"type": "summary", "source": "consolidation", "timestamp": timestamp}
+    })
+    memory_manager.add_memories(consolidated_memories)
     
     print("\n-> Archiving processed log file...")
     _archive_log_file()
@@ -207,6 +208,8 @@ def run_consolidation_pipeline(client: 'lms.Client', memory_manager: 'MemoryMana
 
 # --- Main Execution Block for Standalone Script ---
 if __name__ == "__main__":
+    import lmstudio as lms
+
     print("--- Running Standalone Memory Consolidation Script ---")
     
     client = None
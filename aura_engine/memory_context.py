@@ -0,0 +1,182 @@
+# aura_engine/memory_context.py
+#
+# This module turns retrieved long-term memories into the memory context of a
+# prompt. Retrieval over-fetches candidates. Maximal marginal relevance (MMR)
+# then orders them so that each next memory ranks high in retrieval (whose
+# score already fuses vector, keyword, recency and emotion signals) but is
+# unlike the memories already chosen, so near-duplicate summaries do not fill
+# the context with the same fact. Finally the memories are packed greedily into
+# a token budget: a memory that does not fit is skipped in favour of shorter
+# ones, so one long consolidated summary cannot crowd out everything else.
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from config import (
+    MEMORY_CONTEXT_TOKEN_BUDGET, MEMORY_CONTEXT_MAX_MEMORIES, MEMORY_CONTEXT_MMR_LAMBDA,
+    MEMORY_CONTEXT_DUPLICATE_SIMILARITY
+)
+from .context_manager import estimate_tokens
+from .tracing import span
+
+MEMORY_CONTEXT_HEADER = "Here are some relevant long-term memories from our past conversations:\n"
+NO_MEMORIES_CONTEXT = "You have no relevant long-term memories for this topic yet."
+
+@dataclass
+class MemoryContext:
+    """
+    The memory context of one prompt and what it cost.
+    """
+    text: str                                        # The context string for the prompt.
+    memories: List[Dict[str, Any]]                   # The memories included, in prompt order.
+    tokens: int                                      # Estimated tokens of `text`.
+    dropped: List[Tuple[str, str]] = field(default_factory=list)  # (memory id, "redundant" or "budget").
+
+    def describe(self) -> str:
+        """Returns a short, human-readable summary for the console."""
+        redundant = sum(1 for _, reason in self.dropped if reason == "redundant")
+        over_budget = len(self.dropped) - redundant
+        return (f"{len(self.memories)} memories, {self.tokens} tokens, "
+                f"{redundant} redundant and {over_budget} over budget dropped")
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def relevance_scores(memories: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    The retrieval score of each candidate, scaled to [0, 1] by its maximum. When
+    a candidate has no score, the retrieval rank is used instead (1.0 for the first).
+    """
+    scores = [memory.get('score') for memory in memories]
+    if not memories or any(not isinstance(score, (int, float)) for score in scores):
+        return 1.0 - np.arange(len(memories), dtype=np.float32) / max(1, len(memories))
+    relevance = np.asarray(scores, dtype=np.float32)
+    top = relevance.max()
+    return relevance / top if top > 0 else np.ones(len(memories), dtype=np.float32)
+
+
+def mmr_order(relevance: Sequence[float], vectors: Sequence[Sequence[float]],
+              lambda_mult: float = MEMORY_CONTEXT_MMR_LAMBDA) -> List[Tuple[int, float]]:
+    """
+    Orders candidates by maximal marginal relevance. Relevance comes from
+    retrieval; the embeddings are only used for the redundancy term.
+
+    Args:
+        relevance (list): The relevance of each candidate, in [0, 1].
+        vectors (list): The candidate embeddings.
+        lambda_mult (float): 1.0 ranks by relevance alone, 0.0 by diversity alone.
+
+    Returns:
+        List[Tuple[int, float]]: Candidate positions in selection order, each with its
+            highest cosine similarity to a candidate selected before it.
+    """
+    if not len(vectors):
+        return []
+    matrix = _unit_rows(np.asarray(vectors, dtype=np.float32))
+    relevance = np.asarray(relevance, dtype=np.float32)
+    pairwise = matrix @ matrix.T
+    closest = np.full(len(matrix), -np.inf, dtype=np.float32)
+    remaining = np.ones(len(matrix), dtype=bool)
+    order = []
+    for _ in range(len(matrix)):
+        redundancy = np.where(np.isfinite(closest), closest, 0.0)
+        scores = np.where(remaining, lambda_mult * relevance - (1 - lambda_mult) * redundancy, -np.inf)
+        position = int(np.argmax(scores))
+        order.append((position, float(closest[position])))
+        remaining[position] = False
+        closest = np.maximum(closest, pairwise[position])
+    return order
+
+
+def pack_memories(
+    memories: List[Dict[str, Any]],
+    vectors: Dict[str, Sequence[float]],
+    token_budget: int = MEMORY_CONTEXT_TOKEN_BUDGET,
+    max_memories: int = MEMORY_CONTEXT_MAX_MEMORIES,
+    lambda_mult: float = MEMORY_CONTEXT_MMR_LAMBDA,
+    duplicate_similarity: float = MEMORY_CONTEXT_DUPLICATE_SIMILARITY,
+    token_counter: Callable[[str], int] = estimate_tokens,
+) -> MemoryContext:
+    """
+    Selects memories with MMR and packs them into a token budget.
+
+    Args:
+        memories (list): Retrieved candidates, best first, as returned by the MemoryManager.
+            Their `score` is the MMR relevance.
+        vectors (dict): Candidate embeddings by memory id. Candidates without one keep
+            their retrieval position and are never treated as redundant.
+        token_budget (int): The maximum estimated size of the whole context, header included.
+        max_memories (int): The maximum number of memories included.
+        duplicate_similarity (float): Candidates at least this similar to an included memory are dropped.
+    """
+    if not memories:
+        return MemoryContext(NO_MEMORIES_CONTEXT, [], token_counter(NO_MEMORIES_CONTEXT))
+
+    with_vectors = [i for i, memory in enumerate(memories) if memory['id'] in vectors]
+    closest = {}
+    if with_vectors:
+        relevance = relevance_scores(memories)
+        ranked = mmr_order(relevance[with_vectors], [vectors[memories[i]['id']] for i in with_vectors], lambda_mult)
+        reordered = iter([with_vectors[position] for position, _ in ranked])
+        closest = {with_vectors[position]: similarity for position, similarity in ranked}
+        # Candidates with a vector take the MMR order; the others keep their slots.
+        order = [next(reordered) if i in closest else i for i in range(len(memories))]
+    else:
+        order = list(range(len(memories)))
+
+    chosen, dropped, chosen_positions = [], [], []
+    used = token_counter(MEMORY_CONTEXT_HEADER)
+    for i in order:
+        memory = memories[i]
+        if len(chosen) >= max_memories:
+            dropped.append((memory['id'], "budget"))
+            continue
+        # MMR only knows the similarity to earlier candidates, which may have been skipped.
+        if i in closest and chosen_positions:
+            vector = _unit_rows(np.asarray(vectors[memory['id']], dtype=np.float32))
+            included = _unit_rows(np.asarray([vectors[memories[j]['id']] for j in chosen_positions if j in closest], dtype=np.float32))
+            if len(included) and float(np.max(included @ vector)) >= duplicate_similarity:
+                dropped.append((memory['id'], "redundant"))
+                continue
+        line = f"- {memory['text']}\n"
+        cost = token_counter(line)
+        if used + cost > token_budget:
+            dropped.append((memory['id'], "budget"))
+            continue
+        chosen.append(memory)
+        chosen_positions.append(i)
+        used += cost
+
+    if not chosen:
+        return MemoryContext(NO_MEMORIES_CONTEXT, [], token_counter(NO_MEMORIES_CONTEXT), dropped)
+    text = MEMORY_CONTEXT_HEADER + "".join(f"- {memory['text']}\n" for memory in chosen)
+    return MemoryContext(text, chosen, token_counter(text), dropped)
+
+
+def build_memory_context(
+    memory_manager: 'MemoryManager',
+    memories: List[Dict[str, Any]],
+    token_budget: int = MEMORY_CONTEXT_TOKEN_BUDGET,
+    max_memories: int = MEMORY_CONTEXT_MAX_MEMORIES,
+) -> MemoryContext:
+    """
+    Builds the memory context from over-fetched candidates. The
+    candidates keep their retrieval ranking as relevance; their stored
+    embeddings, read in one request, only decide what is redundant.
+    """
+    with span("memory_context", candidates=len(memories)) as attributes:
+        vectors = {}
+        if len(memories) > 1:
+            try:
+                vectors = memory_manager.get_embeddings([memory['id'] for memory in memories])
+            except Exception as e:
+                print(f"   ⚠️ Memory embeddings unavailable, keeping the retrieval order: {e}")
+        context = pack_memories(memories, vectors, token_budget, max_memories)
+        attributes["tokens"] = context.tokens
+        attributes["dropped"] = len(context.dropped)
+    return context
@@ -1,88 +1,844 @@
-# aura_engine/memory_manager.py (v4.2 - Cleaned & Fixed)
+# aura_engine/memory_manager.py (v5.8 - Access Log and Cold Archive)
 #
-# This version removes duplicate code and implements the correct embedding method signature
-# based on the latest LM Studio SDK documentation.
+# This version counts every recall of a memory in an access log, which the
+# retention pass uses to decide what to evict, and opens the cold archive of
+# evicted memories. `search_archive` searches the archive on demand; normal
+# retrieval only ever touches the live index.
 
-import chromadb
-from chromadb.config import Settings
-import lmstudio as lms
-from config import DB_PATH, COLLECTION_NAME, EMBEDDING_MODEL_IDENTIFIER
-from typing import Dict, Any, List
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+
+from config import (
+    DB_PATH, COLLECTION_NAME, EMBEDDING_CACHE_ENABLED, EMBEDDING_CACHE_FILENAME,
+    HYBRID_RETRIEVAL_ENABLED, KEYWORD_INDEX_FILENAME, HYBRID_CANDIDATES, RRF_K,
+    RETRIEVAL_OVERFETCH, RECENCY_HALF_LIFE_HOURS, RECENCY_DECAY_FLOOR, RECENCY_DECAY_TYPES,
+    EMOTION_RERANK_WEIGHT, HOT_TIER_ENABLED, HOT_TIER_MAX_AGE_HOURS, RETRIEVAL_CACHE_ENABLED,
+    ACCESS_LOG_FILENAME, COLD_ARCHIVE_DIRNAME, ACTIVE_COLLECTION_FILENAME, HOT_TIER_COLD_DEADLINE_MS,
+    HOT_TIER_COLD_WORKERS
+)
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .embedding_backends import EmbeddingBackend, create_embedding_backend
+from .embedding_cache import EmbeddingCache
+from .emotion_vectors import decode_vectors, cosine_similarities, blend_scores
+from .keyword_index import KeywordIndex, reciprocal_rank_fusion
+from .hot_tier import HotTier
+from .retrieval_cache import RetrievalCache
+from .memory_retention import AccessLog, ColdArchive
+from .vector_stores import VectorStore, create_vector_store
+from .embedding_migration import read_active_collection, read_active_pointer, open_store_like
+from .tracing import span
+
+# Metadata value types that the vector stores can hold.
+_METADATA_VALUE_TYPES = (str, int, float, bool)
 
 class MemoryManager:
     """
-    Manages all interactions with the ChromaDB vector memory, using the
-    lmstudio SDK for embedding generation.
+    Manages all interactions with the vector memory, using a pluggable
+    vector store and a pluggable embedding backend.
     """
-    def __init__(self, client: lms.Client):
-        """Initializes the MemoryManager."""
+    def __init__(
+        self,
+        client: Optional['lms.Client'] = None,
+        db_path: str = DB_PATH,
+        collection_name: str = COLLECTION_NAME,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedding_backend: Optional[EmbeddingBackend] = None,
+        vector_store: Optional[VectorStore] = None,
+    ):
+        """
+        Initializes the MemoryManager.
+
+        Args:
+            client (lms.Client): The LM Studio client. Only required by the "lmstudio" backend.
+            embedding_backend (EmbeddingBackend): The backend used for embeddings. By default
+                the backend named by EMBEDDING_BACKEND is created.
+            embedding_cache (EmbeddingCache): The cache used for embeddings. By default
+                a cache stored next to the database is used when EMBEDDING_CACHE_ENABLED is set.
+            vector_store (VectorStore): The store that holds the memories. By default the
+                store named by VECTOR_STORE_BACKEND is opened in `db_path`.
+        """
         print("Initializing Memory Manager...")
         self.client = client
-        
-        # Initialize ChromaDB with settings that allow reset (for clean shutdown)
-        self.db_client = chromadb.PersistentClient(
-            path=DB_PATH,
-            settings=Settings(allow_reset=True)
-        )
-        
-        print(f"Loading embedding model: {EMBEDDING_MODEL_IDENTIFIER}...")
-        self.embedding_model = self.client.embedding.model(EMBEDDING_MODEL_IDENTIFIER)
-        print("✅ Embedding model loaded.")
+        self.db_path = db_path
+        self.base_collection_name = collection_name
 
-        self.collection = self.db_client.get_or_create_collection(name=COLLECTION_NAME)
+        if embedding_backend is None:
+            print("Loading embedding backend...")
+            embedding_backend = create_embedding_backend(client=client)
+        self.embedding_backend = embedding_backend
+        print(f"✅ Embedding backend ready: {embedding_backend.name} ({embedding_backend.model_id}).")
+
+        if embedding_cache is None and EMBEDDING_CACHE_ENABLED:
+            embedding_cache = EmbeddingCache(
+                embedding_backend.model_id, path=os.path.join(db_path, EMBEDDING_CACHE_FILENAME)
+            )
+        self.embedding_cache = embedding_cache
+
+        # Memories are persistent and are never reset on shutdown. After an embedding
+        # migration, the collection of the new model is the active one.
+        self.write_lock = threading.RLock()
+        self._pointer_mtime = self._active_pointer_mtime()
+        self._write_conflict: Optional[str] = None
+        self.collection = vector_store or create_vector_store(db_path, read_active_collection(db_path, collection_name))
+
+        self._backfill_timestamp_epochs()
+        self._check_embedding_model()
+
+        self.keyword_index = None
+        if HYBRID_RETRIEVAL_ENABLED:
+            self.keyword_index = KeywordIndex(os.path.join(db_path, KEYWORD_INDEX_FILENAME))
+            self._sync_keyword_index()
+
+        self.hot_tier = None
+        self._cold_executor = None
+        # None waits for the cold tier however long it takes.
+        self.cold_deadline_seconds = HOT_TIER_COLD_DEADLINE_MS / 1000 if HOT_TIER_COLD_DEADLINE_MS else None
+        # Cold queries that missed their deadline and still hold a worker.
+        self._late_cold_queries = set()
+        self._late_lock = threading.Lock()
+        if HOT_TIER_ENABLED:
+            self.hot_tier = HotTier()
+            self._cold_executor = ThreadPoolExecutor(max_workers=HOT_TIER_COLD_WORKERS, thread_name_prefix="cold-tier")
+            self._warm_hot_tier()
+
+        self.retrieval_cache = RetrievalCache() if RETRIEVAL_CACHE_ENABLED else None
+        self.access_log = AccessLog(os.path.join(db_path, ACCESS_LOG_FILENAME))
+        self.cold_archive = ColdArchive(os.path.join(db_path, COLD_ARCHIVE_DIRNAME))
         print("✅ Memory Manager initialized successfully.")
 
+    def _warm_hot_tier(self):
+        """Loads the most recent memories into the hot tier, up to its memory ceiling."""
+        if not self.collection.count():
+            return
+        cutoff = time.time() - HOT_TIER_MAX_AGE_HOURS * 3600
+        recent = self.collection.get(
+            where={"timestamp_epoch": {"$gte": cutoff}}, include=["embeddings", "documents", "metadatas"]
+        )
+        if not recent["ids"]:
+            return
+        order = sorted(range(len(recent["ids"])), key=lambda i: recent["metadatas"][i]["timestamp_epoch"], reverse=True)
+        order = order[:self.hot_tier.capacity_for(len(recent["embeddings"][0]))]
+        self.hot_tier.add(
+            [recent["ids"][i] for i in order], [recent["embeddings"][i] for i in order],
+            [recent["documents"][i] for i in order], [recent["metadatas"][i] for i in order]
+        )
+        print(f"   -> Hot tier warmed with {len(order)} recent memories.")
+
+    def _backfill_timestamp_epochs(self):
+        """Adds the numeric `timestamp_epoch` to memories that were stored before it existed."""
+        total = self.collection.count()
+        if not total:
+            return
+        stamped = self.collection.get(where={"timestamp_epoch": {"$gte": 0}}, include=[])["ids"]
+        if len(stamped) == total:
+            return
+        stored = self.collection.get(include=["metadatas"])
+        stamped = set(stamped)
+        ids, metadatas = [], []
+        for doc_id, metadata in zip(stored["ids"], stored["metadatas"]):
+            if doc_id not in stamped:
+                ids.append(doc_id)
+                metadatas.append(_with_timestamp_epoch(metadata or {}))
+        self.collection.update(ids=ids, metadatas=metadatas)
+        print(f"   -> Added numeric timestamps to {len(ids)} existing memories.")
+
+    def _check_embedding_model(self):
+        """Warns when stored vectors were embedded by another model than the current one."""
+        total = self.collection.count()
+        if not total:
+            return
+        model_id = self.embedding_backend.model_id
+        current = len(self.collection.get(where={"embedding_model": model_id}, include=[])["ids"])
+        if current < total:
+            print(f"   ⚠️ {total - current} of {total} memories were embedded by another or an unrecorded model "
+                  f"than '{model_id}'. Run migrate_embeddings.py to re-embed them.")
+
+    def _sync_keyword_index(self):
+        """
+        Brings the keyword index in line with the collection after a restart, e.g.
+        when memories were stored before the index existed. Only the differing
+        documents are touched.
+        """
+        if self.keyword_index.count() == self.collection.count():
+            return
+        stored_ids = set(self.collection.get(include=[])["ids"])
+        indexed_ids = self.keyword_index.document_ids()
+        stale = list(indexed_ids - stored_ids)
+        missing = list(stored_ids - indexed_ids)
+        self.keyword_index.remove_documents(stale)
+        if missing:
+            documents = self.collection.get(ids=missing, include=["documents"])
+            self.keyword_index.add_documents(zip(documents["ids"], documents["documents"]))
+        print(f"   -> Keyword index synchronized ({len(missing)} added, {len(stale)} removed).")
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Returns one vector per text. Cached vectors are reused, and the remaining
+        texts are embedded in a single request and added to the cache.
+        """
+        with span("embed", texts=len(texts)) as attributes:
+            cached = self.embedding_cache.get_many(texts) if self.embedding_cache else {}
+            missing = [position for position in range(len(texts)) if position not in cached]
+            attributes["cache_hits"] = len(cached)
+            if not missing:
+                return [cached[position] for position in range(len(texts))]
+
+            fresh = self.embedding_backend.embed([texts[position] for position in missing])
+        if len(fresh) != len(missing):
+            raise ValueError(f"Expected {len(missing)} embeddings, received {len(fresh)}.")
+        if self.embedding_cache:
+            self.embedding_cache.put_many([texts[position] for position in missing], fresh)
+
+        cached.update(zip(missing, fresh))
+        return [cached[position] for position in range(len(texts))]
+
+    def _active_pointer_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(os.path.join(self.db_path, ACTIVE_COLLECTION_FILENAME)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _follow_migration(self) -> Optional[str]:
+        """
+        Follows a migration that another process completed since this one opened
+        the store. Called under the write lock before every write. If the new
+        collection belongs to this process's model, it becomes the active one;
+        otherwise the reason why writes are refused is returned.
+        """
+        mtime = self._active_pointer_mtime()
+        if mtime == self._pointer_mtime:
+            return self._write_conflict
+        self._pointer_mtime = mtime
+        pointer = read_active_pointer(self.db_path)
+        self._write_conflict = None
+        if not pointer or pointer["collection"] == self.collection.name:
+            return None
+        if pointer.get("embedding_model") != self.embedding_backend.model_id:
+            self._write_conflict = (f"the memory store was migrated to '{pointer.get('embedding_model')}' by another "
+                                    f"process; restart with that embedding model")
+            print(f"   ❌ Writes refused: {self._write_conflict}.")
+            return self._write_conflict
+        print(f"-> Another process migrated the memory store to '{pointer['collection']}'. Following it...")
+        self.switch_collection(open_store_like(self, pointer["collection"]))
+        return None
+
+    def _note_write(self):
+        """Starts a new write generation, so no cached retrieval result predates the write."""
+        if self.retrieval_cache:
+            self.retrieval_cache.invalidate()
+
     def add_memory(self, text: str, doc_id: str, metadata: Dict[str, Any]):
         """
         Adds a new piece of text to the vector memory with its metadata.
         """
-        try:
-            # Use correct LM Studio SDK embedding method signature
-            embedding_response = self.embedding_model.embed([text])
-            # Extract the embedding vector directly from the response
-            embedding_vector = embedding_response[0] if isinstance(embedding_response[0], list) else embedding_response[0].embedding
-            
-            self.collection.add(
-                documents=[text],
-                ids=[doc_id],
-                embeddings=[embedding_vector],
-                metadatas=[metadata]
-            )
+        result = self.add_memories([{"text": text, "doc_id": doc_id, "metadata": metadata}], verbose=False)
+        if result["added"]:
             print(f"   -> Memory added to DB: {doc_id} (Type: {metadata.get('type', 'N/A')})")
+        else:
+            print(f"   ❌ Error adding memory: {result['failed'].get(doc_id, 'unknown error')}")
+
+    def add_memories(self, items: List[Dict[str, Any]], verbose: bool = True) -> Dict[str, Any]:
+        """
+        Adds several memories with one embedding request and one database insert.
+
+        Args:
+            items (list): Dicts with the keys `text`, `doc_id` and `metadata`.
+            verbose (bool): Whether to print the batch summary line.
+
+        Returns:
+            Dict: `added` (list of stored ids), `failed` (dict of id -> reason; an item without
+                  an id, or sharing its id with another item of the batch, is keyed "<item N>"),
+                  `seconds` (elapsed time) and `per_second` (stored memories per second).
+        """
+        start = time.perf_counter()
+        # Held throughout, so a migration cannot swap collections between embedding and storing.
+        with self.write_lock:
+            conflict = self._follow_migration()
+            failed: Dict[str, str] = {}
+            valid: List[Dict[str, Any]] = []
+            seen_ids = set()
+            # A rejected item whose id another item of the batch shares is reported by position,
+            # so no id is both added and failed.
+            id_counts = Counter(item.get("doc_id") for item in items if isinstance(item.get("doc_id"), str))
+
+            for position, item in enumerate(items):
+                doc_id = item.get("doc_id")
+                problem = _validate_item(item, seen_ids)
+                if problem:
+                    keyed_by_id = isinstance(doc_id, str) and doc_id and id_counts[doc_id] == 1
+                    failed[doc_id if keyed_by_id else f"<item {position}>"] = problem
+                else:
+                    seen_ids.add(doc_id)
+                    metadata = {**_with_timestamp_epoch(item["metadata"]), "embedding_model": self.embedding_backend.model_id}
+                    valid.append({**item, "metadata": metadata})
+            if conflict:
+                failed.update((item["doc_id"], conflict) for item in valid)
+                valid = []
+
+            valid = self._skip_existing(valid, failed)
+            vectors = self._embed_items(valid, failed)
+            embedded = [item for item in valid if item["doc_id"] in vectors]
+            added = self._store_items(embedded, vectors, failed)
+            if added:
+                self._note_write()
+                stored = {item["doc_id"]: item for item in embedded}
+                if self.keyword_index:
+                    self.keyword_index.add_documents((doc_id, stored[doc_id]["text"]) for doc_id in added)
+                if self.hot_tier is not None:
+                    self.hot_tier.demote_expired()
+                    self.hot_tier.add(
+                        added, [vectors[doc_id] for doc_id in added],
+                        [stored[doc_id]["text"] for doc_id in added], [stored[doc_id]["metadata"] for doc_id in added]
+                    )
+
+        seconds = time.perf_counter() - start
+        per_second = len(added) / seconds if seconds > 0 else 0.0
+        if verbose and items:
+            failure_note = f", {len(failed)} failed" if failed else ""
+            print(f"   -> {len(added)}/{len(items)} memories added to DB in {seconds:.2f}s ({per_second:.1f} memories/s{failure_note})")
+            for doc_id, reason in failed.items():
+                print(f"      ❌ {doc_id}: {reason}")
+
+        return {"added": added, "failed": failed, "seconds": seconds, "per_second": per_second}
+
+    def _skip_existing(self, items: List[Dict[str, Any]], failed: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Drops items whose id is already stored. The vector stores ignore such inserts
+        without raising, so they would otherwise be reported as added.
+        """
+        if not items:
+            return items
+        try:
+            existing = set(self.collection.get(ids=[item["doc_id"] for item in items], include=[])["ids"])
+        except Exception:
+            return items
+        for doc_id in existing:
+            failed[doc_id] = "document id already exists"
+        return [item for item in items if item["doc_id"] not in existing]
+
+    def _embed_items(self, items: List[Dict[str, Any]], failed: Dict[str, str]) -> Dict[str, List[float]]:
+        """
+        Embeds all items in one request. If the batch request fails, each item is
+        embedded on its own, so only the items that really fail are dropped.
+        """
+        if not items:
+            return {}
+        try:
+            vectors = self._embed([item["text"] for item in items])
+            return {item["doc_id"]: vector for item, vector in zip(items, vectors)}
         except Exception as e:
-            print(f"   ❌ Error adding memory: {e}")
+            print(f"   ⚠️ Batch embedding failed ({e}). Retrying item by item...")
+
+        vectors = {}
+        for item in items:
+            try:
+                vectors[item["doc_id"]] = self._embed([item["text"]])[0]
+            except Exception as e:
+                failed[item["doc_id"]] = f"embedding failed: {e}"
+        return vectors
+
+    def _store_items(self, items: List[Dict[str, Any]], vectors: Dict[str, List[float]], failed: Dict[str, str]) -> List[str]:
+        """
+        Writes all items in one insert. If the batch insert fails, each item is
+        written on its own, so only the items that really fail are dropped.
+        """
+        if not items:
+            return []
+        try:
+            with span("store", documents=len(items)):
+                self.collection.add(
+                    documents=[item["text"] for item in items],
+                    ids=[item["doc_id"] for item in items],
+                    embeddings=[vectors[item["doc_id"]] for item in items],
+                    metadatas=[item["metadata"] for item in items]
+                )
+            return [item["doc_id"] for item in items]
+        except Exception as e:
+            if len(items) == 1:
+                failed[items[0]["doc_id"]] = f"insert failed: {e}"
+                return []
+            print(f"   ⚠️ Batch insert failed ({e}). Retrying item by item...")
+
+        added = []
+        for item in items:
+            added.extend(self._store_items([item], vectors, failed))
+        return added
 
-    def retrieve_relevant_memories(self, query_text: str, num_results: int = 3) -> list:
+    def delete_memories(self, doc_ids: List[str]):
+        """Removes memories from the collection and the keyword index."""
+        if not doc_ids:
+            return
+        with self.write_lock, span("delete", documents=len(doc_ids)):
+            if self._follow_migration():
+                return
+            self.collection.delete(ids=list(doc_ids))
+            self._note_write()
+            self.access_log.forget(doc_ids)
+            if self.keyword_index:
+                self.keyword_index.remove_documents(doc_ids)
+            if self.hot_tier is not None:
+                self.hot_tier.remove(doc_ids)
+
+    def update_metadatas(self, doc_ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Replaces the metadata of stored memories. Documents and embeddings are unchanged."""
+        if not doc_ids:
+            return
+        with self.write_lock:
+            if self._follow_migration():
+                return
+            self.collection.update(ids=list(doc_ids), metadatas=list(metadatas))
+            self._note_write()
+            if self.hot_tier is not None:
+                self.hot_tier.update_metadatas(doc_ids, metadatas)
+
+    def retrieve_relevant_memories(
+        self,
+        query_text: str,
+        num_results: int = 3,
+        memory_types: Optional[Sequence[str]] = None,
+        sources: Optional[Sequence[str]] = None,
+        since: Optional[Union[datetime, float]] = None,
+        until: Optional[Union[datetime, float]] = None,
+        recency_half_life_hours: Optional[float] = RECENCY_HALF_LIFE_HOURS,
+        emotional_state: Optional[np.ndarray] = None,
+        emotion_weight: float = EMOTION_RERANK_WEIGHT,
+    ) -> list:
+        """
+        Retrieves the most relevant memories and their metadata. With hybrid
+        retrieval enabled, the vector and keyword rankings are fused.
+
+        Args:
+            memory_types (list): Only return memories of these types, e.g. ["fact", "summary"].
+            sources (list): Only return memories from these sources.
+            since (datetime | float): Only return memories stored at or after this time.
+            until (datetime | float): Only return memories stored at or before this time.
+            recency_half_life_hours (float): Demotes older memories of the RECENCY_DECAY_TYPES.
+                None ranks by relevance alone.
+            emotional_state (np.ndarray): Aurora's current 28-dim emotion vector. When given,
+                candidates whose emotion vectors resemble it are promoted.
+            emotion_weight (float): The share of the final score that comes from emotion similarity.
         """
-        Retrieves the most relevant memories and their metadata.
+        return self.retrieve_many(
+            [query_text], num_results, memory_types, sources, since, until,
+            recency_half_life_hours, emotional_state, emotion_weight
+        )[0]
+
+    def retrieve_many(
+        self,
+        queries: Sequence[str],
+        num_results: int = 3,
+        memory_types: Optional[Sequence[str]] = None,
+        sources: Optional[Sequence[str]] = None,
+        since: Optional[Union[datetime, float]] = None,
+        until: Optional[Union[datetime, float]] = None,
+        recency_half_life_hours: Optional[float] = RECENCY_HALF_LIFE_HOURS,
+        emotional_state: Optional[np.ndarray] = None,
+        emotion_weight: float = EMOTION_RERANK_WEIGHT,
+    ) -> List[list]:
+        """
+        Retrieves memories for several queries at once, e.g. the sub-queries of a
+        reasoning step. Cached results are reused; the other queries are embedded
+        in one request and searched with one batched vector store query, then
+        ranked exactly like `retrieve_relevant_memories`. The arguments are the same.
+
+        Returns:
+            List[list]: One list of memories per query, in the order of `queries`.
         """
         try:
-            # Generate query embedding with same method
-            query_embedding_response = self.embedding_model.embed([query_text])
-            query_embedding_vector = query_embedding_response[0] if isinstance(query_embedding_response[0], list) else query_embedding_response[0].embedding
-
-            results = self.collection.query(
-                query_embeddings=[query_embedding_vector],
-                n_results=num_results,
-                include=['documents', 'metadatas']
+            rerank_by_emotion = emotional_state is not None and emotion_weight > 0 and bool(np.any(emotional_state))
+            where = build_where_filter(memory_types, sources, since, until)
+            candidates = num_results
+            if self.keyword_index:
+                candidates = max(candidates, HYBRID_CANDIDATES)
+            if recency_half_life_hours or rerank_by_emotion:
+                candidates = max(candidates, num_results * RETRIEVAL_OVERFETCH)
+            options = (
+                num_results, json.dumps(where, sort_keys=True), recency_half_life_hours, emotion_weight,
+                np.round(np.asarray(emotional_state, dtype=np.float32), 2).tobytes() if rerank_by_emotion else None,
             )
-            
-            retrieved = []
-            if results.get('ids') and results['ids'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    retrieved.append({
-                        'text': doc,
-                        'metadata': results['metadatas'][0][i]
-                    })
-            return retrieved
+
+            with span("retrieve", queries=len(queries), n_results=num_results, filtered=where is not None) as attributes:
+                results: Dict[str, list] = {}
+                generation = self.retrieval_cache.generation if self.retrieval_cache else 0
+                for query_text in queries:
+                    cached = self.retrieval_cache.get(query_text, options) if self.retrieval_cache else None
+                    if cached is not None:
+                        results[query_text] = cached
+                        if self.hot_tier is not None:
+                            self.hot_tier.record_recalls([memory['id'] for memory in cached], {}, {})
+                pending = list(dict.fromkeys(query_text for query_text in queries if query_text not in results))
+                attributes["cache_hits"] = len(queries) - len(pending)
+
+                if pending:
+                    # Generate query embeddings with same method
+                    query_vectors = self._embed(pending)
+                    use_hot_tier = self.hot_tier is not None and where is None
+                    complete = True
+                    if use_hot_tier:
+                        # The hot tier answers while the cold query is still running.
+                        cold_query = self._submit_cold_query(query_vectors, candidates)
+                        hot_hits = [self.hot_tier.search(vector, candidates) for vector in query_vectors]
+                        cold_results = self._await_cold_query(cold_query)
+                        if cold_results is None:
+                            # Past the deadline the hot tier and the keyword index answer alone.
+                            cold_results = [({}, {}) for _ in pending]
+                            complete = False
+                            attributes["cold_timeout"] = True
+                        attributes["hot_hits"] = sum(len(hits) for hits in hot_hits)
+                    else:
+                        cold_results = self._query_cold(query_vectors, candidates, where, False)
+                        hot_hits = [None] * len(pending)
+
+                    for query_text, query_vector, (found, cold_vectors), hits in zip(pending, query_vectors, cold_results, hot_hits):
+                        memories = self._rank(
+                            query_text, query_vector, found, cold_vectors, hits, where, candidates, num_results,
+                            recency_half_life_hours, emotional_state if rerank_by_emotion else None, emotion_weight,
+                            attributes, cold_available=complete
+                        )
+                        results[query_text] = memories
+                        if self.retrieval_cache and complete:
+                            self.retrieval_cache.put(query_text, options, memories, generation)
+
+            self.access_log.record([memory['id'] for query_text in queries for memory in results[query_text]])
+            return [results[query_text] for query_text in queries]
         except Exception as e:
             print(f"   ❌ Error retrieving memories: {e}")
+            return [[] for _ in queries]
+
+    def _rank(self, query_text: str, query_vector: List[float], found: Dict[str, Dict[str, Any]],
+              cold_vectors: Dict[str, Any], hot_hits: Optional[List[tuple]], where: Optional[Dict],
+              candidates: int, num_results: int, recency_half_life_hours: Optional[float],
+              emotional_state: Optional[np.ndarray], emotion_weight: float, attributes: Dict[str, Any],
+              cold_available: bool = True) -> list:
+        """
+        Fuses the vector and keyword rankings of one query and applies the recency and emotion reranks.
+        Without `cold_available` (the cold query missed its deadline), only memories held by the hot
+        tier are ranked, so the store is never read while the turn waits.
+        """
+        if hot_hits is not None:
+            vector_ids = self._merge_tiers(query_vector, hot_hits, found, cold_vectors, candidates)
+        else:
+            vector_ids = list(found)
+        rankings = [vector_ids]
+
+        if self.keyword_index:
+            keyword_ids = [doc_id for doc_id, _ in self.keyword_index.search(query_text, limit=candidates)]
+            if where is not None:
+                # The keyword index knows no metadata, so its hits are filtered by the collection.
+                self._fetch_missing(keyword_ids, found, where=where)
+                keyword_ids = [doc_id for doc_id in keyword_ids if doc_id in found]
+            elif not cold_available:
+                # Keyword hits are resolved from the hot tier; the others are dropped, not fetched.
+                for doc_id in keyword_ids:
+                    entry = found.get(doc_id) or self.hot_tier.get(doc_id)
+                    if entry is not None:
+                        found[doc_id] = entry
+                keyword_ids = [doc_id for doc_id in keyword_ids if doc_id in found]
+            attributes["keyword_hits"] = attributes.get("keyword_hits", 0) + len(keyword_ids)
+            rankings.append(keyword_ids)
+
+        scored = reciprocal_rank_fusion(rankings, k=RRF_K)
+        if recency_half_life_hours:
+            self._fetch_missing([doc_id for doc_id, _ in scored], found)
+            now = time.time()
+            scored = sorted(
+                ((doc_id, score * recency_weight(found[doc_id]['metadata'], now, recency_half_life_hours))
+                 for doc_id, score in scored if doc_id in found),
+                key=lambda item: item[1], reverse=True
+            )
+        if emotional_state is not None:
+            scored = self._rerank_by_emotion(scored[:candidates], found, emotional_state, emotion_weight)
+            attributes["emotion_reranked"] = True
+        ranked_ids = [doc_id for doc_id, _ in scored[:num_results]]
+        self._fetch_missing(ranked_ids, found)
+        if self.hot_tier is not None:
+            self.hot_tier.record_recalls(ranked_ids, cold_vectors, found)
+        # The final fused score travels with each memory, so later selection can keep this ranking.
+        scores = dict(scored[:num_results])
+        return [{**found[doc_id], 'score': scores[doc_id]} for doc_id in ranked_ids if doc_id in found]
+
+    def _submit_cold_query(self, query_vectors: List[List[float]], candidates: int) -> Optional[Future]:
+        """
+        Starts the cold query on a worker. Returns None without starting it when every
+        worker is still busy with a query that missed its deadline, so it would only queue.
+        """
+        with self._late_lock:
+            if len(self._late_cold_queries) >= HOT_TIER_COLD_WORKERS:
+                return None
+        return self._cold_executor.submit(self._query_cold, query_vectors, candidates, None, True)
+
+    def _await_cold_query(self, cold_query: Optional[Future]) -> Optional[List[tuple]]:
+        """Waits for a cold query until the deadline. Returns None if it was not started or is late."""
+        if cold_query is None:
+            return None
+        try:
+            return cold_query.result(timeout=self.cold_deadline_seconds)
+        except FutureTimeoutError:
+            # Its result is abandoned; the worker is counted as busy until the query finishes.
+            with self._late_lock:
+                self._late_cold_queries.add(cold_query)
+            cold_query.add_done_callback(self._forget_late_query)
+            return None
+
+    def _forget_late_query(self, cold_query: Future):
+        with self._late_lock:
+            self._late_cold_queries.discard(cold_query)
+
+    def _query_cold(self, query_vectors: List[List[float]], candidates: int, where: Optional[Dict],
+                    with_embeddings: bool) -> List[tuple]:
+        """
+        Runs one batched vector store query for all query vectors. Returns, per query,
+        the found memories by id and, if requested, their embeddings (used to merge
+        with the hot tier and to promote memories).
+        """
+        include = ['documents', 'metadatas', 'embeddings'] if with_embeddings else ['documents', 'metadatas']
+        results = self.collection.query(
+            query_embeddings=list(query_vectors),
+            n_results=candidates,
+            where=where,
+            include=include
+        )
+        per_query = []
+        for position in range(len(query_vectors)):
+            found, vectors = {}, {}
+            ids = results['ids'][position] if results.get('ids') else []
+            for i, doc_id in enumerate(ids):
+                found[doc_id] = {
+                    'id': doc_id,
+                    'text': results['documents'][position][i],
+                    'metadata': results['metadatas'][position][i]
+                }
+                if with_embeddings:
+                    vectors[doc_id] = results['embeddings'][position][i]
+            per_query.append((found, vectors))
+        return per_query
+
+    def _merge_tiers(self, query_vector: List[float], hot_hits: List[tuple], found: Dict[str, Dict[str, Any]],
+                     cold_vectors: Dict[str, Any], candidates: int) -> List[str]:
+        """Merges hot and cold results into one ranking by exact cosine similarity."""
+        similarities = dict(hot_hits)
+        cold_ids = [doc_id for doc_id in cold_vectors if doc_id not in similarities]
+        if cold_ids:
+            matrix = np.asarray([cold_vectors[doc_id] for doc_id in cold_ids], dtype=np.float32)
+            query = np.asarray(query_vector, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+            norms[norms == 0] = 1.0
+            similarities.update(zip(cold_ids, (matrix @ query / norms).tolist()))
+        for doc_id, _ in hot_hits:
+            if doc_id not in found:
+                entry = self.hot_tier.get(doc_id)
+                if entry is not None:
+                    found[doc_id] = entry
+        ranked = sorted((doc_id for doc_id in similarities if doc_id in found), key=similarities.get, reverse=True)
+        return ranked[:candidates]
+
+    def _rerank_by_emotion(self, scored: List[tuple], found: Dict[str, Dict[str, Any]],
+                           emotional_state: np.ndarray, weight: float) -> List[tuple]:
+        """
+        Rescores (id, relevance) pairs by blending in emotion similarity to the current state.
+        Memories without an emotion vector keep their relevance score.
+        """
+        self._fetch_missing([doc_id for doc_id, _ in scored], found)
+        scored = [(doc_id, score) for doc_id, score in scored if doc_id in found]
+        if not scored:
+            return scored
+        matrix = decode_vectors([found[doc_id]['metadata'].get('emotion_vector') for doc_id, _ in scored])
+        similarities = cosine_similarities(matrix, np.asarray(emotional_state, dtype=np.float32))
+        blended = blend_scores(np.array([score for _, score in scored], dtype=np.float32), similarities, weight,
+                               has_vector=matrix.any(axis=1))
+        order = np.argsort(-blended, kind="stable")
+        return [(scored[i][0], float(blended[i])) for i in order]
+
+    def _fetch_missing(self, doc_ids: List[str], found: Dict[str, Dict[str, Any]], where: Optional[Dict] = None):
+        """Loads the documents that only the keyword index returned, optionally filtered by `where`."""
+        missing = [doc_id for doc_id in doc_ids if doc_id not in found]
+        if not missing:
+            return
+        documents = self.collection.get(ids=missing, where=where, include=['documents', 'metadatas'])
+        for i, doc_id in enumerate(documents['ids']):
+            found[doc_id] = {
+                'id': doc_id,
+                'text': documents['documents'][i],
+                'metadata': documents['metadatas'][i]
+            }
+
+    def embed_query(self, query_text: str) -> List[float]:
+        """Returns the embedding of a query, from the embedding cache if it was seen before."""
+        return self._embed([query_text])[0]
+
+    def get_embeddings(self, doc_ids: Sequence[str]) -> Dict[str, Any]:
+        """
+        Returns the embeddings of memories by id. Hot memories are served from the
+        hot tier (unit-normalized), and only the others are read from the store.
+        Unknown ids are left out.
+        """
+        vectors = self.hot_tier.get_vectors(doc_ids) if self.hot_tier is not None else {}
+        missing = [doc_id for doc_id in doc_ids if doc_id not in vectors]
+        if missing:
+            records = self.collection.get(ids=missing, include=['embeddings'])
+            vectors.update(zip(records['ids'], records['embeddings']))
+        return vectors
+
+    def search_archive(self, query_text: str, num_results: int = 3, memory_types: Optional[Sequence[str]] = None,
+                       sources: Optional[Sequence[str]] = None) -> list:
+        """
+        Searches the cold archive of evicted memories. The archive is loaded on
+        the first search, so only callers that need old memories pay for it.
+        """
+        try:
+            with span("archive_search", n_results=num_results):
+                where = build_where_filter(memory_types, sources)
+                return self.cold_archive.search(
+                    self.embed_query(query_text), num_results, where, model_id=self.embedding_backend.model_id
+                )
+        except Exception as e:
+            print(f"   ❌ Error searching the memory archive: {e}")
             return []
 
+    def migrate_embeddings(self, target_backend: Optional[EmbeddingBackend] = None, swap: bool = True) -> Dict[str, Any]:
+        """Re-embeds every memory with a new model and switches to it. Resumes an interrupted migration."""
+        from .embedding_migration import migrate_embeddings
+        return migrate_embeddings(self, target_backend=target_backend, swap=swap)
+
+    def switch_collection(self, collection: VectorStore, embedding_backend: Optional[EmbeddingBackend] = None):
+        """
+        Makes another vector store the active one, e.g. when a migration completes.
+        The embedding cache and the hot tier are rebuilt for it, and the previous
+        store (and backend, if it changed) is closed.
+        """
+        with self.write_lock:
+            previous_collection, previous_backend = self.collection, self.embedding_backend
+            embedding_backend = embedding_backend or previous_backend
+            if embedding_backend is not previous_backend and self.embedding_cache:
+                self.embedding_cache.close()
+                self.embedding_cache = EmbeddingCache(
+                    embedding_backend.model_id, path=os.path.join(self.db_path, EMBEDDING_CACHE_FILENAME)
+                )
+            self.embedding_backend = embedding_backend
+            self.collection = collection
+            self._pointer_mtime = self._active_pointer_mtime()
+            self._note_write()
+            if self.hot_tier is not None:
+                self.hot_tier = HotTier()
+                self._warm_hot_tier()
+            previous_collection.close()
+            if embedding_backend is not previous_backend:
+                previous_backend.close()
+        print(f"✅ Memory Manager switched to '{collection.name}' ({embedding_backend.model_id}).")
+
+    def export_snapshot(self, path: str) -> Dict[str, Any]:
+        """Writes every memory, with its embedding, to a snapshot directory."""
+        from .memory_snapshot import export_snapshot
+        return export_snapshot(self, path)
+
+    def import_snapshot(self, path: str, allow_model_mismatch: bool = False) -> Dict[str, Any]:
+        """Restores memories from a snapshot directory without re-embedding them."""
+        from .memory_snapshot import import_snapshot
+        return import_snapshot(self, path, allow_model_mismatch=allow_model_mismatch)
+
     def shutdown(self):
         """
-        Shuts down the ChromaDB client connection cleanly by resetting it.
+        Shuts down the memory subsystems cleanly. The stored memories are left
+        intact; the vector store and the side stores are flushed and closed.
         """
-        print("Shutting down Memory Manager and ChromaDB connection...")
-        self.db_client.reset()
+        print("Shutting down Memory Manager and vector store...")
+        if self.embedding_cache:
+            stats = self.embedding_cache.stats()
+            print(f"-> Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.0%} hit rate, {stats['stored_entries']} vectors stored).")
+            self.embedding_cache.close()
+        if self.retrieval_cache:
+            stats = self.retrieval_cache.stats()
+            print(f"-> Retrieval cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate).")
+        if self.keyword_index:
+            self.keyword_index.close()
+        self.access_log.close()
+        if self._cold_executor:
+            self._cold_executor.shutdown(wait=True)
+        self.collection.close()
+        self.embedding_backend.close()
         print("✅ Memory Manager shut down.")
+
+
+def _validate_item(item: Dict[str, Any], seen_ids: set) -> str:
+    """Returns the reason an item cannot be stored, or an empty string if it is valid."""
+    text, doc_id, metadata = item.get("text"), item.get("doc_id"), item.get("metadata")
+    if not isinstance(doc_id, str) or not doc_id:
+        return "missing document id"
+    if doc_id in seen_ids:
+        return "duplicate document id in batch"
+    if not isinstance(text, str) or not text.strip():
+        return "empty text"
+    if not isinstance(metadata, dict) or not metadata:
+        return "metadata must be a non-empty dict"
+    for key, value in metadata.items():
+        if not isinstance(value, _METADATA_VALUE_TYPES):
+            return f"unsupported metadata value for '{key}' ({type(value).__name__})"
+    return ""
+
+
+def _to_epoch(value: Union[datetime, float, str]) -> float:
+    """Converts a datetime, an ISO timestamp string or epoch seconds to epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+def _with_timestamp_epoch(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a copy of the metadata with a numeric `timestamp_epoch`, taken from
+    its ISO `timestamp` when there is one, or the current time otherwise.
+    """
+    if isinstance(metadata.get("timestamp_epoch"), (int, float)):
+        return metadata
+    try:
+        epoch = _to_epoch(metadata["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        epoch = time.time()
+    return {**metadata, "timestamp_epoch": epoch}
+
+
+def build_where_filter(
+    memory_types: Optional[Sequence[str]] = None,
+    sources: Optional[Sequence[str]] = None,
+    since: Optional[Union[datetime, float]] = None,
+    until: Optional[Union[datetime, float]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Builds the ChromaDB `where` clause for the retrieval filters, or None when there are none."""
+    clauses = []
+    if memory_types:
+        clauses.append({"type": {"$in": list(memory_types)}})
+    if sources:
+        clauses.append({"source": {"$in": list(sources)}})
+    if since is not None:
+        clauses.append({"timestamp_epoch": {"$gte": _to_epoch(since)}})
+    if until is not None:
+        clauses.append({"timestamp_epoch": {"$lte": _to_epoch(until)}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def recency_weight(metadata: Dict[str, Any], now: float, half_life_hours: float) -> float:
+    """
+    Returns the rank multiplier for a memory's age. It halves every
+    `half_life_hours` towards RECENCY_DECAY_FLOOR. Memories of other types than
+    RECENCY_DECAY_TYPES, or without a timestamp, are not decayed. A memory that
+    absorbed newer duplicates during compaction is as recent as its `last_seen_epoch`.
+    """
+    epochs = [metadata.get(key) for key in ("timestamp_epoch", "last_seen_epoch")] if metadata else []
+    epochs = [epoch for epoch in epochs if isinstance(epoch, (int, float))]
+    if metadata is None or metadata.get("type") not in RECENCY_DECAY_TYPES or not epochs:
+        return 1.0
+    age_hours = max(0.0, now - max(epochs)) / 3600
+    return RECENCY_DECAY_FLOOR + (1 - RECENCY_DECAY_FLOOR) * 0.5 ** (age_hours / half_life_hours)
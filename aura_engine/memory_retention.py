@@ -0,0 +1,303 @@
+# aura_engine/memory_retention.py
+#
+# Keeps the live memory index at a bounded size. Without eviction, every turn
+# and every sleep cycle grows the collection, and query latency grows with it.
+# A retention pass scores every memory by importance:
+#
+#   - its type (facts outrank summaries, which outrank raw interactions),
+#   - how often it has been recalled (counted in a small SQLite access log),
+#   - how recently it was stored or recalled (exponential decay), and
+#   - the emotional intensity of the turn it came from.
+#
+# When the collection exceeds RETENTION_MAX_MEMORIES, the lowest-scoring
+# memories are moved into a cold archive: compressed, append-only segment
+# files with float16 embeddings, which are searched only on demand. Nothing is
+# forgotten; it just stops costing time on every query.
+
+import glob
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Add project root to path to allow direct script execution
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import (
+    RETENTION_MAX_MEMORIES, RETENTION_TARGET_RATIO, RETENTION_TYPE_WEIGHTS, RETENTION_ACCESS_WEIGHT,
+    RETENTION_RECENCY_WEIGHT, RETENTION_RECENCY_HALF_LIFE_HOURS, RETENTION_EMOTION_WEIGHT,
+    COMPACTION_BLOCK_SIZE
+)
+from aura_engine.emotion_vectors import EMOTION_LABELS, decode_vectors
+from aura_engine.vector_stores import matches_where
+
+# Types not listed in RETENTION_TYPE_WEIGHTS get this weight.
+_DEFAULT_TYPE_WEIGHT = 0.5
+# The emotion columns that count towards intensity: everything but "neutral".
+_INTENSITY_COLUMNS = [i for i, label in enumerate(EMOTION_LABELS) if label != "neutral"]
+
+class AccessLog:
+    """
+    Recall counts and last-recall times of memories, backed by SQLite.
+    Recalls are counted in memory and written on `flush`, so retrieval never
+    waits for a disk write. Safe to use from several threads.
+    """
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS access (doc_id TEXT PRIMARY KEY, count INTEGER, last_epoch REAL)")
+        self._db.commit()
+        self._pending: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, doc_ids: Sequence[str], now: Optional[float] = None):
+        """Counts one recall of each memory."""
+        now = now or time.time()
+        with self._lock:
+            for doc_id in doc_ids:
+                entry = self._pending.setdefault(doc_id, [0, now])
+                entry[0] += 1
+                entry[1] = now
+
+    def flush(self):
+        """Writes the recalls counted since the last flush."""
+        with self._lock:
+            if not self._pending:
+                return
+            self._db.executemany(
+                "INSERT INTO access (doc_id, count, last_epoch) VALUES (?, ?, ?) "
+                "ON CONFLICT(doc_id) DO UPDATE SET count = count + excluded.count, "
+                "last_epoch = MAX(last_epoch, excluded.last_epoch)",
+                [(doc_id, count, last) for doc_id, (count, last) in self._pending.items()]
+            )
+            self._db.commit()
+            self._pending.clear()
+
+    def counts(self) -> Dict[str, tuple]:
+        """Returns (recall count, last recall epoch) of every recalled memory."""
+        self.flush()
+        with self._lock:
+            return {row[0]: (row[1], row[2]) for row in self._db.execute("SELECT doc_id, count, last_epoch FROM access")}
+
+    def forget(self, doc_ids: Sequence[str]):
+        with self._lock:
+            for doc_id in doc_ids:
+                self._pending.pop(doc_id, None)
+            self._db.executemany("DELETE FROM access WHERE doc_id = ?", [(doc_id,) for doc_id in doc_ids])
+            self._db.commit()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+
+class ColdArchive:
+    """
+    Evicted memories, stored as compressed segment files (one per retention
+    pass) in a directory. Segments are loaded only when the archive is
+    searched, and then kept in memory until the archive changes.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._loaded: Optional[Dict[str, Any]] = None
+
+    def _segments(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.path, "segment-*.npz")))
+
+    def add(self, ids: List[str], embeddings: np.ndarray, documents: List[str], metadatas: List[Dict[str, Any]]):
+        """Writes one segment. The write is atomic, so a crash never leaves a partial segment."""
+        if not ids:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        segments = self._segments()
+        number = int(os.path.basename(segments[-1])[8:-4]) + 1 if segments else 0
+        records = json.dumps([{"id": doc_id, "document": document, "metadata": metadata}
+                              for doc_id, document, metadata in zip(ids, documents, metadatas)])
+        temp_path = os.path.join(self.path, f"writing-{number:06d}.npz")
+        np.savez_compressed(
+            temp_path,
+            embeddings=np.asarray(embeddings, dtype=np.float16),
+            records=np.frombuffer(records.encode("utf-8"), dtype=np.uint8),
+        )
+        os.replace(temp_path, os.path.join(self.path, f"segment-{number:06d}.npz"))
+        self._loaded = None
+
+    def _load(self) -> Dict[str, Any]:
+        """Loads every segment. A memory archived twice (e.g. after an interrupted pass) keeps its latest copy."""
+        if self._loaded is not None:
+            return self._loaded
+        position: Dict[str, int] = {}
+        records, blocks = [], []
+        for segment in self._segments():
+            with np.load(segment) as data:
+                segment_records = json.loads(data["records"].tobytes().decode("utf-8"))
+                blocks.append(data["embeddings"])
+            for record in segment_records:
+                if record["id"] in position:
+                    records[position[record["id"]]] = None
+                position[record["id"]] = len(records)
+                records.append(record)
+        keep = [i for i, record in enumerate(records) if record is not None]
+        # Segments written with another embedding model may differ in size; only the newest size is searchable.
+        dimensions = blocks[-1].shape[1] if blocks else 0
+        rows = [block if block.shape[1] == dimensions else np.zeros((len(block), dimensions), dtype=np.float16)
+                for block in blocks]
+        searchable = np.concatenate([np.full(len(block), block.shape[1] == dimensions) for block in blocks]) if blocks else np.zeros(0, dtype=bool)
+        matrix = np.vstack(rows).astype(np.float32)[keep] if rows else np.zeros((0, 0), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._loaded = {
+            "records": [records[i] for i in keep],
+            "vectors": matrix / np.where(norms == 0, 1.0, norms),
+            "searchable": searchable[keep],
+        }
+        return self._loaded
+
+    def count(self) -> int:
+        return len(self._load()["records"])
+
+    def search(self, query_vector: Sequence[float], n_results: int = 3, where: Optional[Dict] = None,
+               model_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the archived memories most similar to a query, best first, each
+        with its cosine `score`. `where` is a ChromaDB-style metadata filter.
+        With `model_id`, memories stamped with another embedding model are skipped.
+        """
+        loaded = self._load()
+        if not loaded["records"]:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape[0] != loaded["vectors"].shape[1]:
+            print("   ⚠️ The cold archive was embedded with a different model and cannot be searched with this query.")
+            return []
+        scores = loaded["vectors"] @ (query / (np.linalg.norm(query) or 1.0))
+        allowed = loaded["searchable"]
+        if model_id is not None:
+            allowed = allowed & np.array([record["metadata"].get("embedding_model", model_id) == model_id
+                                          for record in loaded["records"]], dtype=bool)
+        if where is not None:
+            allowed = allowed & np.array([matches_where(record["metadata"], where) for record in loaded["records"]], dtype=bool)
+        scores = np.where(allowed, scores, -np.inf)
+        results = []
+        for i in np.argsort(-scores)[:n_results]:
+            if not np.isfinite(scores[i]):
+                break
+            record = loaded["records"][i]
+            results.append({"id": record["id"], "text": record["document"], "metadata": record["metadata"], "score": float(scores[i])})
+        return results
+
+    def storage_bytes(self) -> int:
+        return sum(os.path.getsize(segment) for segment in self._segments())
+
+
+def importance_scores(metadatas: List[Dict[str, Any]], accesses: Dict[str, tuple], ids: List[str],
+                      now: Optional[float] = None) -> np.ndarray:
+    """
+    Scores memories for retention; higher is more worth keeping. The score is
+    the type weight plus weighted terms for recall count, recency of storage
+    or recall, and emotional intensity (the strongest non-neutral emotion).
+    """
+    now = now or time.time()
+    type_weights = np.array([RETENTION_TYPE_WEIGHTS.get(metadata.get("type"), _DEFAULT_TYPE_WEIGHT) for metadata in metadatas])
+    counts = np.array([accesses.get(doc_id, (0, 0.0))[0] for doc_id in ids], dtype=np.float64)
+    last_seen = np.array([
+        max(float(metadata.get("timestamp_epoch") or 0.0), float(metadata.get("last_seen_epoch") or 0.0),
+            accesses.get(doc_id, (0, 0.0))[1])
+        for doc_id, metadata in zip(ids, metadatas)
+    ])
+    age_hours = np.maximum(now - last_seen, 0.0) / 3600
+    recency = np.power(0.5, age_hours / RETENTION_RECENCY_HALF_LIFE_HOURS)
+    emotions = decode_vectors([metadata.get("emotion_vector") for metadata in metadatas])
+    intensity = emotions[:, _INTENSITY_COLUMNS].max(axis=1) if len(emotions) else np.zeros(0)
+    return (type_weights + RETENTION_ACCESS_WEIGHT * np.log1p(counts)
+            + RETENTION_RECENCY_WEIGHT * recency + RETENTION_EMOTION_WEIGHT * intensity)
+
+
+def run_retention(
+    memory_manager: 'MemoryManager',
+    max_memories: int = RETENTION_MAX_MEMORIES,
+    target_ratio: float = RETENTION_TARGET_RATIO,
+    block_size: int = COMPACTION_BLOCK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Moves the least important memories to the cold archive when the live
+    collection is larger than `max_memories`.
+
+    Args:
+        memory_manager (MemoryManager): The memory store to trim.
+        max_memories (int): The size above which memories are evicted.
+        target_ratio (float): Eviction trims the collection to this share of `max_memories`,
+            so the next pass is not needed right away.
+        block_size (int): The number of memories loaded and archived at a time.
+
+    Returns:
+        Dict: `live` (memories kept), `archived` (memories moved in this pass),
+              `archive_total` (memories in the archive) and `seconds`.
+    """
+    start = time.perf_counter()
+    print("\n--- Starting Memory Retention ---")
+    collection = memory_manager.collection
+    total = collection.count()
+    report = {"live": total, "archived": 0, "archive_total": None, "seconds": 0.0}
+    if total <= max_memories:
+        print(f"   ✅ {total} live memories, within the limit of {max_memories}.")
+        return report
+
+    stored = collection.get(include=["metadatas"])
+    ids, metadatas = stored["ids"], [metadata or {} for metadata in stored["metadatas"]]
+    accesses = memory_manager.access_log.counts() if memory_manager.access_log else {}
+    scores = importance_scores(metadatas, accesses, ids)
+    evict_count = total - int(max_memories * target_ratio)
+    # Ties go to the older memory, so equally unimportant memories leave in storage order.
+    evict = [ids[i] for i in np.argsort(scores, kind="stable")[:evict_count]]
+    print(f"-> {total} live memories exceed the limit of {max_memories}. Archiving the {len(evict)} least important...")
+
+    for block_start in range(0, len(evict), block_size):
+        block_ids = evict[block_start:block_start + block_size]
+        block = collection.get(ids=block_ids, include=["embeddings", "documents", "metadatas"])
+        if not block["ids"]:
+            continue
+        # The archive is written before the memories are removed, so an interruption loses nothing.
+        memory_manager.cold_archive.add(block["ids"], np.asarray(block["embeddings"], dtype=np.float32),
+                                        block["documents"], [metadata or {} for metadata in block["metadatas"]])
+        memory_manager.delete_memories(block["ids"])
+        report["archived"] += len(block["ids"])
+
+    report["live"] = collection.count()
+    report["archive_total"] = memory_manager.cold_archive.count()
+    report["seconds"] = time.perf_counter() - start
+    print(f"   ✅ Archived {report['archived']} memories in {report['seconds']:.2f}s; {report['live']} live, "
+          f"{report['archive_total']} archived ({memory_manager.cold_archive.storage_bytes() / 1024:.1f} KB).")
+    return report
+
+
+# --- Main Execution Block for Standalone Script ---
+if __name__ == "__main__":
+    import argparse
+    from config import EMBEDDING_BACKEND
+    from aura_engine.memory_manager import MemoryManager
+
+    parser = argparse.ArgumentParser(description="Move the least important memories to the cold archive.")
+    parser.add_argument("--max-memories", type=int, default=RETENTION_MAX_MEMORIES, help="Live memories to keep at most.")
+    parser.add_argument("--search", metavar="QUERY", help="Search the cold archive instead of running a retention pass.")
+    args = parser.parse_args()
+
+    print("--- Running Standalone Memory Retention Script ---")
+    client = None
+    if EMBEDDING_BACKEND == "lmstudio":
+        import lmstudio as lms
+        client = lms.Client()
+    memory_manager = MemoryManager(client=client)
+    try:
+        if args.search:
+            for memory in memory_manager.search_archive(args.search, num_results=5):
+                print(f"   {memory['score']:.3f}  {memory['id']}: {memory['text']}")
+        else:
+            run_retention(memory_manager, max_memories=args.max_memories)
+    finally:
+        memory_manager.shutdown()
+    print("\n--- Standalone Script Finished ---")
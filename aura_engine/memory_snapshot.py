@@ -0,0 +1,153 @@
+# aura_engine/memory_snapshot.py
+#
+# Export and import of the long-term memory store. A snapshot is a directory
+# with three files:
+#
+#   embeddings.f32     every embedding as raw little-endian float32, row by row
+#   records.jsonl.gz   one {"id", "document", "metadata"} line per memory, same order
+#   manifest.json      format version, embedding model, dimensions and counts
+#
+# Both directions stream in chunks, so memory use does not grow with the store.
+# Importing restores the stored embeddings directly, which is far faster than
+# re-embedding every document. The manifest is written last, so an interrupted
+# export is never mistaken for a complete snapshot.
+
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+import numpy as np
+
+from config import SNAPSHOT_CHUNK_SIZE
+
+SNAPSHOT_FORMAT = "aura-memory-snapshot"
+SNAPSHOT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.f32"
+RECORDS_FILE = "records.jsonl.gz"
+
+def export_snapshot(memory_manager: 'MemoryManager', path: str, chunk_size: int = SNAPSHOT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Streams every memory (id, document, metadata and embedding) into a snapshot directory.
+
+    Returns:
+        Dict: The snapshot manifest.
+    """
+    start = time.perf_counter()
+    os.makedirs(path, exist_ok=True)
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    collection = memory_manager.collection
+    count, dimensions = 0, 0
+    with open(os.path.join(path, EMBEDDINGS_FILE), "wb") as vector_file, \
+            gzip.open(os.path.join(path, RECORDS_FILE), "wt", encoding="utf-8") as record_file:
+        offset = 0
+        while True:
+            chunk = collection.get(limit=chunk_size, offset=offset, include=["embeddings", "documents", "metadatas"])
+            if not chunk["ids"]:
+                break
+            vectors = np.asarray(chunk["embeddings"], dtype="<f4")
+            dimensions = dimensions or vectors.shape[1]
+            vector_file.write(vectors.tobytes())
+            for doc_id, document, metadata in zip(chunk["ids"], chunk["documents"], chunk["metadatas"]):
+                record_file.write(json.dumps({"id": doc_id, "document": document, "metadata": metadata}) + "\n")
+            count += len(chunk["ids"])
+            offset += len(chunk["ids"])
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.now().isoformat(),
+        "collection": collection.name,
+        "embedding_model": memory_manager.embedding_backend.model_id,
+        "dimensions": dimensions,
+        "count": count,
+        "files": {"embeddings": EMBEDDINGS_FILE, "records": RECORDS_FILE},
+    }
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    seconds = time.perf_counter() - start
+    print(f"✅ Exported {count} memories to '{path}' in {seconds:.2f}s.")
+    return manifest
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Reads and checks a snapshot manifest."""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No complete snapshot at '{path}' (missing {MANIFEST_FILE}).")
+    with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get("format") != SNAPSHOT_FORMAT or manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot format: {manifest.get('format')} v{manifest.get('version')}.")
+    return manifest
+
+
+def import_snapshot(memory_manager: 'MemoryManager', path: str, chunk_size: int = SNAPSHOT_CHUNK_SIZE,
+                    allow_model_mismatch: bool = False) -> Dict[str, Any]:
+    """
+    Restores a snapshot into the memory store without re-embedding. Memories that
+    already exist are overwritten, so importing the same snapshot twice is harmless.
+
+    Args:
+        allow_model_mismatch (bool): Import even if the snapshot was made with a
+            different embedding model. Its vectors would not be comparable, so this is off by default.
+
+    Returns:
+        Dict: `imported` (memories written) and `seconds`.
+    """
+    start = time.perf_counter()
+    manifest = read_manifest(path)
+    model_id = memory_manager.embedding_backend.model_id
+    if manifest["embedding_model"] != model_id and not allow_model_mismatch:
+        raise ValueError(
+            f"The snapshot was embedded with '{manifest['embedding_model']}', but the current model is '{model_id}'."
+        )
+
+    count, dimensions = manifest["count"], manifest["dimensions"]
+    imported = 0
+    if count:
+        vectors = np.memmap(os.path.join(path, EMBEDDINGS_FILE), dtype="<f4", mode="r", shape=(count, dimensions))
+        with gzip.open(os.path.join(path, RECORDS_FILE), "rt", encoding="utf-8") as record_file:
+            batch = []
+            for line in record_file:
+                batch.append(json.loads(line))
+                if len(batch) == chunk_size:
+                    _write_chunk(memory_manager, batch, vectors[imported:imported + len(batch)])
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                _write_chunk(memory_manager, batch, vectors[imported:imported + len(batch)])
+                imported += len(batch)
+        del vectors
+
+    if imported != count:
+        print(f"   ⚠️ The snapshot manifest lists {count} memories, but {imported} were read.")
+    seconds = time.perf_counter() - start
+    print(f"✅ Imported {imported} memories from '{path}' in {seconds:.2f}s.")
+    return {"imported": imported, "seconds": seconds}
+
+
+def _write_chunk(memory_manager: 'MemoryManager', records: list, vectors: np.ndarray):
+    """Writes one chunk of snapshot records to the collection and the keyword index."""
+    ids = [record["id"] for record in records]
+    documents = [record["document"] for record in records]
+    with memory_manager.write_lock:
+        memory_manager.collection.upsert(
+            ids=ids,
+            documents=documents,
+            embeddings=np.asarray(vectors, dtype=np.float32),
+            metadatas=[record["metadata"] for record in records],
+        )
+        memory_manager._note_write()
+        if memory_manager.keyword_index:
+            memory_manager.keyword_index.add_documents(zip(ids, documents))
+        if memory_manager.hot_tier is not None:
+            # Overwritten memories must not be served from a stale hot copy.
+            memory_manager.hot_tier.remove(ids)
@@ -0,0 +1,162 @@
+# aura_engine/narrative_batcher.py
+#
+# This module summarizes finished turns in batches. Instead of one LLM round
+# trip per turn, the background pipeline buffers turns and summarizes them in a
+# single call that returns one summary per turn as raw JSON. Like the per-turn
+# summarizer, it uses plain prompting rather than LM Studio's response_format,
+# which Nemo-12B does not reliably support (ADR-013); the JSON is validated
+# against TurnSummaryBatch instead. The summaries are then embedded and stored
+# in one batch. Any turn that the batch call fails to summarize falls back to
+# the per-turn summarizer, so a malformed batch never loses a turn.
+#
+# A flush serves several turns, so it is traced as its own record rather than
+# as part of whichever turn happened to trigger it.
+
+import json
+from typing import Any, Callable, Dict, List
+
+from config import SUMMARY_BATCH_SIZE
+from .schemas import TurnSummaryBatch
+from .tracing import Tracer, activate, span
+
+_BATCH_SUMMARIZER_PROMPT = (
+    "You are a narrative assistant. You will receive several numbered conversational turns "
+    "between Ben (User) and Aurora (Agent). Summarize EACH turn into a brief, third-person "
+    "narrative statement of a single, concise sentence. For example, 'Ben asked about the "
+    "weather, and Aurora responded that it would be sunny.' Return exactly one summary per "
+    "turn, and copy each turn's index into `turn_index`. Do not merge turns or invent details. "
+    "Your output MUST BE ONLY a raw JSON string that adheres to the schema "
+    '{"summaries": [{"turn_index": 0, "summary_text": "string"}]}. '
+    "Do not add any other text or formatting."
+)
+
+class NarrativeBatcher:
+    """
+    Buffers finished turns and stores them as summarized memories in batches.
+
+    Each buffered turn is a dict with the keys `user_prompt`, `agent_response`,
+    `doc_id` and `metadata`.
+    """
+    def __init__(
+        self,
+        model: Any,
+        memory_manager: Any,
+        single_summarizer: Callable[[str, str], str],
+        batch_size: int = SUMMARY_BATCH_SIZE,
+        tracer: Tracer = None,
+    ):
+        """
+        Args:
+            model: The LLM handle used for the batch summarization call.
+            memory_manager: The MemoryManager that stores the summarized memories.
+            single_summarizer (Callable): The per-turn summarizer used as a fallback.
+            batch_size (int): The number of buffered turns that triggers a flush.
+            tracer (Tracer): If given, each flush is written as a "summary_batch" trace.
+        """
+        self.model = model
+        self.memory = memory_manager
+        self.single_summarizer = single_summarizer
+        self.batch_size = max(1, batch_size)
+        self.pending: List[Dict[str, Any]] = []
+        self.tracer = tracer
+
+    def add(self, turn: Dict[str, Any]):
+        """Buffers a turn, and flushes the buffer once it reaches the batch size."""
+        self.pending.append(turn)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Summarizes and stores every buffered turn.
+
+        Returns:
+            int: The number of turns that were flushed.
+        """
+        if not self.pending:
+            return 0
+        turns, self.pending = self.pending, []
+
+        trace = self.tracer.new_background_trace("summary_batch") if self.tracer else None
+        try:
+            with activate(trace):
+                self._summarize_and_store(turns)
+        finally:
+            if self.tracer:
+                self.tracer.finish(trace)
+        return len(turns)
+
+    def _summarize_and_store(self, turns: List[Dict[str, Any]]):
+        """Summarizes the turns, stores them in one batch and reports each turn's outcome."""
+        print(f"[Generating narrative summaries for {len(turns)} buffered turns...]")
+        with span("summarize", turns=len(turns), batched=True):
+            summaries = self._summarize_batch(turns)
+
+        for index, turn in enumerate(turns):
+            if not summaries.get(index):
+                summaries[index] = self.single_summarizer(turn["user_prompt"], turn["agent_response"])
+
+        result = self.memory.add_memories([
+            {"text": summaries[index], "doc_id": turn["doc_id"], "metadata": turn["metadata"]}
+            for index, turn in enumerate(turns)
+        ], verbose=False)
+        failed = result["failed"]
+        for index, turn in enumerate(turns):
+            if turn["doc_id"] in failed:
+                print(f"   ❌ Summarized memory could not be stored ({failed[turn['doc_id']]}): {summaries[index]}")
+            else:
+                print(f"[Summarized memory stored in DB: {summaries[index]}]")
+
+    def _summarize_batch(self, turns: List[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Summarizes all turns in one LLM call that answers with raw JSON.
+
+        Returns:
+            Dict[int, str]: Summaries keyed by turn index. Turns that could not be
+            summarized are missing, so the caller can fall back for them alone.
+        """
+        if len(turns) == 1:
+            # A batch of one gains nothing over the per-turn summarizer.
+            return {}
+
+        content = "\n".join(
+            f"<conversation_turn index=\"{index}\">\nUser: {turn['user_prompt']}\nAgent: {turn['agent_response']}\n</conversation_turn>"
+            for index, turn in enumerate(turns)
+        )
+        try:
+            import lmstudio as lms
+            temp_chat = lms.Chat(_BATCH_SUMMARIZER_PROMPT)
+            temp_chat.add_user_message(content)
+
+            response_text = str(self.model.respond(
+                temp_chat,
+                config={"temperature": 0.2}
+            ))
+            return parse_summary_batch(response_text, len(turns))
+
+        except Exception as e:
+            print(f"   ⚠️ Batch summarization failed: {e}. Falling back to per-turn summaries.")
+            return {}
+
+
+def parse_summary_batch(parsed: Any, turn_count: int) -> Dict[int, str]:
+    """
+    Validates a batch summarization result against the TurnSummaryBatch schema.
+
+    Entries with an unknown or duplicate turn index, or with empty text, are
+    dropped, so only those turns fall back to per-turn summarization.
+    """
+    if isinstance(parsed, str):
+        parsed = json.loads(parsed)
+    batch = TurnSummaryBatch(**parsed)
+
+    summaries: Dict[int, str] = {}
+    for entry in batch.summaries:
+        text = entry.summary_text.strip()
+        if 0 <= entry.turn_index < turn_count and entry.turn_index not in summaries and text:
+            summaries[entry.turn_index] = text
+
+    missing = turn_count - len(summaries)
+    if missing:
+        print(f"   ⚠️ Batch summary was missing {missing} of {turn_count} turns. Falling back for those turns.")
+    return summaries
@@ -1,31 +1,118 @@
-# aura_engine/process_emotions.py (v2.0 - Upgraded Model)
+# aura_engine/process_emotions.py (v2.4 - Selectable Classifier Backend)
 #
-# This module has been upgraded to use a sophisticated, multi-label emotion
-# classification model, providing a much richer emotional analysis.
+# This version loads the classifier named by EMOTION_BACKEND: the PyTorch
+# pipeline, or a quantized ONNX graph run by onnxruntime. Both return the same
+# scores format, so batching and overlays work unchanged with either.
 
-from transformers import pipeline
-from typing import List, Dict
+import time
+from typing import List, Dict, Sequence
+
+from config import EMOTION_ANALYSIS_ENABLED, EMOTION_BATCH_SIZE, EMOTION_BACKEND, EMOTION_MODEL_IDENTIFIER
 
 # --- Global variable to hold the loaded model ---
 # This ensures the model is loaded into memory only once.
 emotion_classifier = None
 
-def initialize_emotion_classifier():
+def create_emotion_classifier(backend: str = EMOTION_BACKEND):
     """
-    Initializes the emotion classification pipeline if it hasn't been already.
+    Creates the emotion classifier of a backend: "transformers" or "onnx".
+    Either one is called with a list of texts and returns all 28 label scores per text.
     """
-    global emotion_classifier
-    if emotion_classifier is None:
-        print("Initializing multi-label emotion classification model...")
+    if backend == "onnx":
+        from .emotion_onnx import OnnxEmotionClassifier
+        return OnnxEmotionClassifier()
+    if backend == "transformers":
+        from transformers import pipeline
+
         # On the first run, this will download the model from the Hugging Face Hub.
         # Subsequent runs will use the cached version for offline operation.
-        emotion_classifier = pipeline(
+        return pipeline(
             task="text-classification",
-            model="SamLowe/roberta-base-go_emotions",
+            model=EMOTION_MODEL_IDENTIFIER,
             top_k=None  # Ensures all 28 emotion scores are returned
         )
+    raise ValueError(f"Unknown emotion backend '{backend}'. Use 'transformers' or 'onnx'.")
+
+def initialize_emotion_classifier():
+    """
+    Initializes the emotion classifier of EMOTION_BACKEND if it hasn't been already.
+    """
+    global emotion_classifier
+    if emotion_classifier is None:
+        print(f"Initializing multi-label emotion classification model ({EMOTION_BACKEND} backend)...")
+        emotion_classifier = create_emotion_classifier(EMOTION_BACKEND)
         print("✅ Emotion classifier initialized successfully.")
 
+def _is_valid_text(text_chunk) -> bool:
+    return isinstance(text_chunk, str) and bool(text_chunk.strip())
+
+def get_emotion_scores_batch(texts: Sequence[str], batch_size: int = EMOTION_BATCH_SIZE) -> List[Dict[str, float]]:
+    """
+    Analyzes many chunks of text and returns the score of every emotion label for each.
+
+    Args:
+        texts (list): The strings to analyze.
+        batch_size (int): The number of texts per forward pass.
+
+    Returns:
+        List[Dict[str, float]]: One dict of all 28 labels and their scores per text, in
+                                input order. Empty for invalid texts, when emotion analysis
+                                is disabled, or when the batch holding the text failed.
+    """
+    results: List[Dict[str, float]] = [{} for _ in texts]
+    if not EMOTION_ANALYSIS_ENABLED:
+        return results
+
+    # Ensure the model pipeline is initialized before proceeding.
+    initialize_emotion_classifier()
+
+    # Length bucketing: neighbours in this order have similar lengths, so little padding is computed.
+    order = sorted((i for i, text in enumerate(texts) if _is_valid_text(text)), key=lambda i: len(texts[i]))
+    for start in range(0, len(order), max(1, batch_size)):
+        batch = order[start:start + max(1, batch_size)]
+        try:
+            # The model returns one list of label scores per text
+            model_output = emotion_classifier([texts[i] for i in batch], batch_size=len(batch), truncation=True)
+            for i, emotions in zip(batch, model_output):
+                results[i] = {emotion['label']: emotion['score'] for emotion in emotions}
+        except Exception as e:
+            print(f"❌ Error during emotion analysis of {len(batch)} texts: {e}")
+    return results
+
+def get_emotion_scores(text_chunk: str) -> Dict[str, float]:
+    """
+    Analyzes a chunk of text and returns the score of every emotion label.
+
+    Returns:
+        Dict[str, float]: All 28 labels and their scores. Empty if the input is
+                          invalid, emotion analysis is disabled, or analysis failed.
+    """
+    if not _is_valid_text(text_chunk):
+        return {}
+    return get_emotion_scores_batch([text_chunk], batch_size=1)[0]
+
+def overlay_from_scores(scores: Dict[str, float], threshold: float = 0.3) -> List[Dict]:
+    """Returns the emotions above the threshold, strongest first, as the overlay format."""
+    detected_emotions = [
+        {'label': label, 'score': score} for label, score in scores.items()
+        if score > threshold
+    ]
+    # Sort by score in descending order
+    detected_emotions.sort(key=lambda x: x['score'], reverse=True)
+    return detected_emotions
+
+def overlay_for_text(text_chunk: str, scores: Dict[str, float], threshold: float = 0.3) -> List[Dict]:
+    """
+    Returns the overlay of a text from its already computed scores. Empty scores
+    for a valid text mean that analysis failed, which is marked with the
+    `[{'label': 'error', 'score': 1.0}]` overlay.
+    """
+    if not EMOTION_ANALYSIS_ENABLED or not _is_valid_text(text_chunk):
+        return []
+    if not scores:
+        return [{'label': 'error', 'score': 1.0}]
+    return overlay_from_scores(scores, threshold)
+
 def get_emotional_overlay(text_chunk: str, threshold: float = 0.3) -> List[Dict]:
     """
     Analyzes a chunk of text and returns a list of detected emotions
@@ -40,30 +127,35 @@ def get_emotional_overlay(text_chunk: str, threshold: float = 0.3) -> List[Dict]
                     an emotion 'label' and its 'score'. Returns an empty
                     list if the input is invalid or no emotions meet the threshold.
     """
-    # Ensure the model pipeline is initialized before proceeding.
-    initialize_emotion_classifier()
+    return get_emotional_overlays([text_chunk], threshold, batch_size=1, verbose=False)[0]
 
-    if not isinstance(text_chunk, str) or not text_chunk.strip():
-        return []
+def get_emotional_overlays(texts: Sequence[str], threshold: float = 0.3, batch_size: int = EMOTION_BATCH_SIZE,
+                           verbose: bool = True) -> List[List[Dict]]:
+    """
+    Analyzes many chunks of text in batches, e.g. to re-tag an archive, and
+    returns the thresholded overlay of each.
 
-    try:
-        # The model returns a list containing one list of results
-        model_output = emotion_classifier(text_chunk)
-        
-        # Filter the results to only include emotions above the threshold
-        detected_emotions = [
-            emotion for emotion in model_output[0]
-            if emotion['score'] > threshold
-        ]
-        
-        # Sort by score in descending order
-        detected_emotions.sort(key=lambda x: x['score'], reverse=True)
-        
-        return detected_emotions
-        
-    except Exception as e:
-        print(f"❌ Error during emotion analysis: {e}")
-        return [{'label': 'error', 'score': 1.0}]
+    Args:
+        texts (list): The strings to analyze.
+        threshold (float): The confidence score threshold for including an emotion.
+        batch_size (int): The number of texts per forward pass.
+        verbose (bool): Whether to print the throughput line.
+
+    Returns:
+        List[List[Dict]]: One overlay per text, in input order, exactly as
+                          `get_emotional_overlay` returns it for that text.
+    """
+    if not EMOTION_ANALYSIS_ENABLED:
+        return [[] for _ in texts]
+    start = time.perf_counter()
+    overlays = []
+    for text_chunk, scores in zip(texts, get_emotion_scores_batch(texts, batch_size)):
+        overlays.append(overlay_for_text(text_chunk, scores, threshold))
+    seconds = time.perf_counter() - start
+    if verbose and texts:
+        print(f"-> Classified {len(texts)} texts in {seconds:.2f}s "
+              f"({len(texts) / seconds if seconds > 0 else 0.0:.1f} texts/s, batch size {batch_size}).")
+    return overlays
 
 
 # --- Example Usage (for testing purposes) ---
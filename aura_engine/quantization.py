@@ -0,0 +1,64 @@
+# aura_engine/quantization.py
+#
+# Reduced-precision embedding codes for the native vector store. A float32
+# embedding costs 4 bytes per dimension; its search copy can be kept as
+# float16 (2 bytes, a plain cast) or int8 (1 byte plus one float32 scale per
+# vector, symmetric around zero). Searches scan the compact codes and the best
+# candidates are rescored against the float32 vectors, so only a handful of
+# full-precision rows are read per query.
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "int8")
+# The on-disk dtype of the codes of each reduced precision.
+CODE_DTYPES = {"float16": "<f2", "int8": "i1"}
+
+def check_precision(precision: str) -> str:
+    """
+    Raises:
+        ValueError: If the precision is not one of PRECISIONS.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown embedding precision: '{precision}'. Expected one of {', '.join(PRECISIONS)}.")
+    return precision
+
+
+def quantize(vectors: np.ndarray, precision: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Encodes float32 vectors. int8 codes use one scale per vector (its largest
+    absolute value / 127), so every vector uses the full int8 range.
+
+    Returns:
+        Tuple: The codes and, for int8, the (n, 1) float32 scales. Other precisions have no scales.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if check_precision(precision) == "float32":
+        return vectors, None
+    if precision == "float16":
+        return vectors.astype(CODE_DTYPES["float16"]), None
+    scales = np.abs(vectors).max(axis=1, keepdims=True) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales), -127, 127).astype(CODE_DTYPES["int8"])
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Decodes codes back to approximate float32 vectors."""
+    vectors = np.asarray(codes, dtype=np.float32)
+    return vectors * scales if scales is not None else vectors
+
+
+def code_bytes(rows: int, dimensions: int, precision: str) -> int:
+    """The bytes of the search copy of `rows` vectors at a precision, scales included."""
+    if check_precision(precision) == "int8":
+        return rows * (dimensions + 4)
+    return rows * dimensions * (2 if precision == "float16" else 4)
+
+
+def recall_at_k(expected: Sequence[Sequence[str]], found: Sequence[Sequence[str]], k: int) -> float:
+    """The share of the true top-k results, over all queries, that were found in the top k."""
+    hits = sum(len(set(truth[:k]) & set(result[:k])) for truth, result in zip(expected, found))
+    total = sum(min(k, len(truth)) for truth in expected)
+    return hits / total if total else 1.0
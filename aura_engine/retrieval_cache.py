@@ -0,0 +1,86 @@
+# aura_engine/retrieval_cache.py
+#
+# A small LRU of retrieval results in front of the vector store. Entries are
+# keyed by the normalized query text and the retrieval options, and belong to
+# the store's write generation: every write (a new memory, a deletion, a
+# metadata update) starts a new generation and drops all cached results, so a
+# cached answer is never older than the last write. A TTL bounds how long a
+# result may be reused at all, because recency weighting changes with the clock.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from config import RETRIEVAL_CACHE_ENTRIES, RETRIEVAL_CACHE_TTL_SECONDS
+from .embedding_cache import normalize_text
+
+class RetrievalCache:
+    """
+    An LRU of retrieval results, invalidated by writes. Safe to use from the
+    chat loop and the background memory pipeline at the same time.
+    """
+    def __init__(self, max_entries: int = RETRIEVAL_CACHE_ENTRIES, ttl_seconds: float = RETRIEVAL_CACHE_TTL_SECONDS):
+        """
+        Args:
+            max_entries (int): The number of cached result lists.
+            ttl_seconds (float): The age after which a cached result is no longer used.
+        """
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query_text: str, options: Hashable) -> Tuple:
+        return normalize_text(query_text), options
+
+    def get(self, query_text: str, options: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Returns a copy of the cached results of a query in the current generation, or None."""
+        key = self._key(query_text, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return [dict(memory) for memory in entry[1]]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, query_text: str, options: Hashable, results: List[Dict[str, Any]], generation: int):
+        """
+        Stores the results of a query. Results computed in an earlier generation
+        are dropped, because a write happened while they were being computed.
+        """
+        if not self.max_entries:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            key = self._key(query_text, options)
+            self._entries[key] = (time.monotonic(), [dict(memory) for memory in results])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Starts a new write generation and drops every cached result."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "generation": self.generation,
+            }
@@ -50,3 +50,28 @@ class NarrativeSummary(BaseModel):
         ...,
         description="A concise, third-person narrative summary of the key events and facts from the conversation."
     )
+
+class TurnSummary(BaseModel):
+    """
+    A narrative summary of one conversational turn within a batch. The turn
+    index ties the summary back to the turn it describes, so a batch with a
+    missing or reordered entry can still be matched up safely.
+    """
+    turn_index: int = Field(
+        ...,
+        description="The index of the conversational turn being summarized, exactly as given in the input."
+    )
+    summary_text: str = Field(
+        ...,
+        description="A single, concise, third-person sentence summarizing the turn."
+    )
+
+class TurnSummaryBatch(BaseModel):
+    """
+    A schema for summarizing several buffered conversational turns in a single
+    LLM call. It contains one TurnSummary per input turn.
+    """
+    summaries: List[TurnSummary] = Field(
+        ...,
+        description="One summary for every conversational turn in the input."
+    )
@@ -0,0 +1,108 @@
+# aura_engine/streaming.py
+#
+# This module streams an LLM response token-by-token instead of waiting for
+# the whole completion. Each fragment is forwarded to a list of listeners as
+# soon as it arrives (console printing, TTS, emotion analysis, ...), while the
+# full text is still assembled for the chat history. It also measures
+# time-to-first-token and generation speed for every turn.
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A listener receives every text fragment as soon as the model produces it.
+FragmentListener = Callable[[str], None]
+
+@dataclass
+class StreamMetrics:
+    """
+    Latency figures for a single streamed response.
+    """
+    time_to_first_token: Optional[float]  # Seconds from request to the first fragment.
+    total_seconds: float                  # Seconds from request to the final fragment.
+    token_count: int                      # Number of generated tokens.
+    tokens_per_second: Optional[float]    # Generation speed after the first token.
+
+    def describe(self) -> str:
+        """Returns a short, human-readable summary for the console."""
+        ttft = f"{self.time_to_first_token:.2f}s" if self.time_to_first_token is not None else "n/a"
+        speed = f"{self.tokens_per_second:.1f} tok/s" if self.tokens_per_second is not None else "n/a"
+        return f"TTFT {ttft} | {self.token_count} tokens | {speed} | total {self.total_seconds:.2f}s"
+
+
+def _notify(listeners: List[FragmentListener], fragment: str, failed: set):
+    """Sends a fragment to every listener. A failing listener is disabled, not fatal."""
+    for listener in listeners:
+        if id(listener) in failed:
+            continue
+        try:
+            listener(fragment)
+        except Exception as e:
+            failed.add(id(listener))
+            print(f"\n   ⚠️ Response listener {getattr(listener, '__name__', listener)} failed and was disabled: {e}")
+
+
+def stream_response(
+    model: Any,
+    history: Any,
+    config: Optional[Dict[str, Any]] = None,
+    listeners: Optional[List[FragmentListener]] = None,
+) -> Tuple[str, StreamMetrics]:
+    """
+    Streams a response from the model and forwards each fragment to the listeners.
+
+    Args:
+        model: An LM Studio LLM handle that supports `respond_stream`.
+        history: The chat history (or prompt) to respond to.
+        config (dict): The inference configuration.
+        listeners (list): Callables that receive each text fragment as it arrives.
+
+    Returns:
+        Tuple[str, StreamMetrics]: The complete response text and its latency figures.
+    """
+    listeners = listeners or []
+    failed_listeners = set()
+    fragments = []
+    token_count = 0
+    first_token_at = None
+
+    start = time.perf_counter()
+    prediction_stream = model.respond_stream(history, config=config)
+    for fragment in prediction_stream:
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+        fragments.append(fragment.content)
+        token_count += getattr(fragment, "tokens_count", 0) or 0
+        _notify(listeners, fragment.content, failed_listeners)
+    end = time.perf_counter()
+
+    # Prefer the server's own statistics when they are available.
+    stats = getattr(prediction_stream.result(), "stats", None)
+    token_count = getattr(stats, "predicted_tokens_count", None) or token_count
+
+    time_to_first_token = first_token_at - start if first_token_at is not None else None
+    generation_seconds = end - (first_token_at or start)
+    tokens_per_second = getattr(stats, "tokens_per_second", None)
+    if tokens_per_second is None and token_count and generation_seconds > 0:
+        tokens_per_second = token_count / generation_seconds
+
+    metrics = StreamMetrics(
+        time_to_first_token=time_to_first_token,
+        total_seconds=end - start,
+        token_count=token_count,
+        tokens_per_second=tokens_per_second,
+    )
+    return "".join(fragments), metrics
+
+
+def metrics_from_result(result: Any, total_seconds: float) -> StreamMetrics:
+    """
+    Builds latency figures for a non-streamed response from the server's statistics.
+    """
+    stats = getattr(result, "stats", None)
+    return StreamMetrics(
+        time_to_first_token=getattr(stats, "time_to_first_token_sec", None),
+        total_seconds=total_seconds,
+        token_count=getattr(stats, "predicted_tokens_count", None) or 0,
+        tokens_per_second=getattr(stats, "tokens_per_second", None),
+    )
@@ -0,0 +1,191 @@
+# aura_engine/tracing.py
+#
+# A lightweight latency tracing layer for the A.U.R.A. Engine. Each
+# conversational turn gets a TurnTrace, and the code paths of interest are
+# wrapped in `span(...)` blocks (retrieval, embedding, generation, emotion,
+# summary and storage). Because part of a turn runs on the background memory
+# pipeline, a trace is activated per thread and handed along with the turn.
+# Background work that serves several turns at once (a batch of narrative
+# summaries) gets its own trace record instead of joining one turn's.
+# Finished turns are appended to a JSONL trace file, and `summarize_traces`
+# computes p50/p95/p99 per stage across sessions.
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import TRACE_FILE_PATH, TRACING_ENABLED
+
+# The trace of the turn that the current thread is working on, if any.
+_active = threading.local()
+
+class TurnTrace:
+    """
+    Collects the timed spans of a single conversational turn.
+    Spans may be recorded from several threads.
+    """
+    def __init__(self, session_id: str, turn_index: int, kind: str = "turn"):
+        self.session_id = session_id
+        self.turn_index = turn_index
+        self.kind = kind
+        self.turn_id = str(uuid.uuid4())
+        self.timestamp = datetime.now().isoformat()
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float, attributes: Dict[str, Any]):
+        """Adds a finished span. `start` and `end` are `time.perf_counter()` values."""
+        entry = {
+            "name": name,
+            "start": round(start - self._origin, 6),
+            "duration": round(end - start, 6),
+            "thread": threading.current_thread().name,
+        }
+        entry.update(attributes)
+        with self._lock:
+            self.spans.append(entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "session_id": self.session_id,
+            "turn_id": self.turn_id,
+            "turn_index": self.turn_index,
+            "kind": self.kind,
+            "timestamp": self.timestamp,
+            "spans": spans,
+        }
+
+
+@contextmanager
+def activate(trace: Optional[TurnTrace]) -> Iterator[Optional[TurnTrace]]:
+    """Makes `trace` the active trace of the current thread for the duration of the block."""
+    previous = getattr(_active, "trace", None)
+    _active.trace = trace
+    try:
+        yield trace
+    finally:
+        _active.trace = previous
+
+
+def current_trace() -> Optional[TurnTrace]:
+    """Returns the trace that is active on the current thread, if any."""
+    return getattr(_active, "trace", None)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Times a block of code and records it on the active trace. Without an active
+    trace this is a no-op. The yielded dict can be used to attach attributes
+    that are only known once the block has run (e.g. token counts).
+    """
+    trace = current_trace()
+    start = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        if trace is not None:
+            trace.record(name, start, time.perf_counter(), attributes)
+
+
+class Tracer:
+    """
+    Creates a TurnTrace for every turn of a session and writes finished turns
+    to the JSONL trace file.
+    """
+    def __init__(self, trace_path: str = TRACE_FILE_PATH, enabled: bool = TRACING_ENABLED):
+        self.trace_path = trace_path
+        self.enabled = enabled
+        self.session_id = str(uuid.uuid4())
+        self.turn_count = 0
+        self._write_lock = threading.Lock()
+
+    def new_turn(self) -> Optional[TurnTrace]:
+        """Starts the trace for a new turn. Returns None when tracing is disabled."""
+        if not self.enabled:
+            return None
+        self.turn_count += 1
+        return TurnTrace(self.session_id, self.turn_count)
+
+    def new_background_trace(self, kind: str) -> Optional[TurnTrace]:
+        """
+        Starts a trace for background work that belongs to no single turn. Its
+        turn index is that of the latest turn. Returns None when tracing is disabled.
+        """
+        if not self.enabled:
+            return None
+        return TurnTrace(self.session_id, self.turn_count, kind=kind)
+
+    def finish(self, trace: Optional[TurnTrace]):
+        """Appends a finished turn to the trace file."""
+        if trace is None:
+            return
+        try:
+            directory = os.path.dirname(self.trace_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            line = json.dumps(trace.to_dict())
+            with self._write_lock:
+                with open(self.trace_path, "a", encoding="utf-8") as trace_file:
+                    trace_file.write(line + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            print(f"   ⚠️ Could not write turn trace: {e}")
+
+
+# --- Reporting ---
+def load_traces(trace_path: str = TRACE_FILE_PATH) -> List[Dict[str, Any]]:
+    """Reads every turn record from a JSONL trace file, skipping malformed lines."""
+    records = []
+    if not os.path.exists(trace_path):
+        return records
+    with open(trace_path, "r", encoding="utf-8") as trace_file:
+        for line in trace_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Returns the pct-th percentile (0-100) of the values, using linear interpolation."""
+    if not values:
+        raise ValueError("percentile() requires at least one value")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_traces(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Computes count, mean and p50/p95/p99 durations (in seconds) for every stage.
+    Every span is one sample of its stage.
+    """
+    durations: Dict[str, List[float]] = {}
+    for record in records:
+        for entry in record.get("spans", []):
+            durations.setdefault(entry["name"], []).append(entry["duration"])
+
+    summary = {}
+    for name, values in durations.items():
+        summary[name] = {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+        }
+    return summary
@@ -0,0 +1,676 @@
+# aura_engine/vector_stores.py
+#
+# Pluggable vector stores for the MemoryManager. Every store offers the subset
+# of the ChromaDB collection API that the engine uses (add, upsert, get, query,
+# update, delete and count), with the same argument names and result shapes,
+# so the MemoryManager, compaction and snapshots work with either backend.
+#
+#   - "chroma": a ChromaDB PersistentClient collection (the default).
+#   - "native": a memory-mapped float32 matrix plus an append-only JSONL log
+#     of ids, documents and metadata. Queries are exact, blocked matrix
+#     products; when hnswlib is installed and the store is large, an HNSW
+#     graph answers unfiltered queries instead. It has no dependencies beyond
+#     NumPy and opens in the time it takes to replay the log. Its search copy
+#     of the vectors can be kept in float16 or int8 (see quantization.py).
+#
+# Both backends rank by squared L2 distance, ChromaDB's default space, so they
+# return the same neighbours and distances for the same vectors.
+#
+# The backend is chosen with VECTOR_STORE_BACKEND in config.py.
+
+import json
+import os
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import (
+    VECTOR_STORE_BACKEND, NATIVE_STORE_HNSW, NATIVE_HNSW_MIN_VECTORS, NATIVE_HNSW_M,
+    NATIVE_HNSW_EF_CONSTRUCTION, NATIVE_HNSW_EF_SEARCH, NATIVE_SEARCH_BLOCK_ROWS,
+    NATIVE_STORE_PRECISION, QUANTIZATION_RESCORE_FACTOR
+)
+from .quantization import CODE_DTYPES, check_precision, quantize, dequantize, code_bytes
+
+_GET_INCLUDE = ("metadatas", "documents")
+_QUERY_INCLUDE = ("metadatas", "documents", "distances")
+
+class VectorStore:
+    """
+    The interface shared by all vector stores. Arguments and results follow
+    the ChromaDB collection API; `include` selects "embeddings", "documents",
+    "metadatas" and, for queries, "distances". Fields that were not included are None.
+    """
+    name = ""
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def add(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: List[Dict[str, Any]]):
+        """Stores new records. Ids that are already stored are left unchanged."""
+        raise NotImplementedError
+
+    def upsert(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: List[Dict[str, Any]]):
+        """Stores records, replacing any that are already stored."""
+        raise NotImplementedError
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None, offset: Optional[int] = None,
+            include: Sequence[str] = _GET_INCLUDE) -> Dict[str, Any]:
+        """Returns the stored records, in storage order, optionally restricted to ids and a `where` filter."""
+        raise NotImplementedError
+
+    def query(self, query_embeddings: Any, n_results: int = 10, where: Optional[Dict[str, Any]] = None,
+              include: Sequence[str] = _QUERY_INCLUDE) -> Dict[str, Any]:
+        """Returns the nearest records of every query vector, nearest first."""
+        raise NotImplementedError
+
+    def update(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Merges new metadata values into stored records."""
+        raise NotImplementedError
+
+    def delete(self, ids: List[str]):
+        raise NotImplementedError
+
+    def close(self):
+        """Flushes and releases the store."""
+
+
+class ChromaVectorStore(VectorStore):
+    """A ChromaDB collection in a PersistentClient database directory."""
+
+    def __init__(self, path: str, name: str):
+        import chromadb
+
+        self.db_client = chromadb.PersistentClient(path=path)
+        self._chroma_collection = self.db_client.get_or_create_collection(name=name)
+        self.name = name
+
+    def count(self) -> int:
+        return self._chroma_collection.count()
+
+    def add(self, ids, embeddings, documents, metadatas):
+        self._chroma_collection.add(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self._chroma_collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=_GET_INCLUDE):
+        return self._chroma_collection.get(ids=ids, where=where, limit=limit, offset=offset, include=list(include))
+
+    def query(self, query_embeddings, n_results=10, where=None, include=_QUERY_INCLUDE):
+        return self._chroma_collection.query(
+            query_embeddings=query_embeddings, n_results=n_results, where=where, include=list(include)
+        )
+
+    def update(self, ids, metadatas):
+        self._chroma_collection.update(ids=ids, metadatas=metadatas)
+
+    def delete(self, ids):
+        self._chroma_collection.delete(ids=ids)
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    A vector store in a directory of its own:
+
+      vectors-<generation>.f32   the embeddings, one float32 row per stored version of a record
+      vectors-<generation>.f16   with float16 precision: the search copy of every row
+      vectors-<generation>.i8    with int8 precision: the search copy of every row,
+        and .scales              plus one float32 scale per row
+      records.log                one JSON line per add, update or delete; the first line names the vectors file
+      hnsw.bin / hnsw.json       the optional HNSW graph and the state it was saved at
+
+    A vector row is always written before the log line that refers to it, so
+    the log never points at a row that is not on disk. Replaced and deleted rows
+    stay in the file until `compact` rewrites the store, which `close` does once
+    most rows are dead. Safe to use from the chat loop and the background
+    memory pipeline at the same time.
+
+    With a reduced precision, exact searches scan the compact search copy and
+    rescore the best candidates against the float32 rows, which stay the source
+    for `get` and snapshots. The search copy is rebuilt from the float32 rows
+    when it is missing, e.g. after the precision was changed.
+    """
+    LOG_FILE = "records.log"
+    HNSW_FILE = "hnsw.bin"
+    HNSW_STATE_FILE = "hnsw.json"
+
+    def __init__(self, path: str, name: str, use_hnsw: bool = NATIVE_STORE_HNSW,
+                 hnsw_min_vectors: int = NATIVE_HNSW_MIN_VECTORS, block_rows: int = NATIVE_SEARCH_BLOCK_ROWS,
+                 precision: str = NATIVE_STORE_PRECISION, rescore_factor: int = QUANTIZATION_RESCORE_FACTOR):
+        """
+        Args:
+            path (str): The directory of the store. It is created if needed.
+            name (str): The store name, reported like a collection name.
+            use_hnsw (bool): Use an HNSW graph for unfiltered queries when hnswlib is installed.
+            hnsw_min_vectors (int): Below this many records, queries are answered exactly.
+            block_rows (int): The number of rows multiplied at a time by exact queries.
+            precision (str): The precision of the search copy: "float32", "float16" or "int8".
+            rescore_factor (int): With a reduced precision, the candidates per requested result
+                that are rescored in float32. 1 ranks by the reduced precision alone.
+        """
+        self.path = path
+        self.name = name
+        self.precision = check_precision(precision)
+        self.rescore_factor = max(1, rescore_factor)
+        self.hnsw_min_vectors = hnsw_min_vectors
+        self.block_rows = block_rows
+        self._lock = threading.RLock()
+        self._hnswlib = None
+        if use_hnsw:
+            try:
+                import hnswlib
+                self._hnswlib = hnswlib
+            except ImportError:
+                pass
+
+        self.dimensions = 0
+        self._vectors_file = ""
+        self._matrix: Optional[np.memmap] = None
+        self._codes: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._rows = 0
+        self._row_of: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._live = np.zeros(0, dtype=bool)
+        self._documents: Dict[str, str] = {}
+        self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self._sq_norms: Optional[np.ndarray] = None
+        self._hnsw = None
+
+        os.makedirs(path, exist_ok=True)
+        self._replay_log()
+        self._log = open(os.path.join(path, self.LOG_FILE), "a", encoding="utf-8", newline="\n")
+        self._remove_stray_files()
+
+    # --- Storage ---
+
+    def _replay_log(self):
+        log_path = os.path.join(self.path, self.LOG_FILE)
+        if not os.path.exists(log_path):
+            return
+        intact = 0
+        with open(log_path, "rb") as log:
+            for line in log:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write; everything before it is intact.
+                    break
+                intact += len(line)
+                op = entry["op"]
+                if op == "header":
+                    self.dimensions = entry["dimensions"]
+                    self._vectors_file = entry["vectors"]
+                elif op == "add":
+                    self._place(entry["id"], entry["row"], entry["document"], entry["metadata"])
+                elif op == "update":
+                    if entry["id"] in self._metadatas:
+                        self._metadatas[entry["id"]] = entry["metadata"]
+                elif op == "delete":
+                    self._forget(entry["id"])
+        if intact < os.path.getsize(log_path):
+            with open(log_path, "r+b") as log:
+                log.truncate(intact)
+        if self._vectors_file:
+            missing_codes = not all(os.path.exists(os.path.join(self.path, filename)) for filename, _, _ in self._code_files())
+            self._map(max(self._rows, 1))
+            if missing_codes and self._rows:
+                self._encode_rows()
+
+    def _code_files(self) -> List[tuple]:
+        """The (filename, dtype, columns) of the search copy files of the current precision."""
+        stem = self._vectors_file.rsplit(".", 1)[0]
+        if self.precision == "float16":
+            return [(f"{stem}.f16", CODE_DTYPES["float16"], self.dimensions)]
+        if self.precision == "int8":
+            return [(f"{stem}.i8", CODE_DTYPES["int8"], self.dimensions), (f"{stem}.scales", "<f4", 1)]
+        return []
+
+    def _remove_stray_files(self):
+        """
+        Deletes vector files left behind by an interrupted compaction, and search
+        copies of a precision that is no longer used.
+        """
+        keep = {self._vectors_file} | {filename for filename, _, _ in self._code_files()}
+        for filename in os.listdir(self.path):
+            if filename.startswith("vectors-") and filename not in keep:
+                os.remove(os.path.join(self.path, filename))
+
+    def _map(self, min_rows: int):
+        """Memory-maps the vector files with room for at least `min_rows` rows, doubling their size as needed."""
+        vectors_path = os.path.join(self.path, self._vectors_file)
+        capacity = os.path.getsize(vectors_path) // (self.dimensions * 4) if os.path.exists(vectors_path) else 0
+        if capacity < min_rows:
+            capacity = max(min_rows, capacity * 2, 1024)
+        self._matrix = self._codes = self._scales = None
+        self._matrix = self._open_rows(self._vectors_file, "<f4", self.dimensions, capacity)
+        files = self._code_files()
+        if files:
+            self._codes = self._open_rows(*files[0], capacity)
+        if len(files) > 1:
+            self._scales = self._open_rows(*files[1], capacity)
+
+    def _open_rows(self, filename: str, dtype: str, columns: int, capacity: int) -> np.memmap:
+        path = os.path.join(self.path, filename)
+        size = capacity * columns * np.dtype(dtype).itemsize
+        if not os.path.exists(path) or os.path.getsize(path) < size:
+            with open(path, "ab") as rows_file:
+                rows_file.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=(capacity, columns))
+
+    def _store_codes(self, first_row: int, vectors: np.ndarray):
+        """Writes the search copy of a run of rows."""
+        if self._codes is None:
+            return
+        codes, scales = quantize(vectors, self.precision)
+        self._codes[first_row:first_row + len(vectors)] = codes
+        self._codes.flush()
+        if self._scales is not None:
+            self._scales[first_row:first_row + len(vectors)] = scales
+            self._scales.flush()
+
+    def _encode_rows(self):
+        """Builds the search copy of every stored row from the float32 rows."""
+        if self._codes is None:
+            return
+        print(f"   -> Encoding {self._rows} stored vectors as {self.precision}...")
+        for start in range(0, self._rows, self.block_rows):
+            stop = min(start + self.block_rows, self._rows)
+            self._store_codes(start, np.asarray(self._matrix[start:stop]))
+
+    def _start(self, dimensions: int):
+        """Creates the files of an empty store once the embedding size is known."""
+        self.dimensions = dimensions
+        self._vectors_file = f"vectors-{uuid.uuid4().hex[:8]}.f32"
+        self._log.write(json.dumps({"op": "header", "dimensions": dimensions, "vectors": self._vectors_file}) + "\n")
+        self._log.flush()
+        self._map(1024)
+
+    def _place(self, doc_id: str, row: int, document: str, metadata: Dict[str, Any]):
+        self._forget(doc_id)
+        if row >= len(self._ids):
+            self._ids.extend([None] * (row + 1 - len(self._ids)))
+        if row >= len(self._live):
+            self._live = np.concatenate([self._live, np.zeros(max(row + 1, 2 * len(self._live)) - len(self._live), dtype=bool)])
+        self._ids[row] = doc_id
+        self._live[row] = True
+        self._rows = max(self._rows, row + 1)
+        self._row_of[doc_id] = row
+        self._documents[doc_id] = document
+        self._metadatas[doc_id] = metadata
+
+    def _forget(self, doc_id: str):
+        row = self._row_of.pop(doc_id, None)
+        if row is None:
+            return
+        self._ids[row] = None
+        self._live[row] = False
+        self._documents.pop(doc_id, None)
+        self._metadatas.pop(doc_id, None)
+        if self._hnsw is not None:
+            self._hnsw.mark_deleted(row)
+
+    def _write(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: List[Dict[str, Any]]):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if len(ids) != len(set(ids)):
+            raise ValueError("Expected unique ids within one write.")
+        if vectors.ndim != 2 or len(vectors) != len(ids) or len(documents) != len(ids) or len(metadatas) != len(ids):
+            raise ValueError("Expected one embedding, document and metadata per id.")
+        if not len(ids):
+            return
+        if not self.dimensions:
+            self._start(vectors.shape[1])
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"Expected {self.dimensions}-dim embeddings, received {vectors.shape[1]}.")
+
+        first_row = self._rows
+        if first_row + len(ids) > len(self._matrix):
+            self._map(first_row + len(ids))
+        self._matrix[first_row:first_row + len(ids)] = vectors
+        self._matrix.flush()
+        self._store_codes(first_row, vectors)
+        lines = []
+        for offset, (doc_id, document, metadata) in enumerate(zip(ids, documents, metadatas)):
+            metadata = dict(metadata or {})
+            self._place(doc_id, first_row + offset, document, metadata)
+            lines.append(json.dumps({"op": "add", "id": doc_id, "row": first_row + offset,
+                                     "document": document, "metadata": metadata}))
+        self._append(lines)
+        if self._sq_norms is not None:
+            searched = self._search_vectors(slice(first_row, first_row + len(ids)))
+            self._sq_norms = np.concatenate([self._sq_norms[:first_row], np.einsum("ij,ij->i", searched, searched)])
+        if self._hnsw is not None:
+            if self._hnsw.get_max_elements() < self._rows:
+                self._hnsw.resize_index(max(self._rows, self._hnsw.get_max_elements() * 2))
+            self._hnsw.add_items(vectors, np.arange(first_row, first_row + len(ids)))
+
+    def _append(self, lines: List[str]):
+        self._log.write("\n".join(lines) + "\n")
+        self._log.flush()
+
+    # --- The collection API ---
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._row_of)
+
+    def add(self, ids, embeddings, documents, metadatas):
+        with self._lock:
+            new = [i for i, doc_id in enumerate(ids) if doc_id not in self._row_of]
+            if len(new) < len(ids):
+                embeddings = np.asarray(embeddings, dtype=np.float32)[new]
+                ids, documents, metadatas = [ids[i] for i in new], [documents[i] for i in new], [metadatas[i] for i in new]
+            self._write(list(ids), embeddings, list(documents), list(metadatas))
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        with self._lock:
+            self._write(list(ids), embeddings, list(documents), list(metadatas))
+
+    def update(self, ids, metadatas):
+        with self._lock:
+            lines = []
+            for doc_id, metadata in zip(ids, metadatas):
+                if doc_id in self._metadatas:
+                    merged = {**self._metadatas[doc_id], **metadata}
+                    self._metadatas[doc_id] = merged
+                    lines.append(json.dumps({"op": "update", "id": doc_id, "metadata": merged}))
+            if lines:
+                self._append(lines)
+
+    def delete(self, ids):
+        with self._lock:
+            deleted = [doc_id for doc_id in ids if doc_id in self._row_of]
+            for doc_id in deleted:
+                self._forget(doc_id)
+            if deleted:
+                self._append([json.dumps({"op": "delete", "id": doc_id}) for doc_id in deleted])
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=_GET_INCLUDE):
+        with self._lock:
+            if ids is None:
+                rows = [row for row in range(self._rows) if self._ids[row] is not None]
+            else:
+                rows = sorted(self._row_of[doc_id] for doc_id in set(ids) if doc_id in self._row_of)
+            if where:
+                rows = [row for row in rows if matches_where(self._metadatas[self._ids[row]], where)]
+            rows = rows[offset or 0:]
+            if limit is not None:
+                rows = rows[:limit]
+            return self._result(rows, include)
+
+    def query(self, query_embeddings, n_results=10, where=None, include=_QUERY_INCLUDE):
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        result = {"ids": [], "embeddings": [], "documents": [], "metadatas": [], "distances": []}
+        with self._lock:
+            candidates = None
+            if where:
+                candidates = np.array([row for row in range(self._rows) if self._ids[row] is not None
+                                       and matches_where(self._metadatas[self._ids[row]], where)], dtype=np.int64)
+            for query in queries:
+                if self.dimensions and query.shape[0] != self.dimensions:
+                    raise ValueError(f"Expected {self.dimensions}-dim query embeddings, received {query.shape[0]}.")
+                rows, distances = self._nearest(query, n_results, candidates)
+                single = self._result(rows, include)
+                for key in ("ids", "embeddings", "documents", "metadatas"):
+                    result[key].append(single[key])
+                result["distances"].append(distances.tolist())
+        for key in ("embeddings", "documents", "metadatas", "distances"):
+            if key not in include:
+                result[key] = None
+        result["included"] = list(include)
+        return result
+
+    def _result(self, rows: List[int], include: Sequence[str]) -> Dict[str, Any]:
+        doc_ids = [self._ids[row] for row in rows]
+        embeddings = None
+        if "embeddings" in include:
+            embeddings = np.array(self._matrix[rows], dtype=np.float32) if rows else np.zeros((0, self.dimensions), dtype=np.float32)
+        return {
+            "ids": doc_ids,
+            "embeddings": embeddings,
+            "documents": [self._documents[doc_id] for doc_id in doc_ids] if "documents" in include else None,
+            "metadatas": [dict(self._metadatas[doc_id]) for doc_id in doc_ids] if "metadatas" in include else None,
+            "included": list(include),
+        }
+
+    # --- Search ---
+
+    def _nearest(self, query: np.ndarray, k: int, candidates: Optional[np.ndarray]):
+        """Returns the rows of the k nearest live records and their squared L2 distances."""
+        live = len(self._row_of)
+        if not live or k <= 0:
+            return [], np.zeros(0, dtype=np.float32)
+        if candidates is None and self._hnswlib is not None and live >= self.hnsw_min_vectors:
+            return self._nearest_hnsw(query, min(k, live))
+        return self._nearest_exact(query, k, candidates)
+
+    def _search_vectors(self, rows: Any) -> np.ndarray:
+        """Returns the search copy of a slice or array of rows as float32."""
+        if self._codes is None:
+            return np.asarray(self._matrix[rows])
+        return dequantize(self._codes[rows], self._scales[rows] if self._scales is not None else None)
+
+    def _search_dot(self, rows: Any, query: np.ndarray) -> np.ndarray:
+        """Returns x.q for the search copy of a slice or array of rows."""
+        if self._codes is None:
+            return self._matrix[rows] @ query
+        codes = self._codes[rows]
+        if self._scales is not None:
+            # int8 codes are multiplied as they are and scaled afterwards, so no float copy is made.
+            return np.einsum("ij,j->i", codes, query) * self._scales[rows][:, 0]
+        # float16 must be widened for the product; small blocks keep the copy in cache.
+        return np.concatenate([codes[start:start + 4096].astype(np.float32) @ query for start in range(0, len(codes), 4096)])
+
+    def _nearest_exact(self, query: np.ndarray, k: int, candidates: Optional[np.ndarray]):
+        """
+        Exhaustive search: |x|^2 - 2 x.q over blocks of rows, keeping a running
+        top k. With a reduced precision, the top k * rescore_factor by the search
+        copy are rescored against the float32 rows.
+        """
+        if self._sq_norms is None:
+            self._sq_norms = np.concatenate([
+                np.einsum("ij,ij->i", block, block)
+                for block in (self._search_vectors(slice(start, min(start + self.block_rows, self._rows)))
+                              for start in range(0, self._rows, self.block_rows))
+            ]) if self._rows else np.zeros(0, dtype=np.float32)
+        rescore = self._codes is not None and self.rescore_factor > 1
+        final_k, k = k, k * self.rescore_factor if rescore else k
+        best_rows, best_scores = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        if candidates is not None:
+            blocks = (candidates[start:start + self.block_rows] for start in range(0, len(candidates), self.block_rows))
+        else:
+            blocks = (np.arange(start, min(start + self.block_rows, self._rows)) for start in range(0, self._rows, self.block_rows))
+        for rows in blocks:
+            if candidates is None:
+                scores = self._sq_norms[rows[0]:rows[-1] + 1] - 2.0 * self._search_dot(slice(rows[0], rows[-1] + 1), query)
+                scores[~self._live[rows]] = np.inf
+            else:
+                scores = self._sq_norms[rows] - 2.0 * self._search_dot(rows, query)
+            rows, scores = np.concatenate([best_rows, rows]), np.concatenate([best_scores, scores])
+            if len(scores) > k:
+                top = np.argpartition(scores, k - 1)[:k]
+                rows, scores = rows[top], scores[top]
+            best_rows, best_scores = rows, scores
+
+        keep = np.isfinite(best_scores)
+        best_rows, best_scores = best_rows[keep], best_scores[keep]
+        if rescore:
+            best_rows = np.sort(best_rows)
+            best_scores = np.sum((np.asarray(self._matrix[best_rows]) - query) ** 2, axis=1)
+        else:
+            best_scores = np.maximum(best_scores + float(query @ query), 0.0)
+        order = np.argsort(best_scores, kind="stable")[:final_k]
+        return best_rows[order].tolist(), best_scores[order]
+
+    def _nearest_hnsw(self, query: np.ndarray, k: int):
+        if self._hnsw is None:
+            self._hnsw = self._load_hnsw() or self._build_hnsw()
+        self._hnsw.set_ef(max(NATIVE_HNSW_EF_SEARCH, k))
+        labels, distances = self._hnsw.knn_query(query, k=k)
+        return labels[0].astype(np.int64).tolist(), distances[0]
+
+    def _build_hnsw(self):
+        print(f"   -> Building the HNSW graph over {len(self._row_of)} vectors...")
+        index = self._hnswlib.Index(space="l2", dim=self.dimensions)
+        index.init_index(max_elements=max(self._rows, 1024) * 2, ef_construction=NATIVE_HNSW_EF_CONSTRUCTION, M=NATIVE_HNSW_M)
+        for start in range(0, self._rows, self.block_rows):
+            rows = np.arange(start, min(start + self.block_rows, self._rows))
+            index.add_items(np.asarray(self._matrix[rows]), rows)
+        for row in range(self._rows):
+            if self._ids[row] is None:
+                index.mark_deleted(row)
+        return index
+
+    def _hnsw_state(self) -> Dict[str, Any]:
+        return {"vectors": self._vectors_file, "rows": self._rows, "live": len(self._row_of)}
+
+    def _load_hnsw(self):
+        """Loads the saved graph if it was saved at exactly the current state of the store."""
+        state_path = os.path.join(self.path, self.HNSW_STATE_FILE)
+        if not os.path.exists(state_path):
+            return None
+        with open(state_path, "r", encoding="utf-8") as state_file:
+            if json.load(state_file) != self._hnsw_state():
+                return None
+        index = self._hnswlib.Index(space="l2", dim=self.dimensions)
+        index.load_index(os.path.join(self.path, self.HNSW_FILE), max_elements=max(self._rows, 1024) * 2)
+        return index
+
+    def _save_hnsw(self):
+        state_path = os.path.join(self.path, self.HNSW_STATE_FILE)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        self._hnsw.save_index(os.path.join(self.path, self.HNSW_FILE))
+        with open(state_path, "w", encoding="utf-8") as state_file:
+            json.dump(self._hnsw_state(), state_file)
+
+    # --- Maintenance ---
+
+    def storage_bytes(self) -> Dict[str, int]:
+        """The bytes of the float32 rows and of the search copy that queries scan."""
+        with self._lock:
+            full = self._rows * self.dimensions * 4
+            return {"float32": full, "search": code_bytes(self._rows, self.dimensions, self.precision)}
+
+    def dead_rows(self) -> int:
+        """The number of rows held by replaced or deleted records."""
+        with self._lock:
+            return self._rows - len(self._row_of)
+
+    def compact(self):
+        """
+        Rewrites the store with only its live records. The new log is swapped in
+        with one atomic rename, so an interruption leaves either the old store or the new one.
+        """
+        with self._lock:
+            if not self._vectors_file:
+                return
+            rows = [row for row in range(self._rows) if self._ids[row] is not None]
+            vectors_file = f"vectors-{uuid.uuid4().hex[:8]}.f32"
+            matrix = np.asarray(self._matrix[rows], dtype="<f4") if rows else np.zeros((0, self.dimensions), dtype="<f4")
+            with open(os.path.join(self.path, vectors_file), "wb") as new_vectors:
+                new_vectors.write(matrix.tobytes())
+            temp_log = os.path.join(self.path, self.LOG_FILE + ".tmp")
+            with open(temp_log, "w", encoding="utf-8", newline="\n") as log:
+                log.write(json.dumps({"op": "header", "dimensions": self.dimensions, "vectors": vectors_file}) + "\n")
+                for new_row, row in enumerate(rows):
+                    doc_id = self._ids[row]
+                    log.write(json.dumps({"op": "add", "id": doc_id, "row": new_row, "document": self._documents[doc_id],
+                                          "metadata": self._metadatas[doc_id]}) + "\n")
+            self._log.close()
+            old_files = [self._vectors_file] + [filename for filename, _, _ in self._code_files()]
+            self._matrix = self._codes = self._scales = None
+            os.replace(temp_log, os.path.join(self.path, self.LOG_FILE))
+            for filename in old_files:
+                os.remove(os.path.join(self.path, filename))
+
+            self._vectors_file, self._rows = vectors_file, 0
+            self._row_of, self._ids, self._documents, self._metadatas = {}, [], {}, {}
+            self._live = np.zeros(0, dtype=bool)
+            self._sq_norms, self._hnsw = None, None
+            self._replay_log()
+            self._log = open(os.path.join(self.path, self.LOG_FILE), "a", encoding="utf-8", newline="\n")
+
+    def close(self):
+        with self._lock:
+            if self._log.closed:
+                return
+            if self._rows and self.dead_rows() > self._rows // 2:
+                self.compact()
+            if self._hnsw is not None:
+                self._save_hnsw()
+            self._log.close()
+            for rows in (self._matrix, self._codes, self._scales):
+                if rows is not None:
+                    rows.flush()
+            self._matrix = self._codes = self._scales = None
+
+
+def matches_where(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """
+    Evaluates a ChromaDB `where` filter against one metadata dict. Supports
+    $and, $or, $eq, $ne, $gt, $gte, $lt, $lte, $in and $nin. A record without
+    the filtered key never matches.
+    """
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key not in metadata:
+            return False
+        elif isinstance(condition, dict):
+            value = metadata[key]
+            for op, operand in condition.items():
+                if not _compare(value, op, operand):
+                    return False
+        elif metadata[key] != condition:
+            return False
+    return True
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if op == "$in":
+        return value in operand
+    if op == "$nin":
+        return value not in operand
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported where operator: {op}")
+
+
+def create_vector_store(path: str, name: str, backend: str = VECTOR_STORE_BACKEND) -> VectorStore:
+    """
+    Creates the named vector store inside the memory database directory.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if backend == "chroma":
+        return ChromaVectorStore(path, name)
+    if backend == "native":
+        return NumpyVectorStore(os.path.join(path, f"{name}.native"), name)
+    raise ValueError(f"Unknown vector store backend: '{backend}'. Expected 'chroma' or 'native'.")
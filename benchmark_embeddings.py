@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# benchmark_embeddings.py
+#
+# Compares the embedding backends of the A.U.R.A. Engine. For every backend
+# the benchmark measures the latency of single-text embeds (the shape of a
+# retrieval query) and the throughput of one batched embed (the shape of a
+# consolidation or backfill write). Backends that cannot be created here, for
+# example because LM Studio is not running, are reported and skipped.
+#
+# Usage:
+#   python benchmark_embeddings.py
+#   python benchmark_embeddings.py --backends hashing sentence_transformers --repeats 50
+
+import argparse
+import time
+from typing import Dict, List
+
+from aura_engine.embedding_backends import create_embedding_backend
+from aura_engine.tracing import percentile
+
+BACKENDS = ["lmstudio", "sentence_transformers", "hashing"]
+SAMPLE_TEXTS = [
+    "Hello Aurora, how are you today?",
+    "Ben mentioned that his favorite drink is green tea.",
+    "Aurora explained how the memory consolidation cycle works.",
+    "What did we talk about yesterday evening?",
+    "The S.P.A.R.K. Initiative builds local, private AI companions.",
+    "Ben felt a little tired after a long day of debugging.",
+    "Aurora suggested taking a short walk before dinner.",
+    "Do you remember the name of my first project?",
+]
+
+def benchmark_backend(name: str, repeats: int, batch_size: int) -> Dict[str, float]:
+    """Measures single-embed latency and batched throughput for one backend."""
+    client = None
+    if name == "lmstudio":
+        import lmstudio as lms
+        client = lms.Client()
+    backend = create_embedding_backend(name, client=client)
+    try:
+        backend.embed(SAMPLE_TEXTS[:1])  # Warm-up, so model loading is not measured.
+
+        latencies: List[float] = []
+        for i in range(repeats):
+            # A counter keeps every text unique, so no backend can serve a repeated result.
+            text = f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} ({i})"
+            start = time.perf_counter()
+            backend.embed([text])
+            latencies.append(time.perf_counter() - start)
+
+        batch = [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} [{i}]" for i in range(batch_size)]
+        start = time.perf_counter()
+        backend.embed(batch)
+        batch_seconds = time.perf_counter() - start
+    finally:
+        backend.close()
+
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "batch_per_second": batch_size / batch_seconds if batch_seconds > 0 else 0.0,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Compare the per-embed latency of the embedding backends.")
+    parser.add_argument("--backends", nargs="*", default=BACKENDS, choices=BACKENDS, help="Backends to benchmark.")
+    parser.add_argument("--repeats", type=int, default=20, help="Number of single-text embeds per backend.")
+    parser.add_argument("--batch", type=int, default=64, help="Number of texts in the batched embed.")
+    args = parser.parse_args(argv)
+
+    print("--- A.U.R.A. Engine Embedding Benchmark ---")
+    print(f"\n   {'backend':<24} {'p50 (ms)':>10} {'p95 (ms)':>10} {'batch (texts/s)':>16}")
+    for name in args.backends:
+        try:
+            result = benchmark_backend(name, args.repeats, args.batch)
+        except Exception as e:
+            print(f"   {name:<24} ❌ unavailable: {e}")
+            continue
+        print(f"   {name:<24} {result['p50_ms']:10.2f} {result['p95_ms']:10.2f} {result['batch_per_second']:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
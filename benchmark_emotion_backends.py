@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# benchmark_emotion_backends.py
+#
+# Compares the emotion classifier backends: the PyTorch pipeline and the
+# quantized ONNX graph. Each backend runs in its own process, so the resident
+# memory it adds (RSS after loading, minus RSS before) is not mixed with the
+# other backend's. The benchmark measures load time, the latency of
+# single-text classification (one per turn) and the throughput of batched
+# classification (re-tagging an archive).
+#
+# Usage:
+#   python benchmark_emotion_backends.py
+#   python benchmark_emotion_backends.py --backends onnx --repeats 50 --batch 128
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from aura_engine.tracing import percentile
+
+BACKENDS = ["transformers", "onnx"]
+SAMPLE_TEXTS = [
+    "I am so happy you're here, this is a wonderful surprise!",
+    "Ben felt a little tired after a long day of debugging.",
+    "Thank you for remembering my favorite tea.",
+    "I'm worried the build will fail again tomorrow.",
+    "That was the funniest thing I've heard all week.",
+    "Do you remember the name of my first project?",
+    "I'm sorry I snapped at you earlier.",
+    "We finally finished the garden, and it looks beautiful.",
+]
+
+def resident_mb() -> float:
+    """
+    The resident memory of this process in MB. Uses psutil if installed, else the
+    peak from `resource` (not available on Windows, where NaN is reported).
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def benchmark_backend(name: str, repeats: int, batch_size: int) -> Dict[str, float]:
+    """Loads one backend in this process and measures it."""
+    from aura_engine.process_emotions import create_emotion_classifier
+
+    rss_before = resident_mb()
+    start = time.perf_counter()
+    classifier = create_emotion_classifier(name)
+    classifier(SAMPLE_TEXTS[:1])  # Warm-up, so lazy initialization is counted as loading.
+    load_seconds = time.perf_counter() - start
+    rss_loaded = resident_mb()
+
+    latencies: List[float] = []
+    for i in range(repeats):
+        text = f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} ({i})"
+        start = time.perf_counter()
+        classifier([text])
+        latencies.append(time.perf_counter() - start)
+
+    # Sorted by length, as get_emotional_overlays batches them.
+    batch = sorted((f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} [{i}]" for i in range(batch_size)), key=len)
+    start = time.perf_counter()
+    classifier(batch, batch_size=16, truncation=True)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "load_seconds": load_seconds,
+        "rss_mb": rss_loaded - rss_before,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "batch_per_second": batch_size / batch_seconds if batch_seconds > 0 else 0.0,
+    }
+
+
+def run_isolated(name: str, repeats: int, batch_size: int) -> Dict[str, float]:
+    """Benchmarks a backend in a fresh Python process and returns its result."""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", name,
+               "--repeats", str(repeats), "--batch", str(batch_size)]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError((completed.stderr.strip().splitlines() or ["no output"])[-1])
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Compare latency and memory of the emotion classifier backends.")
+    parser.add_argument("--backends", nargs="*", default=BACKENDS, choices=BACKENDS, help="Backends to benchmark.")
+    parser.add_argument("--repeats", type=int, default=30, help="Number of single-text classifications per backend.")
+    parser.add_argument("--batch", type=int, default=64, help="Number of texts in the batched classification.")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(benchmark_backend(args.worker, args.repeats, args.batch)))
+        return
+
+    print("--- A.U.R.A. Engine Emotion Backend Benchmark ---")
+    print(f"\n   {'backend':<14} {'load (s)':>9} {'RSS (MB)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'batch (texts/s)':>16}")
+    for name in args.backends:
+        try:
+            result = run_isolated(name, args.repeats, args.batch)
+        except Exception as e:
+            print(f"   {name:<14} ❌ unavailable: {e}")
+            continue
+        print(f"   {name:<14} {result['load_seconds']:9.2f} {result['rss_mb']:9.0f} {result['p50_ms']:9.2f} "
+              f"{result['p95_ms']:9.2f} {result['batch_per_second']:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
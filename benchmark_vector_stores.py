@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# benchmark_vector_stores.py
+#
+# Compares the vector store backends of the A.U.R.A. Engine. For every store
+# size the benchmark measures insert throughput (batched adds, the shape of a
+# consolidation or snapshot import), query latency (single top-k queries, the
+# shape of a retrieval) and cold start (opening the store and answering the
+# first query, the shape of an engine boot). Random vectors are generated one
+# batch at a time, so even the largest runs do not hold the whole set in memory.
+#
+# Usage:
+#   python benchmark_vector_stores.py
+#   python benchmark_vector_stores.py --sizes 1000 100000 1000000 --backends native
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from aura_engine.vector_stores import create_vector_store
+from aura_engine.tracing import percentile
+
+BACKENDS = ["chroma", "native"]
+# ChromaDB rejects larger single inserts.
+INSERT_BATCH = 5000
+
+def random_batch(rng: np.random.Generator, size: int, dimensions: int) -> np.ndarray:
+    vectors = rng.normal(size=(size, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def benchmark_store(backend: str, size: int, dimensions: int, queries: int, k: int) -> Dict[str, float]:
+    """Measures insert, query and cold-start times for one backend and store size."""
+    path = tempfile.mkdtemp(prefix=f"vector-bench-{backend}-")
+    rng = np.random.default_rng(size)
+    try:
+        store = create_vector_store(path, "benchmark", backend=backend)
+        start = time.perf_counter()
+        for offset in range(0, size, INSERT_BATCH):
+            count = min(INSERT_BATCH, size - offset)
+            store.add(
+                ids=[f"memory-{offset + i}" for i in range(count)],
+                embeddings=random_batch(rng, count, dimensions),
+                documents=[f"Memory {offset + i}" for i in range(count)],
+                metadatas=[{"type": "interaction", "index": offset + i} for i in range(count)],
+            )
+        insert_seconds = time.perf_counter() - start
+
+        query_vectors = random_batch(rng, queries + 1, dimensions)
+        store.query(query_embeddings=[query_vectors[-1]], n_results=k)  # Warm-up, e.g. index loading.
+        latencies: List[float] = []
+        for vector in query_vectors[:queries]:
+            start = time.perf_counter()
+            store.query(query_embeddings=[vector], n_results=k)
+            latencies.append(time.perf_counter() - start)
+        store.close()
+        del store
+
+        start = time.perf_counter()
+        reopened = create_vector_store(path, "benchmark", backend=backend)
+        reopened.query(query_embeddings=[query_vectors[0]], n_results=k)
+        cold_start_seconds = time.perf_counter() - start
+        reopened.close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    return {
+        "insert_per_second": size / insert_seconds if insert_seconds > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "cold_start_ms": cold_start_seconds * 1000,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Compare insert, query and cold-start times of the vector stores.")
+    parser.add_argument("--backends", nargs="*", default=BACKENDS, choices=BACKENDS, help="Backends to benchmark.")
+    parser.add_argument("--sizes", nargs="*", type=int, default=[1000, 100000], help="Store sizes, e.g. 1000 100000 1000000.")
+    parser.add_argument("--dimensions", type=int, default=768, help="Embedding size (nomic-embed-text-v1.5 uses 768).")
+    parser.add_argument("--queries", type=int, default=50, help="Number of timed queries per run.")
+    parser.add_argument("--k", type=int, default=10, help="Results per query.")
+    args = parser.parse_args(argv)
+
+    print("--- A.U.R.A. Engine Vector Store Benchmark ---")
+    print(f"\n   {'backend':<10} {'vectors':>10} {'insert (vec/s)':>15} {'p50 (ms)':>10} {'p95 (ms)':>10} {'cold start (ms)':>16}")
+    for size in args.sizes:
+        for backend in args.backends:
+            try:
+                result = benchmark_store(backend, size, args.dimensions, args.queries, args.k)
+            except Exception as e:
+                print(f"   {backend:<10} {size:>10} ❌ failed: {e}")
+                continue
+            print(f"   {backend:<10} {size:>10} {result['insert_per_second']:15.0f} {result['p50_ms']:10.2f} "
+                  f"{result['p95_ms']:10.2f} {result['cold_start_ms']:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
-# config.py (v3.1 - Voice Config)
+# config.py (v4.17 - Unload Models on Exit by Default)
 #
-# This version adds the path to the speaker reference audio file.
+# This version unloads the models from LM Studio on shutdown by default, as
+# before warm boot; keeping them loaded for a fast restart is opt-in.
 
 # --- Model Configuration ---
 LLM_MODEL_IDENTIFIER = "backyardai/Nemo-12B-Marlin-v5-GGUF"
 EMBEDDING_MODEL_IDENTIFIER = "nomic-ai/nomic-embed-text-v1.5"
+# The load config used when a new LLM instance has to be loaded.
+LLM_LOAD_CONFIG = {"gpu_offload": "max"}
+
+# --- Warm Boot ---
+# When True, an already-loaded instance of the LLM with a matching load config is reused.
+WARM_BOOT = True
+# When True, the models stay loaded in LM Studio after Aurora shuts down, so the next
+# start can warm boot. Off by default, because the models otherwise keep holding GPU memory.
+KEEP_MODELS_LOADED_ON_EXIT = False
 
 # --- File Paths ---
 DB_PATH = "./agent_db"
@@ -14,6 +24,207 @@ SESSIONS_DIR = "./sessions"
 # --- Voice Cloning Configuration ---
 # The path to the high-quality, 5-25 second WAV file of the target voice.
 SPEAKER_WAV_PATH = "her_voice_sample.wav"
+# Voice output is disabled until the TTS streaming is tuned for this hardware.
+VOICE_ENABLED = False
+
+# --- Emotion Analysis ---
+# When False, the go_emotions classifier is never loaded and no emotional overlay is recorded.
+EMOTION_ANALYSIS_ENABLED = True
+# The number of texts the emotion classifier processes per forward pass in bulk classification.
+EMOTION_BATCH_SIZE = 16
+# The go_emotions classifier on the Hugging Face Hub.
+EMOTION_MODEL_IDENTIFIER = "SamLowe/roberta-base-go_emotions"
+# The classifier backend: "transformers" (PyTorch pipeline) or "onnx" (onnxruntime on CPU).
+EMOTION_BACKEND = "transformers"
+# The directory of the exported ONNX model. It is created on first use of the "onnx" backend.
+EMOTION_ONNX_DIR = "models/go_emotions_onnx"
+# When True, the ONNX backend uses int8 weights from dynamic quantization.
+EMOTION_ONNX_QUANTIZE = True
 
 # --- Database Collection Name ---
 COLLECTION_NAME = "genesis_memory"
+
+# --- Background Memory Pipeline ---
+# The maximum number of finished turns that may wait for background processing.
+# When the queue is full, the chat loop waits for a free slot (backpressure).
+PIPELINE_QUEUE_SIZE = 8
+
+# --- Response Streaming ---
+# When True, Aurora's responses are printed token-by-token as they are generated.
+STREAM_RESPONSES = True
+
+# --- Context Window ---
+# The estimated token budget for the chat history (system prompt, rolling summary and turns).
+CONTEXT_TOKEN_BUDGET = 3000
+# The number of most recent turns that are always kept verbatim.
+CONTEXT_KEEP_RECENT_TURNS = 4
+# The maximum size of the rolling summary of older turns, in tokens.
+CONTEXT_SUMMARY_MAX_TOKENS = 400
+
+# --- Latency Tracing ---
+# When True, every turn's timing spans are appended to the trace file as one JSON line.
+TRACING_ENABLED = True
+TRACE_FILE_PATH = "./traces/turn_traces.jsonl"
+
+# --- Narrative Summaries ---
+# The number of finished turns summarized together in one LLM call. 1 summarizes every turn on its own.
+SUMMARY_BATCH_SIZE = 4
+# Buffered turns are also summarized once the conversation has been idle for this many seconds.
+SUMMARY_IDLE_FLUSH_SECONDS = 30
+
+# --- Embedding Cache ---
+# When True, embeddings are cached by (embedding model, normalized text) so repeated texts are embedded once.
+EMBEDDING_CACHE_ENABLED = True
+# The SQLite file, inside the memory database directory, that persists cached embeddings across sessions.
+EMBEDDING_CACHE_FILENAME = "embedding_cache.sqlite3"
+# The number of embeddings kept in the in-memory LRU in front of the SQLite file.
+EMBEDDING_CACHE_MEMORY_ENTRIES = 2048
+
+# --- Embedding Backend ---
+# "lmstudio" embeds with EMBEDDING_MODEL_IDENTIFIER on the LM Studio server.
+# "sentence_transformers" embeds in-process on the CPU with SENTENCE_TRANSFORMER_MODEL.
+# "hashing" is a deterministic, model-free stand-in for tests and benchmarks.
+EMBEDDING_BACKEND = "lmstudio"
+SENTENCE_TRANSFORMER_MODEL = "BAAI/bge-base-en-v1.5"
+SENTENCE_TRANSFORMER_DEVICE = "cpu"
+# The in-process backend encodes large requests in batches of this size, on this many threads.
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_WORKERS = 2
+# The vector size of the hashing backend.
+HASHING_EMBEDDING_DIMENSIONS = 384
+
+# --- Hybrid Retrieval ---
+# When True, memories are retrieved by both vector similarity and BM25 keyword match,
+# and the two rankings are merged with reciprocal rank fusion.
+HYBRID_RETRIEVAL_ENABLED = True
+# The SQLite file, inside the memory database directory, that holds the keyword index.
+KEYWORD_INDEX_FILENAME = "keyword_index.sqlite3"
+# The number of candidates each retriever contributes before fusion.
+HYBRID_CANDIDATES = 10
+# Reciprocal rank fusion constant. Larger values flatten the difference between ranks.
+RRF_K = 60
+# BM25 parameters: term-frequency saturation and document-length normalization.
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# --- Recency-Weighted Retrieval ---
+# Retrieval over-fetches this many times the requested results before filtering and reranking.
+RETRIEVAL_OVERFETCH = 4
+# The age, in hours, at which a memory's recency weight has halved. None disables the recency rerank.
+RECENCY_HALF_LIFE_HOURS = 72
+# The lowest recency weight, so old memories are demoted but never disappear.
+RECENCY_DECAY_FLOOR = 0.5
+# Only these memory types decay with age. Consolidated facts and summaries stay timeless.
+RECENCY_DECAY_TYPES = ("interaction",)
+
+# --- Emotional Anchor ---
+# The share of a retrieved memory's score that comes from how closely its emotions match
+# Aurora's current emotional state. 0 disables the emotion rerank.
+EMOTION_RERANK_WEIGHT = 0.25
+# How strongly each new turn moves Aurora's running emotional state (0-1).
+EMOTION_STATE_SMOOTHING = 0.3
+
+# --- Memory Compaction ---
+# When True, near-duplicate memories are merged during the sleep cycle.
+COMPACTION_ON_SHUTDOWN = True
+# The cosine similarity at which two memories of the same type count as duplicates.
+COMPACTION_SIMILARITY_THRESHOLD = 0.95
+# The number of stored vectors loaded and compared at a time.
+COMPACTION_BLOCK_SIZE = 1024
+# The SQLite file, inside the memory database directory, that records which memories were already checked.
+COMPACTION_STATE_FILENAME = "compaction_state.sqlite3"
+# The maximum number of retired ids kept in a survivor's `merged_ids` provenance.
+COMPACTION_MAX_PROVENANCE_IDS = 20
+
+# --- Hot Memory Tier ---
+# When True, recent memory embeddings are kept in memory and searched alongside ChromaDB.
+HOT_TIER_ENABLED = True
+# The memory ceiling of the hot tier's embedding matrix, in megabytes.
+HOT_TIER_MAX_MB = 64
+# Hot memories that have not been stored or recalled for this many hours are demoted.
+HOT_TIER_MAX_AGE_HOURS = 72
+# A cold memory is promoted into the hot tier after this many recalls.
+HOT_TIER_PROMOTE_AFTER = 2
+# How long retrieval waits for the cold vector store query, in milliseconds. When it
+# is late, the hot tier and the keyword index answer alone (and the result is not cached).
+# 0 always waits for the cold tier; the hot tier then only affects ranking, not latency.
+HOT_TIER_COLD_DEADLINE_MS = 250
+# The number of cold queries that may run at once. A late query keeps its worker until it
+# finishes; while every worker is busy with a late query, retrieval answers from the hot tier.
+HOT_TIER_COLD_WORKERS = 2
+
+# --- Memory Snapshots ---
+# The number of memories read or written per chunk when exporting or importing a snapshot.
+SNAPSHOT_CHUNK_SIZE = 2000
+
+# --- Vector Store ---
+# The store that holds memory embeddings: "chroma" (ChromaDB) or "native"
+# (a memory-mapped NumPy matrix with an optional HNSW graph).
+VECTOR_STORE_BACKEND = "chroma"
+# When True, the native store uses an HNSW graph for unfiltered queries if hnswlib is installed.
+NATIVE_STORE_HNSW = True
+# Below this many vectors the native store always searches exactly.
+NATIVE_HNSW_MIN_VECTORS = 20000
+# HNSW graph parameters: links per node, and the candidate list sizes while building and searching.
+NATIVE_HNSW_M = 16
+NATIVE_HNSW_EF_CONSTRUCTION = 200
+NATIVE_HNSW_EF_SEARCH = 64
+# The number of vectors multiplied at a time by an exact search.
+NATIVE_SEARCH_BLOCK_ROWS = 65536
+
+# --- Quantized Vector Storage ---
+# The precision of the native vector store's search copy: "float32", "float16" or "int8".
+# The float32 vectors stay on disk for rescoring and export. Only used by the "native" store.
+NATIVE_STORE_PRECISION = "float32"
+# With a reduced precision, this many candidates per requested result are rescored in float32.
+# 1 ranks by the reduced precision alone.
+QUANTIZATION_RESCORE_FACTOR = 4
+
+# --- Embedding Migration ---
+# The file, inside the memory database directory, that names the active collection after a migration.
+ACTIVE_COLLECTION_FILENAME = "active_collection.json"
+# The checkpoint of an unfinished migration, inside the memory database directory.
+MIGRATION_CHECKPOINT_FILENAME = "embedding_migration.json"
+# The number of memories re-embedded and written per migration batch.
+MIGRATION_BATCH_SIZE = 64
+
+# --- Retrieval Cache ---
+# When True, retrieval results are cached by normalized query until the next memory write.
+RETRIEVAL_CACHE_ENABLED = True
+# The number of cached result lists.
+RETRIEVAL_CACHE_ENTRIES = 256
+# A cached result is not reused after this many seconds, because recency weighting changes with time.
+RETRIEVAL_CACHE_TTL_SECONDS = 300
+
+# --- Memory Context ---
+# The number of candidate memories retrieved per turn before selection.
+MEMORY_CONTEXT_CANDIDATES = 12
+# The maximum estimated size of the memory context in a prompt, in tokens.
+MEMORY_CONTEXT_TOKEN_BUDGET = 600
+# The maximum number of memories in the memory context.
+MEMORY_CONTEXT_MAX_MEMORIES = 5
+# Maximal marginal relevance: 1.0 selects by relevance alone, lower values prefer memories unlike those already chosen.
+MEMORY_CONTEXT_MMR_LAMBDA = 0.7
+# A candidate at least this similar (cosine) to an included memory is dropped as redundant.
+MEMORY_CONTEXT_DUPLICATE_SIMILARITY = 0.95
+
+# --- Memory Retention ---
+# When True, the least important memories are moved to the cold archive during the sleep cycle.
+RETENTION_ON_SHUTDOWN = True
+# The maximum number of memories in the live vector index.
+RETENTION_MAX_MEMORIES = 50000
+# Eviction trims the live index to this share of the maximum, so it does not run again right away.
+RETENTION_TARGET_RATIO = 0.9
+# Importance of each memory type. Other types weigh 0.5.
+RETENTION_TYPE_WEIGHTS = {"fact": 1.5, "summary": 1.0, "interaction": 0.3}
+# Weight of the recall count (log scale) in the importance score.
+RETENTION_ACCESS_WEIGHT = 0.5
+# Weight of recency in the importance score, and the hours after which it has halved.
+RETENTION_RECENCY_WEIGHT = 1.0
+RETENTION_RECENCY_HALF_LIFE_HOURS = 24 * 30
+# Weight of emotional intensity (the strongest non-neutral emotion) in the importance score.
+RETENTION_EMOTION_WEIGHT = 0.5
+# The SQLite file, inside the memory database directory, that counts memory recalls.
+ACCESS_LOG_FILENAME = "memory_access.sqlite3"
+# The directory, inside the memory database directory, that holds the cold archive.
+COLD_ARCHIVE_DIRNAME = "cold_archive"
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# measure_quantization.py
+#
+# Measures what reduced-precision embedding storage costs in accuracy and
+# saves in memory. The vectors are either the engine's own long-term memory
+# or a synthetic clustered set. Every precision is compared with an exact
+# float32 search: recall@k (the share of the true top k that was returned),
+# query latency, and the size of the search copy that queries scan, with and
+# without float32 rescoring.
+#
+# Usage:
+#   python measure_quantization.py
+#   python measure_quantization.py --source memory --k 5
+#   python measure_quantization.py --count 100000 --rescore-factors 1 2 4 8
+
+import argparse
+import shutil
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from config import DB_PATH, COLLECTION_NAME
+from aura_engine.quantization import recall_at_k
+from aura_engine.tracing import percentile
+from aura_engine.vector_stores import NumpyVectorStore, create_vector_store
+
+def synthetic_vectors(count: int, dimensions: int, seed: int = 0) -> np.ndarray:
+    """Unit vectors around a few hundred topics, which is closer to real memories than uniform noise."""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(max(1, count // 50), dimensions)).astype(np.float32)
+    vectors = topics[rng.integers(0, len(topics), size=count)] + 0.6 * rng.normal(size=(count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def memory_vectors() -> np.ndarray:
+    """Loads every embedding of the engine's long-term memory."""
+    store = create_vector_store(DB_PATH, COLLECTION_NAME)
+    try:
+        return np.asarray(store.get(include=["embeddings"])["embeddings"], dtype=np.float32)
+    finally:
+        store.close()
+
+
+def timed_queries(store: NumpyVectorStore, queries: np.ndarray, k: int):
+    """Runs the queries one at a time, as retrieval does, and returns the ids and the latencies."""
+    ids, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        ids.append(store.query(query_embeddings=[query], n_results=k, include=[])["ids"][0])
+        latencies.append(time.perf_counter() - start)
+    return ids, latencies
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Measure recall and memory of reduced-precision embedding storage.")
+    parser.add_argument("--source", choices=["synthetic", "memory"], default="synthetic", help="Where the vectors come from.")
+    parser.add_argument("--count", type=int, default=20000, help="Synthetic vectors to generate.")
+    parser.add_argument("--dimensions", type=int, default=768, help="Synthetic embedding size.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries.")
+    parser.add_argument("--k", type=int, default=10, help="Results per query.")
+    parser.add_argument("--rescore-factors", nargs="*", type=int, default=[1, 4], help="Rescoring factors to compare (1 = none).")
+    args = parser.parse_args(argv)
+
+    print("--- A.U.R.A. Engine Quantization Measurement ---")
+    vectors = memory_vectors() if args.source == "memory" else synthetic_vectors(args.count, args.dimensions)
+    if not len(vectors):
+        print("   ❌ There are no vectors to measure.")
+        return
+    rng = np.random.default_rng(1)
+    # Queries are perturbed stored vectors, so every query has real near neighbours.
+    queries = vectors[rng.integers(0, len(vectors), size=args.queries)] + 0.05 * rng.normal(size=(args.queries, vectors.shape[1]))
+    queries = queries.astype(np.float32)
+    ids = [f"memory-{i}" for i in range(len(vectors))]
+    print(f"-> {len(vectors)} vectors of {vectors.shape[1]} dimensions, {args.queries} queries, k={args.k}.")
+
+    directory = tempfile.mkdtemp(prefix="quantization-")
+    try:
+        print(f"\n   {'precision':<10} {'rescore':>8} {'recall@k':>9} {'p50 (ms)':>9} {'search MB':>10} {'saved':>7}")
+        expected = None
+        for precision in ("float32", "float16", "int8"):
+            store = NumpyVectorStore(f"{directory}/{precision}", precision, use_hnsw=False, precision=precision)
+            for start in range(0, len(vectors), 5000):
+                store.add(ids=ids[start:start + 5000], embeddings=vectors[start:start + 5000],
+                          documents=[""] * len(ids[start:start + 5000]), metadatas=[{}] * len(ids[start:start + 5000]))
+            sizes = store.storage_bytes()
+            saved = 1 - sizes["search"] / sizes["float32"]
+            for factor in ([1] if precision == "float32" else args.rescore_factors):
+                store.rescore_factor = factor
+                found, latencies = timed_queries(store, queries, args.k)
+                expected = expected or found
+                rescore = "-" if precision == "float32" else ("off" if factor <= 1 else f"x{factor}")
+                print(f"   {precision:<10} {rescore:>8} {recall_at_k(expected, found, args.k):9.3f} "
+                      f"{percentile(latencies, 50) * 1000:9.2f} {sizes['search'] / 1e6:10.1f} {saved:7.0%}")
+            store.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# migrate_embeddings.py
+#
+# Re-embeds the A.U.R.A. Engine's long-term memory after the embedding model
+# changed (EMBEDDING_BACKEND or EMBEDDING_MODEL_IDENTIFIER in config.py). The
+# memories are copied into a shadow collection in checkpointed batches, and the
+# new collection becomes active once it is complete. If the run is interrupted,
+# running the same command again resumes it.
+#
+# Stop Aurora before migrating. A process that still has the store open
+# notices the swap on its next write: it follows the new collection if it
+# already embeds with the new model and refuses to write otherwise, but what it
+# wrote during the final catch-up is not migrated.
+#
+# Usage:
+#   python migrate_embeddings.py
+#   python migrate_embeddings.py --status
+#   python migrate_embeddings.py --backend sentence_transformers --no-swap
+
+import argparse
+from typing import List
+
+from config import DB_PATH, EMBEDDING_BACKEND, MIGRATION_BATCH_SIZE
+from aura_engine.embedding_backends import create_embedding_backend
+from aura_engine.embedding_migration import migrate_embeddings, migration_status, read_active_collection
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Re-embed long-term memory with the configured embedding model.")
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND, choices=["lmstudio", "sentence_transformers", "hashing"],
+                        help="The embedding backend to migrate to.")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE, help="Memories per batch and checkpoint.")
+    parser.add_argument("--no-swap", action="store_true", help="Build the new collection without activating it.")
+    parser.add_argument("--status", action="store_true", help="Show the active collection and any unfinished migration.")
+    args = parser.parse_args(argv)
+
+    print("--- A.U.R.A. Engine Embedding Migration ---")
+    if args.status:
+        print(f"-> Active collection: {read_active_collection(DB_PATH, '(default)')}")
+        checkpoint = migration_status(DB_PATH)
+        if checkpoint:
+            print(f"-> Unfinished migration to '{checkpoint['embedding_model']}': {checkpoint['migrated']} memories done "
+                  f"(started {checkpoint['started']}).")
+        else:
+            print("-> No migration in progress.")
+        return
+
+    from aura_engine.memory_manager import MemoryManager
+
+    client = None
+    if args.backend == "lmstudio" or EMBEDDING_BACKEND == "lmstudio":
+        import lmstudio as lms
+        client = lms.Client()
+    memory_manager = MemoryManager(client=client)
+    target_backend = None
+    if args.backend != EMBEDDING_BACKEND:
+        target_backend = create_embedding_backend(args.backend, client=client)
+    try:
+        migrate_embeddings(memory_manager, target_backend=target_backend, batch_size=args.batch_size, swap=not args.no_swap)
+    finally:
+        memory_manager.shutdown()
+        if target_backend is not None and memory_manager.embedding_backend is not target_backend:
+            target_backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# profile_imports.py
+#
+# A startup-time profile for the A.U.R.A. Engine. Each target module is imported
+# in a fresh interpreter with `python -X importtime`, and the report shows the
+# total import cost and the heaviest packages behind it. Results can be saved
+# to a JSONL history so import-time regressions show up between runs.
+#
+# Usage:
+#   python profile_imports.py
+#   python profile_imports.py aura_engine.memory_manager --top 5 --save
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Set
+
+DEFAULT_TARGETS = [
+    "aura_engine.aurora",
+    "aura_engine.memory_manager",
+    "aura_engine.memory_consolidation",
+    "aura_engine.process_emotions",
+    "check_model_details",
+]
+HISTORY_PATH = "./traces/import_profile.jsonl"
+
+def _run_importtime(code: str) -> List[str]:
+    """Runs a snippet in a fresh interpreter and returns its `-X importtime` lines."""
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+        raise RuntimeError(f"Running '{code}' failed: {last_line}")
+    return [line for line in completed.stderr.splitlines()
+            if line.startswith("import time:") and "self [us]" not in line]
+
+
+def profile_module(module_name: str, startup_modules: Set[str] = frozenset()) -> Dict:
+    """
+    Imports a module in a fresh interpreter and parses the `-X importtime` output.
+    Modules that the bare interpreter already imports at start-up are ignored.
+
+    Returns:
+        Dict: The total import time and the self time per top-level package, in milliseconds.
+    """
+    packages: Dict[str, float] = {}
+    total_ms = 0.0
+    for line in _run_importtime(f"import {module_name}"):
+        self_us, cumulative_us, name = _split_line(line)
+        if name in startup_modules:
+            continue
+        root_package = name.split(".")[0]
+        packages[root_package] = packages.get(root_package, 0.0) + self_us / 1000
+        if name == module_name:
+            total_ms = cumulative_us / 1000
+
+    return {"module": module_name, "total_ms": total_ms, "packages_ms": packages}
+
+
+def _split_line(line: str):
+    """Splits one `-X importtime` line into (self_us, cumulative_us, module_name)."""
+    body = line[len("import time:"):]
+    self_us, cumulative_us, name = body.split("|", 2)
+    return int(self_us), int(cumulative_us), name.strip()
+
+
+def print_report(result: Dict, top: int, previous: Dict = None):
+    """Prints the import cost of one module and its heaviest packages."""
+    delta = ""
+    if previous:
+        change = result["total_ms"] - previous["total_ms"]
+        delta = f" ({change:+.1f} ms since {previous['timestamp']})"
+    print(f"\n--- {result['module']}: {result['total_ms']:.1f} ms{delta} ---")
+
+    heaviest = sorted(result["packages_ms"].items(), key=lambda item: item[1], reverse=True)[:top]
+    for package, milliseconds in heaviest:
+        print(f"   {package:<28} {milliseconds:9.1f} ms")
+
+
+def _load_history(path: str) -> Dict[str, Dict]:
+    """Returns the most recent saved profile for each module."""
+    latest = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    latest[record["module"]] = record
+    return latest
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Profile the import cost of A.U.R.A. Engine modules.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS, help="Modules to profile.")
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest packages to show per module.")
+    parser.add_argument("--save", action="store_true", help=f"Append the results to '{HISTORY_PATH}'.")
+    args = parser.parse_args(argv)
+
+    print("--- A.U.R.A. Engine Import Profile ---")
+    history = _load_history(HISTORY_PATH)
+    startup_modules = {_split_line(line)[2] for line in _run_importtime("pass")}
+    results = []
+    for module_name in args.modules:
+        try:
+            result = profile_module(module_name, startup_modules)
+        except RuntimeError as e:
+            print(f"\n❌ {e}")
+            continue
+        result["timestamp"] = datetime.now().isoformat(timespec="seconds")
+        print_report(result, args.top, history.get(module_name))
+        results.append(result)
+
+    if args.save and results:
+        os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+        with open(HISTORY_PATH, "a", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print(f"\n✅ Saved {len(results)} profiles to '{HISTORY_PATH}'.")
+
+
+if __name__ == "__main__":
+    main()
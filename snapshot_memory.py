@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# snapshot_memory.py
+#
+# Exports the A.U.R.A. Engine's long-term memory to a snapshot directory, or
+# restores one. Restoring uses the stored embeddings, so nothing is re-embedded.
+#
+# Usage:
+#   python snapshot_memory.py export ./snapshots/2026-10-17
+#   python snapshot_memory.py import ./snapshots/2026-10-17
+
+import argparse
+from typing import List
+
+from config import EMBEDDING_BACKEND
+from aura_engine.memory_manager import MemoryManager
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Export or import a long-term memory snapshot.")
+    parser.add_argument("action", choices=["export", "import"], help="Whether to write or restore a snapshot.")
+    parser.add_argument("path", help="The snapshot directory.")
+    parser.add_argument("--allow-model-mismatch", action="store_true",
+                        help="Import a snapshot that was embedded with a different model.")
+    args = parser.parse_args(argv)
+
+    print("--- A.U.R.A. Engine Memory Snapshot ---")
+    client = None
+    if EMBEDDING_BACKEND == "lmstudio":
+        import lmstudio as lms
+        client = lms.Client()
+    memory_manager = MemoryManager(client=client)
+    try:
+        if args.action == "export":
+            memory_manager.export_snapshot(args.path)
+        else:
+            memory_manager.import_snapshot(args.path, allow_model_mismatch=args.allow_model_mismatch)
+    finally:
+        memory_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
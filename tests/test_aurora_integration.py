@@ -43,6 +43,9 @@ class TestAuroraIntegration(unittest.TestCase):
 
             print("--- [TEST] Aurora instance has completed its chat loop. ---")
 
+            # Memory work runs in the background, so wait for it before verifying.
+            self.assertTrue(aurora_agent.pipeline.drain(timeout=120), "Memory pipeline did not drain.")
+
             # Verify the results *before* shutdown
             print("\n--- [VERIFY] Checking test assertions... ---")
 
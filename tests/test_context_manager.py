@@ -0,0 +1,126 @@
+# tests/test_context_manager.py (v1.0)
+#
+# An isolated test for the bounded context-window manager. A simple word
+# counter stands in for the token estimator so the budgets are easy to reason
+# about. No LM Studio server is required.
+
+import unittest
+import sys
+import os
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.context_manager import ContextWindowManager, estimate_tokens
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+class TestContextWindowManager(unittest.TestCase):
+
+    def make_manager(self, **kwargs):
+        options = dict(token_budget=60, keep_recent_turns=2, summary_max_tokens=20, token_counter=count_words)
+        options.update(kwargs)
+        return ContextWindowManager("You are Aurora.", **options)
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd"), 1)
+        self.assertEqual(estimate_tokens("abcdefgh"), 2)
+
+    def test_history_under_budget_is_kept_verbatim(self):
+        manager = self.make_manager()
+        saved = manager.add_turn("hello there", "hi Ben")
+
+        self.assertEqual(saved, 0)
+        self.assertEqual(manager.messages("next"), [
+            ("system", "You are Aurora."),
+            ("user", "hello there"),
+            ("assistant", "hi Ben"),
+            ("user", "next"),
+        ])
+
+    def test_compaction_keeps_system_prompt_and_recent_turns(self):
+        folded = []
+        def summarizer(previous_summary, turns):
+            folded.extend(turns)
+            return "Ben and Aurora talked."
+
+        manager = self.make_manager(summarizer=summarizer)
+        for i in range(8):
+            manager.add_turn(f"user message {i} " + "word " * 5, f"assistant reply {i} " + "word " * 5)
+
+        self.assertLessEqual(manager.total_tokens, manager.token_budget)
+        self.assertGreater(manager.total_tokens_saved, 0)
+        self.assertGreater(len(folded), 0)
+
+        messages = manager.messages()
+        self.assertTrue(messages[0][1].startswith("You are Aurora."))
+        self.assertIn("Ben and Aurora talked.", messages[0][1])
+        # The two most recent turns must survive verbatim.
+        self.assertEqual(messages[-2], ("user", "user message 7 " + "word " * 5))
+        self.assertEqual(messages[-3][0], "assistant")
+        self.assertTrue(messages[-4][1].startswith("user message 6"))
+
+    def test_failed_summarizer_falls_back_to_extractive_summary(self):
+        def broken_summarizer(previous_summary, turns):
+            raise RuntimeError("model unavailable")
+
+        manager = self.make_manager(summarizer=broken_summarizer)
+        for i in range(8):
+            manager.add_turn(f"Turn {i}. " + "filler " * 6, f"Reply {i}. " + "filler " * 6)
+
+        self.assertIn("Ben said:", manager.rolling_summary)
+        self.assertLessEqual(count_words(manager.rolling_summary), 20)
+        self.assertLessEqual(manager.total_tokens, manager.token_budget)
+
+    def test_recent_turns_are_never_compacted(self):
+        manager = self.make_manager(token_budget=10, keep_recent_turns=2)
+        manager.add_turn("a " * 10, "b " * 10)
+        manager.add_turn("c " * 10, "d " * 10)
+
+        self.assertEqual(manager.last_tokens_saved, 0)
+        self.assertEqual(len(manager.turns), 2)
+
+    def test_transient_context_is_not_stored(self):
+        manager = self.make_manager(token_budget=1000)
+        memory_block = "- Ben has a cat called Miso."
+
+        messages = manager.messages("what is my cat called?", transient_context=memory_block)
+        self.assertIn("LONG-TERM MEMORY CONTEXT", messages[-1][1])
+        self.assertIn(memory_block, messages[-1][1])
+
+        manager.add_turn("what is my cat called?", "Miso.", transient_context=memory_block)
+        self.assertEqual(manager.turns[0]["user"], "what is my cat called?")
+        self.assertNotIn(memory_block, str(manager.messages("next question")))
+
+    def test_transient_context_savings_are_counted(self):
+        manager = self.make_manager(token_budget=1000)
+        memory_block = "- Ben works on solar panels."
+        overhead = count_words(
+            f"--- LONG-TERM MEMORY CONTEXT ---\n{memory_block}\n--------------------\n\nBen's current prompt is: \"hi\" "
+        ) - count_words("hi")
+
+        manager.build_chat("hi", transient_context=memory_block)
+        manager.add_turn("hi", "hello", transient_context=memory_block)
+        self.assertEqual(manager.transient_context_tokens_saved, 0)
+
+        manager.build_chat("hi", transient_context=memory_block)
+        manager.add_turn("hi", "hello", transient_context=memory_block)
+        self.assertEqual(manager.transient_context_tokens_saved, overhead)
+
+        manager.build_chat("hi", transient_context=memory_block)
+        self.assertEqual(manager.transient_context_tokens_saved, 3 * overhead)
+
+    def test_build_chat_returns_sdk_chat(self):
+        manager = self.make_manager()
+        manager.add_turn("hello", "hi")
+        chat = manager.build_chat("how are you?")
+
+        roles = [message["role"] for message in chat._get_history()["messages"]]
+        self.assertEqual(roles, ["system", "user", "assistant", "user"])
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Context Window Manager Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,58 @@
+# tests/test_embedding_backends.py (v1.0)
+#
+# An isolated test for the embedding backends. The hashing backend is checked
+# directly; the LM Studio backend runs against a fake client.
+
+import unittest
+import sys
+import os
+import math
+from types import SimpleNamespace
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.embedding_backends import (
+    HashingEmbeddingBackend, LMStudioEmbeddingBackend, create_embedding_backend
+)
+
+def cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+class TestEmbeddingBackends(unittest.TestCase):
+
+    def test_hashing_backend_is_deterministic_and_normalized(self):
+        backend = HashingEmbeddingBackend(dimensions=64)
+        first, second = backend.embed(["Ben likes green tea.", "Ben likes green tea."])
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 64)
+        self.assertAlmostEqual(math.sqrt(sum(value * value for value in first)), 1.0)
+        self.assertEqual(backend.model_id, "hashing-64")
+
+    def test_hashing_backend_keeps_related_texts_close(self):
+        backend = HashingEmbeddingBackend()
+        query, related, unrelated = backend.embed([
+            "What tea does Ben like?", "Ben likes green tea.", "The server restarted at midnight."
+        ])
+        self.assertGreater(cosine(query, related), cosine(query, unrelated))
+
+    def test_lmstudio_backend_unwraps_sdk_vectors(self):
+        fake_model = SimpleNamespace(embed=lambda texts: [SimpleNamespace(embedding=[1.0, 0.0]) for _ in texts])
+        client = SimpleNamespace(embedding=SimpleNamespace(model=lambda identifier: fake_model))
+        backend = LMStudioEmbeddingBackend(client, identifier="fake-embedder")
+
+        self.assertEqual(backend.embed(["a", "b"]), [[1.0, 0.0], [1.0, 0.0]])
+        self.assertEqual(backend.model_id, "fake-embedder")
+
+    def test_factory_validates_its_arguments(self):
+        self.assertIsInstance(create_embedding_backend("hashing"), HashingEmbeddingBackend)
+        with self.assertRaises(ValueError):
+            create_embedding_backend("lmstudio", client=None)
+        with self.assertRaises(ValueError):
+            create_embedding_backend("unknown")
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Embedding Backend Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
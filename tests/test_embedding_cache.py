@@ -0,0 +1,78 @@
+# tests/test_embedding_cache.py (v1.0)
+#
+# An isolated test for the persistent embedding cache. It checks LRU and SQLite
+# hits, hit-rate statistics, and that the vectors of different models are kept apart.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.embedding_cache import EmbeddingCache, text_key
+
+class TestEmbeddingCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "embedding_cache.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_miss_then_hit(self):
+        cache = EmbeddingCache("model-a", path=self.path)
+        self.assertEqual(cache.get_many(["Hello Aurora."]), {})
+        cache.put_many(["Hello Aurora."], [[0.25, 0.5, 0.75]])
+
+        found = cache.get_many(["Hello Aurora.", "Something new."])
+        self.assertEqual(found, {0: [0.25, 0.5, 0.75]})
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.stats()["hit_rate"], 1 / 3)
+        cache.close()
+
+    def test_whitespace_is_normalized_but_case_is_not(self):
+        self.assertEqual(text_key("Hello   Aurora.\n"), text_key("Hello Aurora."))
+        self.assertNotEqual(text_key("hello aurora."), text_key("Hello Aurora."))
+
+    def test_vectors_persist_across_instances(self):
+        cache = EmbeddingCache("model-a", path=self.path)
+        cache.put_many(["Ben likes tea."], [[1.0, -2.0]])
+        cache.close()
+
+        reopened = EmbeddingCache("model-a", path=self.path)
+        self.assertEqual(reopened.get_many(["Ben likes tea."]), {0: [1.0, -2.0]})
+        self.assertEqual(reopened.stats()["stored_entries"], 1)
+        reopened.close()
+
+    def test_models_share_the_file_but_not_their_vectors(self):
+        cache = EmbeddingCache("model-a", path=self.path)
+        cache.put_many(["Ben likes tea."], [[1.0, -2.0]])
+        cache.close()
+
+        other_model = EmbeddingCache("model-b", path=self.path)
+        self.assertEqual(other_model.get_many(["Ben likes tea."]), {})
+        self.assertEqual(other_model.stats()["stored_entries"], 0)
+        other_model.put_many(["Ben likes tea."], [[3.0, 4.0]])
+        other_model.close()
+
+        # Switching back to the first model finds its vectors again.
+        reopened = EmbeddingCache("model-a", path=self.path)
+        self.assertEqual(reopened.get_many(["Ben likes tea."]), {0: [1.0, -2.0]})
+        reopened.close()
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = EmbeddingCache("model-a", path=None, max_memory_entries=2)
+        cache.put_many(["a", "b"], [[1.0], [2.0]])
+        cache.get_many(["a"])
+        cache.put_many(["c"], [[3.0]])
+
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {0: [1.0], 2: [3.0]})
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Embedding Cache Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,135 @@
+# tests/test_embedding_migration.py (v1.1)
+#
+# An isolated test for embedding model stamps and the resumable re-embedding
+# migration. It migrates between two sizes of the hashing embedding backend,
+# which count as two different models.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import ACTIVE_COLLECTION_FILENAME
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+from aura_engine.embedding_migration import migrate_embeddings, migration_status, shadow_collection_name
+
+class InterruptingBackend(HashingEmbeddingBackend):
+    """A target model that fails after a number of batches, or runs a callback before each batch."""
+    def __init__(self, dimensions=128, fail_after=None, before_batch=None):
+        super().__init__(dimensions)
+        self.fail_after = fail_after
+        self.before_batch = before_batch
+        self.embedded = 0
+        self.batches = 0
+
+    def embed(self, texts):
+        if self.fail_after is not None and self.batches >= self.fail_after:
+            raise RuntimeError("simulated interruption")
+        if self.before_batch:
+            self.before_batch(self.batches)
+        self.batches += 1
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+
+class TestEmbeddingMigration(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories([
+            {"text": f"Ben told Aurora fact number {i}.", "doc_id": f"fact-{i}", "metadata": {"type": "fact"}}
+            for i in range(10)
+        ] + [{"text": "Ben's favorite drink is green tea.", "doc_id": "tea", "metadata": {"type": "fact"}}], verbose=False)
+        self.managers = [self.memory_manager]
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def stored_models(self, manager):
+        return {metadata["embedding_model"] for metadata in manager.collection.get(include=["metadatas"])["metadatas"]}
+
+    def test_memories_are_stamped_with_their_model(self):
+        self.assertEqual(self.stored_models(self.memory_manager), {"hashing-384"})
+
+    def test_migration_swaps_to_the_new_model(self):
+        target = HashingEmbeddingBackend(dimensions=128)
+        report = self.memory_manager.migrate_embeddings(target)
+
+        self.assertTrue(report["swapped"])
+        self.assertEqual(report["migrated"], 11)
+        self.assertEqual(self.memory_manager.collection.name, shadow_collection_name("genesis_memory", "hashing-128"))
+        self.assertEqual(self.stored_models(self.memory_manager), {"hashing-128"})
+        self.assertEqual(self.memory_manager.retrieve_relevant_memories("favorite drink", num_results=1)[0]['id'], "tea")
+        self.assertIsNone(migration_status(self.temp_dir))
+
+        # A restart with the new model opens the migrated collection.
+        self.memory_manager.shutdown()
+        self.managers.remove(self.memory_manager)
+        restarted = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend(dimensions=128))
+        self.managers.append(restarted)
+        self.assertEqual(restarted.collection.count(), 11)
+        self.assertEqual(len(restarted.collection.get(ids=["tea"], include=["embeddings"])["embeddings"][0]), 128)
+
+    def test_interrupted_migration_resumes(self):
+        failing = InterruptingBackend(fail_after=2)
+        with self.assertRaises(RuntimeError):
+            migrate_embeddings(self.memory_manager, target_backend=failing, batch_size=4)
+        self.assertEqual(migration_status(self.temp_dir)["migrated"], 8)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, ACTIVE_COLLECTION_FILENAME)))
+        # The live collection was never touched, so queries still work.
+        self.assertEqual(self.memory_manager.retrieve_relevant_memories("favorite drink", num_results=1)[0]['id'], "tea")
+
+        resumed = InterruptingBackend()
+        report = self.memory_manager.migrate_embeddings(resumed)
+        self.assertEqual(resumed.embedded, 3)
+        self.assertEqual(report["total"], 11)
+        self.assertTrue(report["swapped"])
+
+    def test_memories_stored_during_the_migration_are_caught_up(self):
+        def store_a_memory(batch):
+            if batch == 0:
+                self.memory_manager.add_memory("Maya visits on Sunday.", "maya", {"type": "fact"})
+                self.assertTrue(self.memory_manager.retrieve_relevant_memories("Maya", num_results=1))
+
+        report = self.memory_manager.migrate_embeddings(InterruptingBackend(before_batch=store_a_memory))
+        self.assertEqual(report["total"], 12)
+        self.assertEqual(self.stored_models(self.memory_manager), {"hashing-128"})
+
+    def test_no_swap_keeps_the_active_collection(self):
+        report = self.memory_manager.migrate_embeddings(HashingEmbeddingBackend(dimensions=128), swap=False)
+        self.assertFalse(report["swapped"])
+        self.assertEqual(self.memory_manager.collection.name, "genesis_memory")
+
+    def test_another_process_follows_the_swap_or_refuses_writes(self):
+        # Stand-ins for two other Aurora processes with the same database open.
+        old_model = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        new_model = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend(dimensions=128))
+        self.managers += [old_model, new_model]
+
+        self.memory_manager.migrate_embeddings(HashingEmbeddingBackend(dimensions=128))
+        target = shadow_collection_name("genesis_memory", "hashing-128")
+
+        result = new_model.add_memories([{"text": "Maya visits on Sunday.", "doc_id": "maya", "metadata": {"type": "fact"}}], verbose=False)
+        self.assertEqual(result["added"], ["maya"])
+        self.assertEqual(new_model.collection.name, target)
+        self.assertEqual(self.memory_manager.collection.get(ids=["maya"], include=[])["ids"], ["maya"])
+
+        result = old_model.add_memories([{"text": "Ben bought a kite.", "doc_id": "kite", "metadata": {"type": "fact"}}], verbose=False)
+        self.assertEqual(result["added"], [])
+        self.assertIn("migrated to 'hashing-128'", result["failed"]["kite"])
+        old_model.delete_memories(["tea"])
+        self.assertEqual(self.memory_manager.collection.get(ids=["tea"], include=[])["ids"], ["tea"])
+        self.assertEqual(old_model.collection.get(ids=["tea"], include=[])["ids"], ["tea"])
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Embedding Migration Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
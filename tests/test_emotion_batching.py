@@ -0,0 +1,75 @@
+# tests/test_emotion_batching.py (v1.1)
+#
+# An isolated test for batched emotion classification. A stand-in for the
+# go_emotions pipeline records every forward pass, so the test runs without
+# downloading the model.
+
+import unittest
+import sys
+import os
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine import process_emotions
+from aura_engine.process_emotions import (
+    get_emotional_overlay, get_emotional_overlays, get_emotion_scores, get_emotion_scores_batch, overlay_for_text
+)
+
+class FakeClassifier:
+    """Scores "joy" by the number of exclamation marks and records each batch."""
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+
+    def __call__(self, texts, batch_size=None, truncation=None):
+        self.batches.append(list(texts))
+        if self.fail_on and any(self.fail_on in text for text in texts):
+            raise RuntimeError("simulated failure")
+        return [
+            [{'label': 'joy', 'score': min(1.0, text.count("!") / 4)}, {'label': 'neutral', 'score': 0.35}]
+            for text in texts
+        ]
+
+
+class TestEmotionBatching(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = process_emotions.emotion_classifier
+        self.classifier = FakeClassifier()
+        process_emotions.emotion_classifier = self.classifier
+
+    def tearDown(self):
+        process_emotions.emotion_classifier = self.previous
+
+    def test_batches_are_length_bucketed_and_results_keep_input_order(self):
+        texts = ["a much longer text!!!", "hi!", "", "a medium text!!", None, "ok"]
+        overlays = get_emotional_overlays(texts, batch_size=2, verbose=False)
+        self.assertEqual(self.classifier.batches, [["ok", "hi!"], ["a medium text!!", "a much longer text!!!"]])
+        self.assertEqual([overlay[0]['label'] if overlay else None for overlay in overlays],
+                         ["joy", "neutral", None, "joy", None, "neutral"])
+        self.assertEqual(overlays[0][0]['score'], 0.75)
+
+    def test_single_text_wrapper_matches_the_batch(self):
+        texts = ["Wonderful!!!", "plain words", "Yes!!"]
+        batched = get_emotional_overlays(texts, threshold=0.3, verbose=False)
+        self.assertEqual([get_emotional_overlay(text) for text in texts], batched)
+        self.assertEqual(get_emotional_overlay("   "), [])
+
+    def test_a_failed_batch_only_affects_its_texts(self):
+        process_emotions.emotion_classifier = FakeClassifier(fail_on="boom")
+        scores = get_emotion_scores_batch(["fine!", "boom", "also fine!"], batch_size=1)
+        self.assertEqual(scores[1], {})
+        self.assertTrue(scores[0] and scores[2])
+        self.assertEqual(get_emotional_overlay("boom"), [{'label': 'error', 'score': 1.0}])
+
+    def test_overlay_from_computed_scores_matches_the_api(self):
+        # The live chat path computes the scores once and derives the overlay from them.
+        process_emotions.emotion_classifier = FakeClassifier(fail_on="boom")
+        for text in ["boom", "Great!!!", "", "plain"]:
+            self.assertEqual(overlay_for_text(text, get_emotion_scores(text)), get_emotional_overlay(text))
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Emotion Batching Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
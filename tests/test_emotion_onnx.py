@@ -0,0 +1,79 @@
+# tests/test_emotion_onnx.py (v1.0)
+#
+# A parity test for the ONNX emotion backend: on a fixed corpus, the labels
+# above the overlay threshold must match the PyTorch pipeline. The model is
+# exported and quantized into a temporary directory, so the first run needs
+# PyTorch, transformers and onnxruntime and downloads the model.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import importlib.util
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.process_emotions import overlay_from_scores
+
+_REQUIREMENTS = ("torch", "transformers", "onnxruntime")
+_AVAILABLE = all(importlib.util.find_spec(module) for module in _REQUIREMENTS)
+
+PARITY_CORPUS = [
+    "I am so happy you're here, this is a wonderful surprise and I feel so much love!",
+    "Thank you so much for helping me with the garden today.",
+    "I can't believe you forgot my birthday again.",
+    "This is disgusting, who left the milk out for a week?",
+    "I'm really nervous about the job interview tomorrow.",
+    "Wow, I never knew that octopuses have three hearts!",
+    "I'm sorry, I shouldn't have said that to you.",
+    "My grandmother passed away last night.",
+    "Can you explain how the memory consolidation works?",
+    "That joke was hilarious, I can't stop laughing.",
+    "I'm so proud of what we built together.",
+    "Ugh, the build failed for the fifth time today.",
+    "I hope tomorrow will be a better day.",
+    "The meeting is at three o'clock.",
+    "I really admire how patient you are with me.",
+    "Oh, now I finally understand what you meant.",
+]
+
+@unittest.skipUnless(_AVAILABLE, f"requires {', '.join(_REQUIREMENTS)}")
+class TestOnnxParity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from aura_engine.emotion_onnx import OnnxEmotionClassifier
+        from aura_engine.process_emotions import create_emotion_classifier
+
+        print("--- [Setup] Exporting the quantized ONNX model and loading the PyTorch pipeline ---")
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.onnx = OnnxEmotionClassifier(model_dir=cls.temp_dir, quantized=True)
+        cls.pipeline = create_emotion_classifier("transformers")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def labels(self, classifier):
+        output = classifier(PARITY_CORPUS, batch_size=8, truncation=True)
+        return [{emotion['label'] for emotion in overlay_from_scores({e['label']: e['score'] for e in scores})}
+                for scores in output]
+
+    def test_labels_above_threshold_match_pytorch(self):
+        expected, found = self.labels(self.pipeline), self.labels(self.onnx)
+        for text, expected_labels, found_labels in zip(PARITY_CORPUS, expected, found):
+            with self.subTest(text=text):
+                self.assertEqual(found_labels, expected_labels)
+
+    def test_output_format_matches_the_pipeline(self):
+        output = self.onnx(["A quiet evening at home."])
+        self.assertEqual(len(output[0]), 28)
+        scores = [emotion['score'] for emotion in output[0]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+if __name__ == "__main__":
+    print("--- Starting ONNX Emotion Backend Parity Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
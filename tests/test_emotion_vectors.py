@@ -0,0 +1,102 @@
+# tests/test_emotion_vectors.py (v1.1)
+#
+# An isolated test for the Emotional Anchor: emotion vector encoding, the
+# running emotional state, and emotion-anchored reranking in the MemoryManager
+# (on the hashing embedding backend, so no model or server is required).
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.emotion_vectors import (
+    EMOTION_DIMENSIONS, EmotionalState, scores_to_vector, encode_vector, decode_vectors, cosine_similarities
+)
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+
+class TestEmotionVectors(unittest.TestCase):
+
+    def test_vectors_round_trip_compactly(self):
+        vector = scores_to_vector({"joy": 0.9, "love": 0.5, "not-a-label": 1.0})
+        encoded = encode_vector(vector)
+
+        self.assertEqual(len(encoded), 76)
+        decoded = decode_vectors([encoded, None, "garbage"])
+        self.assertEqual(decoded.shape, (3, EMOTION_DIMENSIONS))
+        np.testing.assert_allclose(decoded[0], vector, atol=1e-3)
+        self.assertFalse(decoded[1].any() or decoded[2].any())
+
+    def test_cosine_similarities_handle_zero_rows(self):
+        matrix = np.array([[1.0, 0.0], [0.0, 1.0], [0.0, 0.0]], dtype=np.float32)
+        np.testing.assert_allclose(cosine_similarities(matrix, np.array([1.0, 0.0])), [1.0, 0.0, 0.0])
+
+    def test_emotional_state_is_a_moving_average(self):
+        state = EmotionalState(smoothing=0.5)
+        state.update(scores_to_vector({"joy": 1.0}))
+        state.update(scores_to_vector({"sadness": 1.0}))
+
+        self.assertAlmostEqual(float(state.vector[17]), 0.5)
+        self.assertEqual(set(state.dominant(2)), {"joy", "sadness"})
+
+
+class TestEmotionRerank(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories([
+            {"text": "Ben and Aurora talked about the lake trip.", "doc_id": "happy",
+             "metadata": {"type": "fact", "emotion_vector": encode_vector(scores_to_vector({"joy": 0.9}))}},
+            {"text": "Ben and Aurora talked about the lake trip again.", "doc_id": "sad",
+             "metadata": {"type": "fact", "emotion_vector": encode_vector(scores_to_vector({"sadness": 0.9}))}},
+        ])
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_state_promotes_matching_memories(self):
+        query = "the lake trip"
+        sad_state = scores_to_vector({"sadness": 1.0})
+        happy_state = scores_to_vector({"joy": 1.0})
+
+        sad_first = self.memory_manager.retrieve_relevant_memories(query, num_results=2, emotional_state=sad_state, emotion_weight=0.6)
+        happy_first = self.memory_manager.retrieve_relevant_memories(query, num_results=2, emotional_state=happy_state, emotion_weight=0.6)
+
+        self.assertEqual(sad_first[0]['id'], "sad")
+        self.assertEqual(happy_first[0]['id'], "happy")
+
+    def test_neutral_state_leaves_ranking_unchanged(self):
+        plain = self.memory_manager.retrieve_relevant_memories("the lake trip", num_results=2)
+        neutral = self.memory_manager.retrieve_relevant_memories(
+            "the lake trip", num_results=2, emotional_state=np.zeros(EMOTION_DIMENSIONS, dtype=np.float32)
+        )
+        self.assertEqual([m['id'] for m in plain], [m['id'] for m in neutral])
+
+    def test_memories_without_a_vector_are_not_demoted(self):
+        joy = encode_vector(scores_to_vector({"joy": 0.9}))
+        self.memory_manager.add_memories(
+            [{"text": "Ben's cat is called Miso.", "doc_id": "miso", "metadata": {"type": "fact"}}]
+            + [{"text": f"Ben and Aurora laughed together, moment {i}.", "doc_id": f"joy-{i}",
+                "metadata": {"type": "interaction", "emotion_vector": joy}} for i in range(8)],
+            verbose=False
+        )
+        query = "What is Ben's cat called?"
+        plain = self.memory_manager.retrieve_relevant_memories(query, num_results=3)
+        anchored = self.memory_manager.retrieve_relevant_memories(
+            query, num_results=3, emotional_state=scores_to_vector({"joy": 1.0})
+        )
+        self.assertEqual(plain[0]['id'], "miso")
+        self.assertEqual(anchored[0]['id'], "miso")
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Emotion Vector Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
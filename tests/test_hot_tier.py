@@ -0,0 +1,164 @@
+# tests/test_hot_tier.py (v1.2)
+#
+# An isolated test for the in-memory hot tier: exact search, the memory
+# ceiling, promotion and demotion, serving queries while a cold-tier query is
+# in flight, and answering from the hot tier when the cold tier is late. A late
+# cold query must not hold up the ranking, the memory context or the next turn.
+# The MemoryManager runs on the hashing embedding backend.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.hot_tier import HotTier
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.memory_context import build_memory_context
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+
+def unit(*values):
+    return list(np.asarray(values, dtype=np.float32) / np.linalg.norm(values))
+
+class TestHotTier(unittest.TestCase):
+
+    def test_search_is_exact_and_ordered(self):
+        tier = HotTier(max_bytes=1024)
+        tier.add(["x", "y", "xy"], [unit(1, 0), unit(0, 1), unit(1, 1)], ["x", "y", "xy"], [{}, {}, {}])
+
+        hits = tier.search([1.0, 0.2], k=2)
+        self.assertEqual([doc_id for doc_id, _ in hits], ["x", "xy"])
+        self.assertAlmostEqual(hits[0][1], float(np.dot(unit(1, 0), unit(1.0, 0.2))), places=5)
+
+    def test_memory_ceiling_demotes_least_recalled(self):
+        tier = HotTier(max_bytes=2 * 2 * 4)  # Room for two 2-dim vectors.
+        tier.add(["a", "b"], [unit(1, 0), unit(0, 1)], ["a", "b"], [{}, {}])
+        tier.record_recalls(["a"], {}, {})
+        tier.add(["c"], [unit(1, 1)], ["c"], [{}])
+
+        self.assertEqual(tier.capacity, 2)
+        self.assertIn("a", tier)
+        self.assertNotIn("b", tier)
+        self.assertEqual(tier.stats()["bytes"], 16)
+
+    def test_cold_memories_are_promoted_after_repeated_recalls(self):
+        tier = HotTier(max_bytes=1024, promote_after=2)
+        cold_vectors = {"cold": unit(1, 0)}
+        cold_details = {"cold": {"text": "a cold memory", "metadata": {"type": "fact"}}}
+
+        tier.record_recalls(["cold"], cold_vectors, cold_details)
+        self.assertNotIn("cold", tier)
+        tier.record_recalls(["cold"], cold_vectors, cold_details)
+        self.assertEqual(tier.get("cold")["text"], "a cold memory")
+
+    def test_unused_entries_are_demoted_by_age(self):
+        tier = HotTier(max_bytes=1024, max_age_hours=1)
+        tier.add(["old"], [unit(1, 0)], ["old"], [{}])
+        self.assertEqual(tier.demote_expired(now=time.time() + 7200), 1)
+        self.assertEqual(len(tier), 0)
+
+
+class BlockingCollection:
+    """Wraps a collection so that `query` and `get` wait until the test releases them."""
+    def __init__(self, collection):
+        self._collection = collection
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def query(self, **kwargs):
+        self.started.set()
+        self.release.wait(5)
+        return self._collection.query(**kwargs)
+
+    def get(self, **kwargs):
+        self.started.set()
+        self.release.wait(5)
+        return self._collection.get(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class TestHotTierRetrieval(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories([
+            {"text": "Ben's sister Maya visits on Sunday.", "doc_id": "maya", "metadata": {"type": "fact"}},
+            {"text": "Aurora likes rainy afternoons.", "doc_id": "rain", "metadata": {"type": "fact"}},
+        ])
+
+    def tearDown(self):
+        self.memory_manager.collection = getattr(self.memory_manager.collection, "_collection", self.memory_manager.collection)
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_new_memories_are_hot_and_retrievable(self):
+        self.assertEqual(len(self.memory_manager.hot_tier), 2)
+        retrieved = self.memory_manager.retrieve_relevant_memories("When does Maya visit?", num_results=1)
+        self.assertEqual(retrieved[0]['id'], "maya")
+
+    def test_recent_memories_are_loaded_on_restart(self):
+        restarted = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.assertEqual(len(restarted.hot_tier), 2)
+        restarted.keyword_index.close()
+
+    def test_hot_tier_serves_while_cold_query_is_in_flight(self):
+        blocking = BlockingCollection(self.memory_manager.collection)
+        self.memory_manager.collection = blocking
+        results = {}
+        worker = threading.Thread(
+            target=lambda: results.update(memories=self.memory_manager.retrieve_relevant_memories("Maya", num_results=1))
+        )
+        worker.start()
+        self.assertTrue(blocking.started.wait(5))
+
+        query_vector = self.memory_manager.embedding_backend.embed(["rainy afternoons"])[0]
+        self.assertEqual(self.memory_manager.hot_tier.search(query_vector, k=1)[0][0], "rain")
+
+        blocking.release.set()
+        worker.join(5)
+        self.assertEqual(results["memories"][0]['id'], "maya")
+
+    def test_late_cold_query_is_answered_by_the_hot_tier(self):
+        blocking = BlockingCollection(self.memory_manager.collection)
+        self.memory_manager.collection = blocking
+        self.memory_manager.cold_deadline_seconds = 0.05
+        try:
+            start = time.perf_counter()
+            retrieved = self.memory_manager.retrieve_relevant_memories("When does Maya visit?", num_results=1)
+            self.assertLess(time.perf_counter() - start, 2)
+            self.assertEqual(retrieved[0]['id'], "maya")
+            # A partial result is not cached.
+            self.assertEqual(self.memory_manager.retrieval_cache.stats()["entries"], 0)
+        finally:
+            blocking.release.set()
+
+    def test_late_cold_queries_do_not_hold_up_later_turns(self):
+        blocking = BlockingCollection(self.memory_manager.collection)
+        self.memory_manager.collection = blocking
+        self.memory_manager.cold_deadline_seconds = 0.05
+        try:
+            start = time.perf_counter()
+            for _ in range(4):
+                retrieved = self.memory_manager.retrieve_relevant_memories("Maya and the rainy afternoons", num_results=2)
+                context = build_memory_context(self.memory_manager, retrieved)
+            # Four turns finish well inside one blocked cold query.
+            self.assertLess(time.perf_counter() - start, 2)
+            self.assertEqual({memory['id'] for memory in retrieved}, {"maya", "rain"})
+            self.assertIn("Maya", context.text)
+        finally:
+            blocking.release.set()
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Hot Tier Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,123 @@
+# tests/test_interaction_pipeline.py (v1.0)
+#
+# An isolated test for the background memory pipeline. It uses simple
+# in-process processors, so no LM Studio server or database is required.
+
+import unittest
+import threading
+import time
+import sys
+import os
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.interaction_pipeline import InteractionPipeline
+
+class TestInteractionPipeline(unittest.TestCase):
+
+    def test_turns_are_processed_in_order(self):
+        """Turns must reach the processor in the order they were submitted."""
+        processed = []
+        pipeline = InteractionPipeline(processor=lambda prompt, response: processed.append(prompt))
+        for i in range(20):
+            pipeline.submit(f"prompt {i}", f"response {i}")
+
+        self.assertTrue(pipeline.shutdown(timeout=5))
+        self.assertEqual(processed, [f"prompt {i}" for i in range(20)])
+        self.assertEqual(pipeline.processed_count, 20)
+
+    def test_submit_blocks_when_queue_is_full(self):
+        """A full queue must make `submit` wait for the worker (backpressure)."""
+        release = threading.Event()
+        pipeline = InteractionPipeline(processor=lambda *args: release.wait(), max_pending=1)
+        pipeline.submit("first", "busy in the worker")
+        time.sleep(0.1)
+        pipeline.submit("second", "waiting in the queue")
+
+        third_submitted = threading.Event()
+        submitter = threading.Thread(target=lambda: (pipeline.submit("third", "blocked"), third_submitted.set()))
+        submitter.start()
+
+        self.assertFalse(third_submitted.wait(0.2), "submit() should block while the queue is full.")
+        release.set()
+        self.assertTrue(third_submitted.wait(5))
+        submitter.join()
+        self.assertTrue(pipeline.shutdown(timeout=5))
+        self.assertEqual(pipeline.processed_count, 3)
+
+    def test_drain_waits_for_pending_work(self):
+        """`drain` must not return until every submitted turn is finished."""
+        processed = []
+        def slow_processor(prompt, response):
+            time.sleep(0.05)
+            processed.append(prompt)
+
+        pipeline = InteractionPipeline(processor=slow_processor)
+        for i in range(5):
+            pipeline.submit(f"prompt {i}", "response")
+
+        self.assertTrue(pipeline.drain(timeout=5))
+        self.assertEqual(len(processed), 5)
+        self.assertEqual(pipeline.pending, 0)
+        pipeline.shutdown()
+
+    def test_drain_reports_timeout(self):
+        """`drain` returns False if the work does not finish in time."""
+        release = threading.Event()
+        pipeline = InteractionPipeline(processor=lambda *args: release.wait())
+        pipeline.submit("prompt", "response")
+
+        self.assertFalse(pipeline.drain(timeout=0.1))
+        release.set()
+        self.assertTrue(pipeline.shutdown(timeout=5))
+
+    def test_failed_turn_does_not_stop_the_worker(self):
+        """An exception in one turn must not prevent later turns from being processed."""
+        processed = []
+        def flaky_processor(prompt, response):
+            if prompt == "bad":
+                raise ValueError("simulated failure")
+            processed.append(prompt)
+
+        pipeline = InteractionPipeline(processor=flaky_processor)
+        for prompt in ["good 1", "bad", "good 2"]:
+            pipeline.submit(prompt, "response")
+
+        self.assertTrue(pipeline.shutdown(timeout=5))
+        self.assertEqual(processed, ["good 1", "good 2"])
+        self.assertEqual(pipeline.failed_count, 1)
+
+    def test_flush_callback_runs_when_idle(self):
+        """Buffered work is flushed after the pipeline has been idle for a while."""
+        flushed = threading.Event()
+        pipeline = InteractionPipeline(processor=lambda *args: None, flush_callback=flushed.set, idle_seconds=0.05)
+        pipeline.submit("prompt", "response")
+
+        self.assertTrue(flushed.wait(2), "The flush callback should run once the pipeline is idle.")
+        pipeline.shutdown()
+
+    def test_drain_flushes_after_pending_turns(self):
+        """`drain` runs the flush callback after every turn submitted before it."""
+        events = []
+        pipeline = InteractionPipeline(
+            processor=lambda prompt, response: events.append(prompt),
+            flush_callback=lambda: events.append("flush"),
+        )
+        pipeline.submit("prompt 1", "response")
+        pipeline.submit("prompt 2", "response")
+
+        self.assertTrue(pipeline.drain(timeout=5))
+        self.assertEqual(events, ["prompt 1", "prompt 2", "flush"])
+        pipeline.shutdown()
+
+    def test_submit_after_shutdown_is_rejected(self):
+        pipeline = InteractionPipeline(processor=lambda *args: None)
+        pipeline.shutdown()
+        with self.assertRaises(RuntimeError):
+            pipeline.submit("too late", "response")
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Interaction Pipeline Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
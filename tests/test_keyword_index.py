@@ -0,0 +1,89 @@
+# tests/test_keyword_index.py (v1.0)
+#
+# An isolated test for the BM25 keyword index and reciprocal rank fusion,
+# including hybrid retrieval through the MemoryManager on the hashing backend.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.keyword_index import KeywordIndex, reciprocal_rank_fusion, tokenize
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+
+class TestKeywordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "keyword_index.sqlite3")
+        self.index = KeywordIndex(self.path)
+        self.index.add_documents([
+            ("solar", "Ben said the new solar panels are 18% efficient."),
+            ("pet", "Ben's cat is called Biscuit."),
+            ("tea", "Ben prefers green tea in the morning."),
+        ])
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_tokenize_keeps_numbers_and_percentages(self):
+        self.assertEqual(tokenize("The panels are 18% efficient, about 3.5 kW."), ["panels", "18%", "efficient", "about", "3.5", "kw"])
+
+    def test_exact_terms_are_found(self):
+        self.assertEqual(self.index.search("Which thing was 18% efficient?")[0][0], "solar")
+        self.assertEqual(self.index.search("biscuit")[0][0], "pet")
+        self.assertEqual(self.index.search("the of and"), [])
+
+    def test_index_updates_incrementally_and_persists(self):
+        self.index.add_documents([("dog", "Ben's neighbor has a dog named Biscuit too.")])
+        self.index.remove_documents(["pet"])
+        self.index.close()
+
+        self.index = KeywordIndex(self.path)
+        self.assertEqual(self.index.count(), 3)
+        self.assertEqual([doc_id for doc_id, _ in self.index.search("Biscuit")], ["dog"])
+
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60)
+        self.assertEqual(fused[0][0], "c")
+        self.assertEqual({doc_id for doc_id, _ in fused}, {"a", "b", "c", "d"})
+
+
+class TestHybridRetrieval(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories([
+            {"text": f"Aurora and Ben chatted about topic number {i}.", "doc_id": f"chat-{i}", "metadata": {"type": "interaction"}}
+            for i in range(20)
+        ] + [{"text": "Ben's cat is called Biscuit.", "doc_id": "pet", "metadata": {"type": "fact"}}])
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_keyword_match_is_retrieved(self):
+        retrieved = self.memory_manager.retrieve_relevant_memories("Biscuit", num_results=3)
+        self.assertIn("pet", [memory['id'] for memory in retrieved])
+        self.assertEqual(len(retrieved), 3)
+
+    def test_index_is_resynchronized_on_restart(self):
+        self.memory_manager.keyword_index.remove_documents(["pet"])
+        self.memory_manager.keyword_index.close()
+
+        restarted = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.assertEqual(restarted.keyword_index.count(), 21)
+        restarted.keyword_index.close()
+        self.memory_manager.keyword_index = None
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Keyword Index Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,37 @@
+# tests/test_lazy_imports.py (v1.0)
+#
+# Verifies that importing the A.U.R.A. Engine modules does not pull in the heavy
+# third-party dependencies. Each check runs in a fresh interpreter, so modules
+# imported by other tests cannot hide a regression.
+
+import unittest
+import subprocess
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_MODULES = ("lmstudio", "chromadb", "transformers", "torch", "TTS", "pyaudio")
+
+def loaded_heavy_modules(import_statement: str) -> list:
+    """Runs an import in a fresh interpreter and returns the heavy modules it loaded."""
+    code = f"import sys; {import_statement}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr)
+    return [name for name in completed.stdout.strip().split(",") if name]
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_aurora_import_is_lightweight(self):
+        self.assertEqual(loaded_heavy_modules("import aura_engine.aurora"), [])
+
+    def test_memory_modules_import_is_lightweight(self):
+        self.assertEqual(loaded_heavy_modules("import aura_engine.memory_manager, aura_engine.memory_consolidation"), [])
+
+    def test_emotion_module_defers_transformers(self):
+        self.assertEqual(loaded_heavy_modules("import aura_engine.process_emotions"), [])
+
+
+if __name__ == "__main__":
+    print("--- Starting Lazy Import Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
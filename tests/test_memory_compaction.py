@@ -0,0 +1,92 @@
+# tests/test_memory_compaction.py (v1.1)
+#
+# An isolated test for near-duplicate memory compaction. It runs the
+# MemoryManager on the hashing embedding backend and a temporary database.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.memory_manager import MemoryManager, recency_weight
+from aura_engine.memory_compaction import run_compaction
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+
+def memory(doc_id, text, memory_type="interaction", timestamp="2026-01-01T10:00:00", source="live_chat"):
+    return {"text": text, "doc_id": doc_id, "metadata": {"type": memory_type, "source": source, "timestamp": timestamp}}
+
+class TestMemoryCompaction(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories([
+            memory("greet-1", "Ben greeted Aurora warmly.", timestamp="2026-01-01T09:00:00"),
+            memory("greet-2", "Ben greeted  Aurora warmly!", timestamp="2026-01-02T09:00:00"),
+            memory("greet-3", "ben greeted aurora warmly", timestamp="2026-01-03T09:00:00", source="import"),
+            memory("greet-fact", "Ben greeted Aurora warmly.", memory_type="fact"),
+            memory("tea", "Ben prefers green tea in the morning."),
+        ])
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_duplicates_are_merged_into_the_oldest_memory(self):
+        report = run_compaction(self.memory_manager, block_size=2)
+
+        self.assertEqual((report["clusters"], report["retired"]), (1, 2))
+        self.assertGreater(report["bytes_reclaimed"], 0)
+        remaining = set(self.memory_manager.collection.get(include=[])["ids"])
+        self.assertEqual(remaining, {"greet-1", "greet-fact", "tea"})
+
+        survivor = self.memory_manager.collection.get(ids=["greet-1"], include=["metadatas"])["metadatas"][0]
+        self.assertEqual(set(survivor["merged_ids"].split(",")), {"greet-2", "greet-3"})
+        self.assertEqual(survivor["merged_sources"], "import,live_chat")
+        self.assertEqual(survivor["duplicate_count"], 2)
+        self.assertEqual(self.memory_manager.keyword_index.count(), 3)
+
+    def test_runs_are_incremental(self):
+        run_compaction(self.memory_manager)
+        self.assertEqual(run_compaction(self.memory_manager)["checked"], 0)
+
+        self.memory_manager.add_memories([memory("greet-4", "Ben greeted Aurora warmly.", timestamp="2026-01-04T09:00:00")])
+        report = run_compaction(self.memory_manager)
+
+        self.assertEqual((report["checked"], report["retired"]), (1, 1))
+        survivor = self.memory_manager.collection.get(ids=["greet-1"], include=["metadatas"])["metadatas"][0]
+        self.assertEqual(survivor["duplicate_count"], 3)
+        self.assertIn("greet-4", survivor["merged_ids"])
+
+    def test_chained_clusters_only_merge_duplicates_of_the_survivor(self):
+        # At 0.8, "park" ~ "park at noon" ~ "at noon", but "park" and "at noon" are not duplicates.
+        self.memory_manager.add_memories([
+            memory("walk-1", "Ben walked the dog in the park.", timestamp="2026-02-01T09:00:00"),
+            memory("walk-2", "Ben walked the dog in the park at noon.", timestamp="2026-02-02T09:00:00"),
+            memory("walk-3", "Ben walked the dog at noon.", timestamp="2026-02-03T09:00:00"),
+        ], verbose=False)
+        run_compaction(self.memory_manager, threshold=0.8, block_size=2)
+
+        remaining = set(self.memory_manager.collection.get(include=[])["ids"])
+        self.assertTrue({"walk-1", "walk-3"} <= remaining)
+        self.assertNotIn("walk-2", remaining)
+
+    def test_survivor_is_as_recent_as_its_newest_duplicate(self):
+        run_compaction(self.memory_manager)
+        survivor = self.memory_manager.collection.get(ids=["greet-1"], include=["metadatas"])["metadatas"][0]
+        self.assertGreater(survivor["last_seen_epoch"], survivor["timestamp_epoch"])
+
+        # Measured a day after the newest duplicate, the survivor decays from that duplicate.
+        now = survivor["last_seen_epoch"] + 24 * 3600
+        as_new = {"type": "interaction", "timestamp_epoch": survivor["last_seen_epoch"]}
+        self.assertEqual(recency_weight(survivor, now, half_life_hours=24), recency_weight(as_new, now, half_life_hours=24))
+        self.assertGreater(recency_weight(survivor, now, half_life_hours=24),
+                           recency_weight({**survivor, "last_seen_epoch": survivor["timestamp_epoch"]}, now, half_life_hours=24))
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Memory Compaction Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
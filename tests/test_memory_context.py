@@ -0,0 +1,102 @@
+# tests/test_memory_context.py (v1.1)
+#
+# An isolated test for the memory context builder: MMR selection drops
+# near-duplicate memories, the packing respects the token budget, and the
+# builder reports what it used and what it dropped.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+from aura_engine.memory_context import (
+    mmr_order, pack_memories, build_memory_context, MEMORY_CONTEXT_HEADER, NO_MEMORIES_CONTEXT
+)
+from aura_engine.context_manager import estimate_tokens
+
+def memory(doc_id, text="x"):
+    return {"id": doc_id, "text": text, "metadata": {}}
+
+class TestSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.vectors = {
+            "tea": [1.0, 0.1, 0.0],
+            "tea-again": [1.0, 0.1, 0.001],
+            "maya": [0.7, 0.0, 0.7],
+        }
+
+    def test_mmr_prefers_a_diverse_second_memory(self):
+        order = mmr_order([1.0, 0.99, 0.9], [self.vectors[k] for k in ("tea", "tea-again", "maya")], lambda_mult=0.5)
+        self.assertEqual([position for position, _ in order], [0, 2, 1])
+        self.assertGreater(order[2][1], 0.99)
+
+    def test_near_duplicates_are_dropped(self):
+        memories = [memory("tea"), memory("tea-again"), memory("maya")]
+        context = pack_memories(memories, self.vectors, token_budget=500, lambda_mult=1.0)
+        self.assertEqual([m["id"] for m in context.memories], ["tea", "maya"])
+        self.assertEqual(context.dropped, [("tea-again", "redundant")])
+
+    def test_packing_respects_the_budget_and_skips_long_memories(self):
+        memories = [memory("long", "word " * 400), memory("short", "Ben likes tea."), memory("other", "Maya visits.")]
+        budget = estimate_tokens(MEMORY_CONTEXT_HEADER) + 12
+        context = pack_memories(memories, {}, token_budget=budget)
+        self.assertEqual([m["id"] for m in context.memories], ["short", "other"])
+        self.assertEqual(context.dropped, [("long", "budget")])
+        self.assertLessEqual(context.tokens, budget)
+        self.assertTrue(context.text.startswith(MEMORY_CONTEXT_HEADER))
+
+    def test_retrieval_ranking_is_the_relevance(self):
+        # A keyword hit can rank first in retrieval while its embedding is far from the rest.
+        memories = [dict(memory("exact"), score=0.05)] + [dict(memory(f"near-{i}"), score=0.03 - i * 0.001) for i in range(6)]
+        vectors = {"exact": [0.0, 0.0, 1.0]}
+        vectors.update({f"near-{i}": [1.0, 0.1 * i, 0.0] for i in range(6)})
+        context = pack_memories(memories, vectors, token_budget=500, max_memories=3)
+        self.assertEqual(context.memories[0]["id"], "exact")
+        self.assertEqual(len(context.memories), 3)
+
+    def test_no_memories(self):
+        context = pack_memories([], {})
+        self.assertEqual(context.text, NO_MEMORIES_CONTEXT)
+        context = pack_memories([memory("long", "word " * 400)], {}, token_budget=50)
+        self.assertEqual(context.text, NO_MEMORIES_CONTEXT)
+        self.assertEqual(context.dropped, [("long", "budget")])
+
+
+class TestBuildMemoryContext(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories([
+            {"text": "Ben's favorite drink is green tea.", "doc_id": "tea", "metadata": {"type": "fact"}},
+            {"text": "Ben's favorite drink is green tea!", "doc_id": "tea-again", "metadata": {"type": "summary"}},
+            {"text": "Ben drinks coffee on Mondays.", "doc_id": "coffee", "metadata": {"type": "fact"}},
+        ], verbose=False)
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_builder_uses_stored_embeddings(self):
+        query = "What does Ben drink?"
+        candidates = self.memory_manager.retrieve_relevant_memories(query, num_results=3)
+        context = build_memory_context(self.memory_manager, candidates, token_budget=500)
+        included = [m["id"] for m in context.memories]
+        self.assertIn("coffee", included)
+        self.assertEqual(len({"tea", "tea-again"} & set(included)), 1)
+        self.assertEqual(len(context.dropped), 1)
+        self.assertEqual(context.tokens, estimate_tokens(context.text))
+        self.assertIn("1 redundant", context.describe())
+        self.assertTrue(all(isinstance(m.get("score"), float) for m in candidates))
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Memory Context Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -1,42 +1,37 @@
-# tests/test_memory_manager.py (v1.2)
+# tests/test_memory_manager.py (v1.5)
 #
-# This version adds the necessary path correction.
+# This version runs the core memory test on the deterministic hashing embedding
+# backend and a temporary database, so no LM Studio server is required. Items
+# rejected in a batch are reported by position when their id is shared.
 
 import unittest
 import os
 import shutil
+import tempfile
 import uuid
 import sys
-import lmstudio as lms
+import zlib
+from types import SimpleNamespace
 
 # --- Path Correction ---
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from aura_engine.memory_manager import MemoryManager
-from config import DB_PATH, COLLECTION_NAME
+from aura_engine.embedding_backends import HashingEmbeddingBackend
 
 class TestMemoryManager(unittest.TestCase):
 
-    @classmethod
-    def setUpClass(cls):
-        """Set up the SDK client once for all tests in this class."""
-        print("--- [Setup] Initializing SDK Client for Memory Manager Test ---")
-        try:
-            cls.client = lms.Client()
-        except Exception as e:
-            raise ConnectionError(f"Could not connect to LM Studio server. Please ensure it's running. Error: {e}")
-
     def setUp(self):
         """Set up a clean environment before each test."""
         print("\n--- [Test] Preparing a clean database environment ---")
-        if os.path.exists(DB_PATH):
-            shutil.rmtree(DB_PATH)
-        self.memory_manager = MemoryManager(client=self.client)
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
 
     def tearDown(self):
         """Clean up after each test."""
         print("--- [Teardown] Shutting down memory manager ---")
         self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_add_and_retrieve_memory(self):
         """
@@ -67,11 +62,131 @@ class TestMemoryManager(unittest.TestCase):
         
         print("   ✅ Verification successful.")
 
+    def test_retrieval_ranks_related_memory_first(self):
+        """The hashing backend places texts that share words close together."""
+        self.memory_manager.add_memories([
+            {"text": "Ben's favorite drink is green tea.", "doc_id": "tea", "metadata": {"type": "fact"}},
+            {"text": "The S.P.A.R.K. Initiative builds local agents.", "doc_id": "spark", "metadata": {"type": "fact"}},
+        ])
+        retrieved = self.memory_manager.retrieve_relevant_memories("What is Ben's favorite drink?", num_results=1)
+        self.assertEqual(retrieved[0]['text'], "Ben's favorite drink is green tea.")
+
+
+class FakeEmbeddingModel:
+    """
+    Returns small deterministic vectors. Texts containing 'EMBED_FAIL' make the
+    request fail, and texts containing 'WRONG_DIM' get a vector of the wrong size.
+    """
+    def __init__(self):
+        self.requests = []
+
+    def embed(self, texts):
+        self.requests.append(list(texts))
+        if any("EMBED_FAIL" in text for text in texts):
+            raise RuntimeError("simulated embedding failure")
+        return [
+            [(zlib.crc32(f"{text}:{i}".encode()) % 1000) / 1000 for i in range(4 if "WRONG_DIM" in text else 8)]
+            for text in texts
+        ]
+
+def make_fake_client(embedding_model):
+    return SimpleNamespace(embedding=SimpleNamespace(model=lambda identifier: embedding_model))
+
+class TestBatchInsert(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.embedding_model = FakeEmbeddingModel()
+        self.memory_manager = MemoryManager(
+            client=make_fake_client(self.embedding_model),
+            db_path=self.temp_dir,
+            collection_name="test_batch_insert"
+        )
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_items(self, count):
+        return [
+            {"text": f"Batch memory number {i}.", "doc_id": f"batch-{i}", "metadata": {"type": "fact", "source": "test"}}
+            for i in range(count)
+        ]
+
+    def test_batch_uses_one_embedding_request(self):
+        result = self.memory_manager.add_memories(self.make_items(10))
+
+        self.assertEqual(len(result["added"]), 10)
+        self.assertEqual(result["failed"], {})
+        self.assertEqual(len(self.embedding_model.requests), 1)
+        self.assertEqual(self.memory_manager.collection.count(), 10)
+        self.assertGreater(result["per_second"], 0)
+
+    def test_invalid_items_fail_individually(self):
+        items = self.make_items(3)
+        items.append({"text": "", "doc_id": "empty", "metadata": {"type": "fact"}})
+        items.append({"text": "Duplicate id.", "doc_id": "batch-0", "metadata": {"type": "fact"}})
+        items.append({"text": "Bad metadata.", "doc_id": "bad-meta", "metadata": {"tags": ["a", "b"]}})
+
+        result = self.memory_manager.add_memories(items)
+
+        self.assertEqual(sorted(result["added"]), ["batch-0", "batch-1", "batch-2"])
+        # The duplicate is reported by position, so "batch-0" is only among the added ids.
+        self.assertEqual(set(result["failed"]), {"empty", "<item 4>", "bad-meta"})
+        self.assertIn("duplicate", result["failed"]["<item 4>"])
+        self.assertEqual(self.memory_manager.collection.count(), 3)
+
+    def test_rejected_item_sharing_an_id_is_reported_by_position(self):
+        items = [
+            {"text": "", "doc_id": "shared", "metadata": {"type": "fact"}},
+            {"text": "The valid copy.", "doc_id": "shared", "metadata": {"type": "fact"}},
+        ]
+
+        result = self.memory_manager.add_memories(items)
+
+        self.assertEqual(result["added"], ["shared"])
+        self.assertEqual(result["failed"], {"<item 0>": "empty text"})
+
+    def test_embedding_failure_is_isolated_to_the_failing_item(self):
+        items = self.make_items(3)
+        items.append({"text": "This one will EMBED_FAIL.", "doc_id": "poison", "metadata": {"type": "fact"}})
+
+        result = self.memory_manager.add_memories(items)
+
+        self.assertEqual(sorted(result["added"]), ["batch-0", "batch-1", "batch-2"])
+        self.assertIn("embedding failed", result["failed"]["poison"])
+        self.assertEqual(self.memory_manager.collection.count(), 3)
+
+    def test_insert_failure_is_isolated_to_the_failing_item(self):
+        self.memory_manager.add_memories(self.make_items(1))
+        items = self.make_items(3)
+        items.append({"text": "This one has the WRONG_DIM.", "doc_id": "wrong-dim", "metadata": {"type": "fact"}})
+
+        result = self.memory_manager.add_memories(items)
+
+        self.assertEqual(sorted(result["added"]), ["batch-1", "batch-2"])
+        self.assertIn("already exists", result["failed"]["batch-0"])
+        self.assertIn("insert failed", result["failed"]["wrong-dim"])
+        self.assertEqual(self.memory_manager.collection.count(), 3)
+
+    def test_repeated_texts_are_served_from_the_embedding_cache(self):
+        self.memory_manager.add_memories(self.make_items(3))
+        self.memory_manager.retrieve_relevant_memories("Batch memory number 1.", num_results=1)
+
+        self.assertEqual(len(self.embedding_model.requests), 1)
+        self.assertEqual(self.memory_manager.embedding_cache.hits, 1)
+
+    def test_add_memory_uses_the_batch_path(self):
+        self.memory_manager.add_memory("A single memory.", "single", {"type": "interaction"})
+        stored = self.memory_manager.collection.get(ids=["single"])
+        self.assertEqual(stored["documents"], ["A single memory."])
+
 
 if __name__ == "__main__":
     print("--- Starting Isolated Memory Manager Test ---")
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(TestMemoryManager))
+    suite.addTest(unittest.makeSuite(TestBatchInsert))
     runner = unittest.TextTestRunner()
     result = runner.run(suite)
     
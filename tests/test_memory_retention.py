@@ -0,0 +1,117 @@
+# tests/test_memory_retention.py (v1.0)
+#
+# An isolated test for memory retention: importance scoring, the recall
+# access log, eviction of the least important memories into the cold
+# archive, and searching the archive on demand.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+from aura_engine.emotion_vectors import EMOTION_LABELS, encode_vector
+from aura_engine.memory_retention import AccessLog, ColdArchive, importance_scores, run_retention
+
+def emotion(label, value):
+    vector = np.zeros(len(EMOTION_LABELS), dtype=np.float32)
+    vector[EMOTION_LABELS.index(label)] = value
+    return encode_vector(vector)
+
+class TestImportance(unittest.TestCase):
+
+    def test_each_factor_raises_the_score(self):
+        now = time.time()
+        old = now - 365 * 24 * 3600
+        metadatas = [
+            {"type": "interaction", "timestamp_epoch": old},
+            {"type": "fact", "timestamp_epoch": old},
+            {"type": "interaction", "timestamp_epoch": now},
+            {"type": "interaction", "timestamp_epoch": old},
+            {"type": "interaction", "timestamp_epoch": old, "emotion_vector": emotion("grief", 0.9)},
+            {"type": "interaction", "timestamp_epoch": old, "emotion_vector": emotion("neutral", 0.9)},
+        ]
+        ids = [f"m{i}" for i in range(len(metadatas))]
+        scores = importance_scores(metadatas, {"m3": (5, old)}, ids, now=now)
+        for better in (1, 2, 3, 4):
+            self.assertGreater(scores[better], scores[0])
+        self.assertAlmostEqual(scores[5], scores[0], places=6)
+
+    def test_access_log_accumulates_and_forgets(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            log = AccessLog(os.path.join(temp_dir, "access.sqlite3"))
+            log.record(["a", "b"], now=10.0)
+            log.flush()
+            log.record(["a"], now=20.0)
+            self.assertEqual(log.counts(), {"a": (2, 20.0), "b": (1, 10.0)})
+            log.forget(["a"])
+            log.close()
+            self.assertEqual(AccessLog(os.path.join(temp_dir, "access.sqlite3")).counts(), {"b": (1, 10.0)})
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestRetention(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories(
+            [{"text": f"Ben said hello again, greeting number {i}.", "doc_id": f"hello-{i}", "metadata": {"type": "interaction"}}
+             for i in range(8)]
+            + [{"text": "Ben's favorite drink is green tea.", "doc_id": "tea", "metadata": {"type": "fact"}},
+               {"text": "Maya visits every Sunday afternoon.", "doc_id": "maya", "metadata": {"type": "interaction"}}],
+            verbose=False
+        )
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_least_important_memories_move_to_the_archive(self):
+        # A recalled interaction outranks the ones nobody asked about.
+        self.memory_manager.retrieve_relevant_memories("When does Maya visit?", num_results=1)
+        report = run_retention(self.memory_manager, max_memories=5, target_ratio=0.8)
+        self.assertEqual(report["archived"], 6)
+        self.assertEqual(report["live"], 4)
+        live = set(self.memory_manager.collection.get(include=[])["ids"])
+        self.assertTrue({"tea", "maya"} <= live)
+        self.assertEqual(report["archive_total"], 6)
+
+        # Archived memories are out of normal retrieval but can still be found on demand.
+        archived_id = next(f"hello-{i}" for i in range(8) if f"hello-{i}" not in live)
+        number = archived_id.split("-")[1]
+        retrieved = self.memory_manager.retrieve_relevant_memories(f"greeting number {number}", num_results=4)
+        self.assertNotIn(archived_id, [memory['id'] for memory in retrieved])
+        found = self.memory_manager.search_archive(f"Ben said hello again, greeting number {number}.", num_results=1)
+        self.assertEqual(found[0]['id'], archived_id)
+        self.assertGreater(found[0]['score'], 0.99)
+        self.assertEqual(self.memory_manager.search_archive("greeting", memory_types=["fact"]), [])
+
+    def test_within_the_limit_nothing_moves(self):
+        report = run_retention(self.memory_manager, max_memories=100)
+        self.assertEqual(report["archived"], 0)
+        self.assertEqual(self.memory_manager.collection.count(), 10)
+
+    def test_archive_keeps_the_latest_copy(self):
+        archive = ColdArchive(os.path.join(self.temp_dir, "archive"))
+        vectors = np.eye(3, dtype=np.float32)
+        archive.add(["a", "b"], vectors[:2], ["first a", "b"], [{}, {}])
+        archive.add(["a"], vectors[2:], ["second a"], [{"embedding_model": "other"}])
+        self.assertEqual(archive.count(), 2)
+        self.assertEqual(archive.search([0, 0, 1], n_results=1)[0]['text'], "second a")
+        self.assertEqual([m['id'] for m in archive.search([0, 0, 1], n_results=2, model_id="hashing-384")], ["b"])
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Memory Retention Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,87 @@
+# tests/test_memory_snapshot.py (v1.0)
+#
+# An isolated test for persistent shutdown and memory snapshots. It runs the
+# MemoryManager on the hashing embedding backend and temporary directories.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.memory_snapshot import MANIFEST_FILE
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+
+class TestMemorySnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.temp_dir, "source_db")
+        self.snapshot_path = os.path.join(self.temp_dir, "snapshot")
+        self.source = MemoryManager(db_path=self.source_path, embedding_backend=HashingEmbeddingBackend())
+        self.source.add_memories([
+            {"text": f"Memory number {i} about Ben and Aurora.", "doc_id": f"memory-{i}",
+             "metadata": {"type": "fact", "source": "test", "index": i}}
+            for i in range(25)
+        ], verbose=False)
+        self.managers = [self.source]
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def open_manager(self, name, backend=None):
+        manager = MemoryManager(db_path=os.path.join(self.temp_dir, name), embedding_backend=backend or HashingEmbeddingBackend())
+        self.managers.append(manager)
+        return manager
+
+    def test_memories_survive_shutdown(self):
+        self.source.shutdown()
+        self.managers.remove(self.source)
+
+        reopened = self.open_manager("source_db")
+        self.assertEqual(reopened.collection.count(), 25)
+
+    def test_snapshot_round_trip_in_chunks(self):
+        from aura_engine.memory_snapshot import export_snapshot, import_snapshot
+        manifest = export_snapshot(self.source, self.snapshot_path, chunk_size=7)
+        self.assertEqual((manifest["count"], manifest["dimensions"]), (25, 384))
+
+        restored = self.open_manager("restored_db")
+        result = import_snapshot(restored, self.snapshot_path, chunk_size=4)
+
+        self.assertEqual(result["imported"], 25)
+        original = self.source.collection.get(ids=["memory-3"], include=["embeddings", "documents", "metadatas"])
+        copy = restored.collection.get(ids=["memory-3"], include=["embeddings", "documents", "metadatas"])
+        self.assertEqual(copy["documents"], original["documents"])
+        self.assertEqual(copy["metadatas"], original["metadatas"])
+        np.testing.assert_allclose(copy["embeddings"][0], original["embeddings"][0])
+        self.assertEqual(restored.keyword_index.count(), 25)
+        self.assertEqual(restored.retrieve_relevant_memories("Memory number 3", num_results=1)[0]['id'], "memory-3")
+
+    def test_import_is_idempotent(self):
+        self.source.export_snapshot(self.snapshot_path)
+        self.source.import_snapshot(self.snapshot_path)
+        self.assertEqual(self.source.collection.count(), 25)
+
+    def test_import_rejects_other_models_and_incomplete_snapshots(self):
+        self.source.export_snapshot(self.snapshot_path)
+        other_model = self.open_manager("other_db", backend=HashingEmbeddingBackend(dimensions=128))
+        with self.assertRaises(ValueError):
+            other_model.import_snapshot(self.snapshot_path)
+
+        os.remove(os.path.join(self.snapshot_path, MANIFEST_FILE))
+        with self.assertRaises(FileNotFoundError):
+            self.source.import_snapshot(self.snapshot_path)
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Memory Snapshot Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
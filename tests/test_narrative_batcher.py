@@ -0,0 +1,150 @@
+# tests/test_narrative_batcher.py (v1.1)
+#
+# An isolated test for batched narrative summarization. A fake model and a
+# fake memory store stand in for LM Studio and ChromaDB, so no server is required.
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.narrative_batcher import NarrativeBatcher, parse_summary_batch
+from aura_engine.tracing import Tracer, activate, load_traces
+
+class FakeModel:
+    def __init__(self, parsed=None, error=None):
+        self.parsed = parsed
+        self.error = error
+        self.calls = 0
+
+    def respond(self, history, config=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return json.dumps(self.parsed)
+
+class FakeMemory:
+    def __init__(self, failing_ids=()):
+        self.batches = []
+        self.failing_ids = set(failing_ids)
+
+    def add_memories(self, items, verbose=True):
+        self.batches.append(items)
+        failed = {item["doc_id"]: "simulated failure" for item in items if item["doc_id"] in self.failing_ids}
+        return {"added": [item["doc_id"] for item in items if item["doc_id"] not in failed], "failed": failed}
+
+def make_turn(index):
+    return {
+        "user_prompt": f"prompt {index}",
+        "agent_response": f"response {index}",
+        "doc_id": f"id-{index}",
+        "metadata": {"type": "interaction"},
+    }
+
+def fallback_summarizer(user_prompt, agent_response):
+    return f"fallback for {user_prompt}"
+
+class TestNarrativeBatcher(unittest.TestCase):
+
+    def test_batch_is_summarized_in_one_call_and_stored_in_one_batch(self):
+        parsed = {"summaries": [{"turn_index": i, "summary_text": f"summary {i}"} for i in range(3)]}
+        model, memory = FakeModel(parsed), FakeMemory()
+        batcher = NarrativeBatcher(model, memory, fallback_summarizer, batch_size=3)
+
+        for i in range(3):
+            batcher.add(make_turn(i))
+
+        self.assertEqual(model.calls, 1)
+        self.assertEqual(len(memory.batches), 1)
+        self.assertEqual([item["text"] for item in memory.batches[0]], ["summary 0", "summary 1", "summary 2"])
+        self.assertEqual([item["doc_id"] for item in memory.batches[0]], ["id-0", "id-1", "id-2"])
+        self.assertEqual(batcher.pending, [])
+
+    def test_turns_wait_until_the_batch_is_full_or_flushed(self):
+        parsed = {"summaries": [{"turn_index": 0, "summary_text": "a"}, {"turn_index": 1, "summary_text": "b"}]}
+        model, memory = FakeModel(parsed), FakeMemory()
+        batcher = NarrativeBatcher(model, memory, fallback_summarizer, batch_size=4)
+
+        batcher.add(make_turn(0))
+        batcher.add(make_turn(1))
+        self.assertEqual(memory.batches, [])
+
+        self.assertEqual(batcher.flush(), 2)
+        self.assertEqual([item["text"] for item in memory.batches[0]], ["a", "b"])
+        self.assertEqual(batcher.flush(), 0)
+
+    def test_missing_entries_fall_back_per_turn(self):
+        parsed = {"summaries": [{"turn_index": 1, "summary_text": "only the middle turn"}, {"turn_index": 7, "summary_text": "bogus"}]}
+        model, memory = FakeModel(parsed), FakeMemory()
+        batcher = NarrativeBatcher(model, memory, fallback_summarizer, batch_size=3)
+
+        for i in range(3):
+            batcher.add(make_turn(i))
+
+        texts = [item["text"] for item in memory.batches[0]]
+        self.assertEqual(texts, ["fallback for prompt 0", "only the middle turn", "fallback for prompt 2"])
+
+    def test_failed_batch_call_loses_no_turns(self):
+        model, memory = FakeModel(error=RuntimeError("malformed JSON")), FakeMemory()
+        batcher = NarrativeBatcher(model, memory, fallback_summarizer, batch_size=2)
+
+        batcher.add(make_turn(0))
+        batcher.add(make_turn(1))
+
+        texts = [item["text"] for item in memory.batches[0]]
+        self.assertEqual(texts, ["fallback for prompt 0", "fallback for prompt 1"])
+
+    def test_failed_stores_are_reported_per_turn(self):
+        parsed = {"summaries": [{"turn_index": i, "summary_text": f"summary {i}"} for i in range(2)]}
+        batcher = NarrativeBatcher(FakeModel(parsed), FakeMemory(failing_ids={"id-1"}), fallback_summarizer, batch_size=2)
+
+        output = StringIO()
+        with redirect_stdout(output):
+            batcher.add(make_turn(0))
+            batcher.add(make_turn(1))
+
+        self.assertIn("[Summarized memory stored in DB: summary 0]", output.getvalue())
+        self.assertNotIn("stored in DB: summary 1", output.getvalue())
+        self.assertIn("could not be stored (simulated failure): summary 1", output.getvalue())
+
+    def test_a_flush_is_traced_as_its_own_record(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            tracer = Tracer(trace_path=os.path.join(temp_dir, "traces.jsonl"), enabled=True)
+            parsed = {"summaries": [{"turn_index": i, "summary_text": f"summary {i}"} for i in range(2)]}
+            batcher = NarrativeBatcher(FakeModel(parsed), FakeMemory(), fallback_summarizer, batch_size=2, tracer=tracer)
+
+            turn_trace = tracer.new_turn()
+            with activate(turn_trace):
+                batcher.add(make_turn(0))
+                batcher.add(make_turn(1))
+            # An idle flush runs without any active turn.
+            batcher.add(make_turn(2))
+            batcher.flush()
+
+            self.assertEqual(turn_trace.spans, [])
+            records = load_traces(tracer.trace_path)
+            self.assertEqual([record["kind"] for record in records], ["summary_batch", "summary_batch"])
+            self.assertEqual([[entry["name"] for entry in record["spans"]] for record in records], [["summarize"], ["summarize"]])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_parse_summary_batch_accepts_json_strings(self):
+        summaries = parse_summary_batch('{"summaries": [{"turn_index": 0, "summary_text": " hello "}]}', 1)
+        self.assertEqual(summaries, {0: "hello"})
+
+    def test_parse_summary_batch_rejects_schema_violations(self):
+        with self.assertRaises(Exception):
+            parse_summary_batch({"summaries": [{"summary_text": "no index"}]}, 1)
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Narrative Batcher Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,100 @@
+# tests/test_quantization.py (v1.0)
+#
+# An isolated test for reduced-precision embedding storage: the float16 and
+# int8 codes, and the native vector store searching and rescoring with them.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.quantization import quantize, dequantize, code_bytes, recall_at_k
+from aura_engine.vector_stores import NumpyVectorStore
+
+def unit_vectors(count, dimensions=64, seed=3):
+    vectors = np.random.default_rng(seed).normal(size=(count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+class TestCodes(unittest.TestCase):
+
+    def test_int8_round_trip_error_is_within_half_a_step(self):
+        vectors = unit_vectors(50) * np.arange(1, 51, dtype=np.float32)[:, None]
+        codes, scales = quantize(vectors, "int8")
+        self.assertEqual(codes.dtype, np.int8)
+        self.assertEqual(scales.shape, (50, 1))
+        error = np.abs(dequantize(codes, scales) - vectors)
+        self.assertTrue(np.all(error <= scales / 2 + 1e-6))
+
+    def test_float16_and_zero_vectors(self):
+        vectors = np.vstack([unit_vectors(3), np.zeros((1, 64), dtype=np.float32)])
+        codes, scales = quantize(vectors, "float16")
+        self.assertIsNone(scales)
+        np.testing.assert_allclose(dequantize(codes), vectors, atol=1e-3)
+        int8_codes, int8_scales = quantize(vectors, "int8")
+        self.assertFalse(int8_codes[3].any())
+        self.assertTrue(np.isfinite(int8_scales).all())
+
+    def test_sizes_and_recall(self):
+        self.assertEqual(code_bytes(10, 768, "float32"), 30720)
+        self.assertEqual(code_bytes(10, 768, "float16"), 15360)
+        self.assertEqual(code_bytes(10, 768, "int8"), 7720)
+        self.assertEqual(recall_at_k([["a", "b"], ["c", "d"]], [["b", "x"], ["c", "d"]], k=2), 0.75)
+        with self.assertRaises(ValueError):
+            quantize(unit_vectors(1), "int4")
+
+
+class TestQuantizedStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "native")
+        self.vectors = unit_vectors(300)
+        self.ids = [f"memory-{i}" for i in range(len(self.vectors))]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fill(self, store):
+        store.add(ids=self.ids, embeddings=self.vectors, documents=self.ids, metadatas=[{"type": "fact"}] * len(self.ids))
+
+    def test_rescored_results_match_float32(self):
+        exact = NumpyVectorStore(os.path.join(self.temp_dir, "exact"), "exact", use_hnsw=False)
+        quantized = NumpyVectorStore(self.path, "quantized", use_hnsw=False, precision="int8", rescore_factor=4)
+        self.fill(exact)
+        self.fill(quantized)
+        queries = unit_vectors(20, seed=11)
+        expected = exact.query(query_embeddings=queries, n_results=10, include=["distances"])
+        found = quantized.query(query_embeddings=queries, n_results=10, include=["distances", "embeddings"])
+        self.assertGreaterEqual(recall_at_k(expected["ids"], found["ids"], k=10), 0.95)
+        # Rescored distances and returned embeddings are full precision.
+        np.testing.assert_allclose(found["distances"][0][0], expected["distances"][0][0], rtol=1e-5)
+        np.testing.assert_array_equal(found["embeddings"][0][0], self.vectors[self.ids.index(found["ids"][0][0])])
+        self.assertEqual(quantized.storage_bytes()["search"], code_bytes(300, 64, "int8"))
+        exact.close()
+        quantized.close()
+
+    def test_changing_precision_rebuilds_the_search_copy(self):
+        store = NumpyVectorStore(self.path, "native", use_hnsw=False)
+        self.fill(store)
+        store.close()
+
+        store = NumpyVectorStore(self.path, "native", use_hnsw=False, precision="float16")
+        self.assertTrue(any(filename.endswith(".f16") for filename in os.listdir(self.path)))
+        self.assertEqual(store.query(query_embeddings=[self.vectors[42]], n_results=1, include=[])["ids"][0], ["memory-42"])
+        store.close()
+
+        store = NumpyVectorStore(self.path, "native", use_hnsw=False, precision="int8", rescore_factor=1)
+        self.assertFalse(any(filename.endswith(".f16") for filename in os.listdir(self.path)))
+        self.assertEqual(store.query(query_embeddings=[self.vectors[7]], n_results=1, include=[])["ids"][0], ["memory-7"])
+        store.close()
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Quantization Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,113 @@
+# tests/test_retrieval_cache.py (v1.0)
+#
+# An isolated test for batched retrieval and the retrieval cache: several
+# queries share one embedding request and one vector store query, repeated
+# queries are answered from the cache, and every write invalidates it.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+from aura_engine.retrieval_cache import RetrievalCache
+
+class CountingBackend(HashingEmbeddingBackend):
+    """Records the texts of every embedding request."""
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def embed(self, texts):
+        self.requests.append(list(texts))
+        return super().embed(texts)
+
+
+class TestRetrievalCache(unittest.TestCase):
+
+    def test_keys_are_normalized(self):
+        cache = RetrievalCache(max_entries=4)
+        cache.put("What is Ben's  favorite drink?", (1,), [{"id": "tea"}], cache.generation)
+        self.assertEqual(cache.get(" What is Ben's favorite drink? ", (1,)), [{"id": "tea"}])
+        self.assertIsNone(cache.get("What is Ben's favorite drink?", (2,)))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_results_of_an_earlier_generation_are_dropped(self):
+        cache = RetrievalCache(max_entries=4)
+        generation = cache.generation
+        cache.invalidate()
+        cache.put("tea", (), [{"id": "tea"}], generation)
+        self.assertIsNone(cache.get("tea", ()))
+
+    def test_ttl_and_lru_eviction(self):
+        cache = RetrievalCache(max_entries=2, ttl_seconds=0.05)
+        cache.put("a", (), [], cache.generation)
+        cache.put("b", (), [], cache.generation)
+        cache.get("a", ())
+        cache.put("c", (), [], cache.generation)
+        self.assertIsNone(cache.get("b", ()))
+        self.assertEqual(cache.get("a", ()), [])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a", ()))
+
+
+class TestBatchedRetrieval(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.backend = CountingBackend()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=self.backend)
+        self.memory_manager.add_memories([
+            {"text": "Ben's favorite drink is green tea.", "doc_id": "tea", "metadata": {"type": "fact"}},
+            {"text": "Maya visits every Sunday afternoon.", "doc_id": "maya", "metadata": {"type": "fact"}},
+            {"text": "The garden has tomatoes and basil.", "doc_id": "garden", "metadata": {"type": "summary"}},
+        ], verbose=False)
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def ids(self, memories):
+        return [memory['id'] for memory in memories]
+
+    def test_batch_matches_single_queries_with_one_embedding_request(self):
+        queries = ["favorite drink", "When does Maya visit?", "tomatoes in the garden"]
+        self.backend.requests.clear()
+        batched = self.memory_manager.retrieve_many(queries, num_results=2)
+        self.assertEqual(self.backend.requests, [queries])
+
+        self.memory_manager.retrieval_cache.invalidate()
+        for query, memories in zip(queries, batched):
+            self.assertEqual(self.ids(memories), self.ids(self.memory_manager.retrieve_relevant_memories(query, num_results=2)))
+
+    def test_repeated_queries_hit_the_cache_until_a_write(self):
+        first = self.memory_manager.retrieve_relevant_memories("favorite drink", num_results=1, memory_types=["fact"])
+        self.backend.requests.clear()
+        again = self.memory_manager.retrieve_relevant_memories(" favorite  drink", num_results=1, memory_types=["fact"])
+        self.assertEqual(self.ids(again), self.ids(first))
+        self.assertEqual(self.backend.requests, [])
+        # Other options are a different entry.
+        self.memory_manager.retrieve_relevant_memories("favorite drink", num_results=2)
+        stats = self.memory_manager.retrieval_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+        self.memory_manager.add_memory("Ben also likes coffee as a favorite drink.", "coffee", {"type": "fact"})
+        self.assertEqual(self.memory_manager.retrieval_cache.stats()["entries"], 0)
+        updated = self.memory_manager.retrieve_relevant_memories("favorite drink", num_results=2, memory_types=["fact"])
+        self.assertIn("coffee", self.ids(updated))
+
+    def test_deletes_invalidate_the_cache(self):
+        self.assertEqual(self.ids(self.memory_manager.retrieve_relevant_memories("Maya", num_results=1)), ["maya"])
+        self.memory_manager.delete_memories(["maya"])
+        self.assertNotIn("maya", self.ids(self.memory_manager.retrieve_relevant_memories("Maya", num_results=1)))
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Retrieval Cache Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,88 @@
+# tests/test_retrieval_filters.py (v1.0)
+#
+# An isolated test for metadata-filtered and recency-weighted retrieval. It runs
+# the MemoryManager on the hashing embedding backend and a temporary database.
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.memory_manager import MemoryManager, build_where_filter, recency_weight
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+
+def iso_hours_ago(hours):
+    return (datetime.now() - timedelta(hours=hours)).isoformat()
+
+class TestRetrievalFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend())
+        self.memory_manager.add_memories([
+            {"text": "Ben talked about his garden and the tomatoes.", "doc_id": "old-chat",
+             "metadata": {"type": "interaction", "source": "conversation", "timestamp": iso_hours_ago(24 * 30)}},
+            {"text": "Ben talked about his garden and the roses.", "doc_id": "new-chat",
+             "metadata": {"type": "interaction", "source": "conversation", "timestamp": iso_hours_ago(1)}},
+            {"text": "Ben's garden grows tomatoes and roses.", "doc_id": "fact",
+             "metadata": {"type": "fact", "source": "consolidation", "timestamp": iso_hours_ago(24 * 60)}},
+        ])
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def retrieve_ids(self, **kwargs):
+        return [memory['id'] for memory in self.memory_manager.retrieve_relevant_memories("Ben's garden", **kwargs)]
+
+    def test_timestamps_are_stored_numerically(self):
+        stored = self.memory_manager.collection.get(ids=["new-chat"], include=["metadatas"])["metadatas"][0]
+        self.assertIsInstance(stored["timestamp_epoch"], float)
+        self.assertAlmostEqual(stored["timestamp_epoch"], time.time() - 3600, delta=60)
+
+    def test_type_and_source_filters(self):
+        self.assertEqual(self.retrieve_ids(memory_types=["fact"]), ["fact"])
+        self.assertEqual(set(self.retrieve_ids(sources=["conversation"])), {"old-chat", "new-chat"})
+
+    def test_time_range_filter(self):
+        self.assertEqual(self.retrieve_ids(since=datetime.now() - timedelta(days=7)), ["new-chat"])
+        self.assertEqual(set(self.retrieve_ids(until=datetime.now() - timedelta(days=7))), {"old-chat", "fact"})
+
+    def test_recency_decay_only_demotes_interactions(self):
+        now = time.time()
+        old_chat = {"type": "interaction", "timestamp_epoch": now - 3600 * 24 * 30}
+        old_fact = {"type": "fact", "timestamp_epoch": now - 3600 * 24 * 30}
+        self.assertAlmostEqual(recency_weight(old_chat, now, half_life_hours=72), 0.5, places=2)
+        self.assertEqual(recency_weight(old_fact, now, half_life_hours=72), 1.0)
+
+        ranked = self.retrieve_ids(num_results=3, recency_half_life_hours=72)
+        self.assertLess(ranked.index("new-chat"), ranked.index("old-chat"))
+
+    def test_existing_memories_get_numeric_timestamps_on_start(self):
+        backend = HashingEmbeddingBackend()
+        self.memory_manager.collection.add(
+            ids=["legacy"], documents=["A memory from an older version."],
+            embeddings=backend.embed(["A memory from an older version."]),
+            metadatas=[{"type": "fact", "timestamp": "2025-01-01T12:00:00"}]
+        )
+        restarted = MemoryManager(db_path=self.temp_dir, embedding_backend=backend)
+        stored = restarted.collection.get(ids=["legacy"], include=["metadatas"])["metadatas"][0]
+        self.assertEqual(stored["timestamp_epoch"], datetime(2025, 1, 1, 12).timestamp())
+        restarted.keyword_index.close()
+
+    def test_build_where_filter(self):
+        self.assertIsNone(build_where_filter())
+        self.assertEqual(build_where_filter(memory_types=["fact"]), {"type": {"$in": ["fact"]}})
+        combined = build_where_filter(memory_types=["fact"], since=100.0, until=200.0)
+        self.assertEqual(len(combined["$and"]), 3)
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Retrieval Filter Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,87 @@
+# tests/test_streaming.py (v1.0)
+#
+# An isolated test for token-streaming responses. A small fake model stands in
+# for the LM Studio handle, so no server is required.
+
+import unittest
+import time
+import sys
+import os
+from types import SimpleNamespace
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.streaming import stream_response
+
+class FakePredictionStream:
+    """Mimics the SDK's PredictionStream: iterable fragments plus a final result."""
+    def __init__(self, pieces, delay, stats):
+        self.pieces = pieces
+        self.delay = delay
+        self.stats = stats
+
+    def __iter__(self):
+        for piece in self.pieces:
+            time.sleep(self.delay)
+            yield SimpleNamespace(content=piece, tokens_count=1)
+
+    def result(self):
+        return SimpleNamespace(stats=self.stats)
+
+class FakeModel:
+    def __init__(self, pieces, delay=0.01, stats=None):
+        self.pieces = pieces
+        self.delay = delay
+        self.stats = stats
+
+    def respond_stream(self, history, config=None):
+        return FakePredictionStream(self.pieces, self.delay, self.stats)
+
+class TestStreaming(unittest.TestCase):
+
+    def test_fragments_reach_listeners_and_text_is_assembled(self):
+        received = []
+        model = FakeModel(["Hello", ", ", "Ben", "."])
+
+        text, metrics = stream_response(model, "history", listeners=[received.append])
+
+        self.assertEqual(text, "Hello, Ben.")
+        self.assertEqual(received, ["Hello", ", ", "Ben", "."])
+        self.assertEqual(metrics.token_count, 4)
+
+    def test_metrics_are_recorded(self):
+        model = FakeModel(["a", "b", "c"], delay=0.02)
+
+        text, metrics = stream_response(model, "history")
+
+        self.assertIsNotNone(metrics.time_to_first_token)
+        self.assertGreaterEqual(metrics.time_to_first_token, 0.015)
+        self.assertLess(metrics.time_to_first_token, metrics.total_seconds)
+        self.assertGreater(metrics.tokens_per_second, 0)
+        self.assertIn("TTFT", metrics.describe())
+
+    def test_server_stats_take_priority(self):
+        stats = SimpleNamespace(predicted_tokens_count=7, tokens_per_second=42.0)
+        model = FakeModel(["a", "b"], delay=0.0, stats=stats)
+
+        text, metrics = stream_response(model, "history")
+
+        self.assertEqual(metrics.token_count, 7)
+        self.assertEqual(metrics.tokens_per_second, 42.0)
+
+    def test_failing_listener_does_not_break_the_stream(self):
+        received = []
+        def broken_listener(fragment):
+            raise RuntimeError("TTS unavailable")
+
+        model = FakeModel(["one ", "two"])
+        text, metrics = stream_response(model, "history", listeners=[broken_listener, received.append])
+
+        self.assertEqual(text, "one two")
+        self.assertEqual(received, ["one ", "two"])
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Streaming Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,118 @@
+# tests/test_tracing.py (v1.1)
+#
+# An isolated test for the per-turn latency tracing layer. Traces are written
+# to a temporary file, so no server or database is required. The trace report
+# counts turns only and reports background records separately.
+
+import unittest
+import io
+import json
+from contextlib import redirect_stdout
+import tempfile
+import threading
+import shutil
+import time
+import sys
+import os
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.tracing import Tracer, activate, span, load_traces, percentile, summarize_traces
+import trace_report
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.trace_path = os.path.join(self.temp_dir, "traces", "turn_traces.jsonl")
+        self.tracer = Tracer(trace_path=self.trace_path, enabled=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_span_without_active_trace_is_a_no_op(self):
+        with span("retrieve") as attributes:
+            attributes["n_results"] = 3
+        self.assertEqual(load_traces(self.trace_path), [])
+
+    def test_spans_are_recorded_across_threads(self):
+        trace = self.tracer.new_turn()
+        with activate(trace):
+            with span("retrieve"):
+                with span("embed", texts=1):
+                    time.sleep(0.01)
+            with span("generate") as generate_span:
+                generate_span["tokens"] = 12
+
+        def background_work():
+            with activate(trace):
+                with span("summarize"):
+                    pass
+            self.tracer.finish(trace)
+
+        worker = threading.Thread(target=background_work)
+        worker.start()
+        worker.join()
+
+        records = load_traces(self.trace_path)
+        self.assertEqual(len(records), 1)
+        spans = {entry["name"]: entry for entry in records[0]["spans"]}
+        self.assertEqual(set(spans), {"retrieve", "embed", "generate", "summarize"})
+        self.assertGreaterEqual(spans["embed"]["duration"], 0.009)
+        self.assertGreaterEqual(spans["retrieve"]["duration"], spans["embed"]["duration"])
+        self.assertEqual(spans["generate"]["tokens"], 12)
+        self.assertNotEqual(spans["summarize"]["thread"], spans["generate"]["thread"])
+        self.assertEqual(records[0]["session_id"], self.tracer.session_id)
+
+    def test_disabled_tracer_creates_no_traces(self):
+        tracer = Tracer(trace_path=self.trace_path, enabled=False)
+        self.assertIsNone(tracer.new_turn())
+        tracer.finish(None)
+        self.assertFalse(os.path.exists(self.trace_path))
+
+    def test_percentile(self):
+        values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        self.assertAlmostEqual(percentile(values, 50), 5.5)
+        self.assertAlmostEqual(percentile(values, 0), 1)
+        self.assertAlmostEqual(percentile(values, 100), 10)
+        self.assertAlmostEqual(percentile([4.0], 99), 4.0)
+
+    def test_summarize_traces(self):
+        records = [
+            {"spans": [{"name": "generate", "duration": float(i)}, {"name": "store", "duration": 0.1}]}
+            for i in range(1, 101)
+        ]
+        summary = summarize_traces(records)
+        self.assertEqual(summary["generate"]["count"], 100)
+        self.assertAlmostEqual(summary["generate"]["p50"], 50.5)
+        self.assertAlmostEqual(summary["generate"]["p99"], 99.01)
+        self.assertAlmostEqual(summary["store"]["p95"], 0.1)
+
+    def test_report_counts_turns_and_lists_background_work_apart(self):
+        records = [
+            {"kind": "turn", "timestamp": "2026-01-01T10:00:00", "spans": [{"name": "generate", "duration": 1.0}]},
+            {"kind": "summary_batch", "timestamp": "2026-01-01T10:00:30", "spans": [{"name": "summarize", "duration": 4.0}]},
+            {"timestamp": "2026-01-01T10:01:00", "spans": [{"name": "generate", "duration": 2.0}]},
+            {"kind": "turn", "timestamp": "2026-01-01T10:02:00", "spans": [{"name": "generate", "duration": 3.0}]},
+            {"kind": "summary_batch", "timestamp": "2026-01-01T10:02:30", "spans": [{"name": "summarize", "duration": 5.0}]},
+        ]
+        os.makedirs(os.path.dirname(self.trace_path))
+        with open(self.trace_path, "w", encoding="utf-8") as trace_file:
+            trace_file.writelines(json.dumps(record) + "\n" for record in records)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            trace_report.main(["--file", self.trace_path, "--last", "2"])
+        report = output.getvalue()
+
+        # A record without a kind is a turn from before background records existed.
+        self.assertIn("2 turns", report)
+        self.assertIn("Background Work: 1 summary_batch records", report)
+        turn_table = report.split("Background Work")[0]
+        self.assertNotIn("summarize", turn_table)
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Tracing Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,196 @@
+# tests/test_vector_stores.py (v1.0)
+#
+# Conformance tests for the vector stores. The same cases run against the
+# ChromaDB backend and the native NumPy backend, so both keep the collection
+# behaviour the MemoryManager relies on.
+
+import unittest
+import importlib.util
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# --- Path Correction ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aura_engine.vector_stores import ChromaVectorStore, NumpyVectorStore, matches_where, create_vector_store
+from aura_engine.memory_manager import MemoryManager
+from aura_engine.embedding_backends import HashingEmbeddingBackend
+
+VECTORS = np.random.default_rng(7).normal(size=(40, 16)).astype(np.float32)
+IDS = [f"memory-{i}" for i in range(len(VECTORS))]
+DOCUMENTS = [f"Document {i}" for i in range(len(VECTORS))]
+METADATAS = [{"type": "fact" if i % 2 else "interaction", "index": i} for i in range(len(VECTORS))]
+
+class VectorStoreConformance:
+    """The cases every vector store must pass. Subclasses provide `open_store`."""
+
+    def open_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = self.open_store()
+        self.store.add(ids=IDS, embeddings=VECTORS, documents=DOCUMENTS, metadatas=METADATAS)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_count_and_get(self):
+        self.assertEqual(self.store.count(), len(IDS))
+        stored = self.store.get(ids=["memory-3", "memory-1"], include=["embeddings", "documents", "metadatas"])
+        self.assertEqual(sorted(stored["ids"]), ["memory-1", "memory-3"])
+        position = stored["ids"].index("memory-3")
+        self.assertEqual(stored["documents"][position], "Document 3")
+        self.assertEqual(stored["metadatas"][position], METADATAS[3])
+        np.testing.assert_allclose(stored["embeddings"][position], VECTORS[3])
+
+    def test_get_excludes_fields_that_were_not_requested(self):
+        stored = self.store.get(ids=["memory-0"], include=[])
+        self.assertEqual(stored["ids"], ["memory-0"])
+        self.assertIsNone(stored["documents"])
+        self.assertIsNone(stored["metadatas"])
+
+    def test_get_pages_through_every_record(self):
+        pages = [self.store.get(limit=15, offset=offset, include=[])["ids"] for offset in (0, 15, 30)]
+        self.assertEqual([len(page) for page in pages], [15, 15, 10])
+        self.assertEqual(sorted(doc_id for page in pages for doc_id in page), sorted(IDS))
+
+    def test_add_ignores_existing_ids_and_upsert_replaces(self):
+        self.store.add(ids=["memory-0"], embeddings=VECTORS[1:2], documents=["Changed"], metadatas=[{"type": "fact"}])
+        self.assertEqual(self.store.get(ids=["memory-0"])["documents"], ["Document 0"])
+        self.store.upsert(ids=["memory-0"], embeddings=VECTORS[1:2], documents=["Changed"], metadatas=[{"type": "fact"}])
+        self.assertEqual(self.store.get(ids=["memory-0"])["documents"], ["Changed"])
+        self.assertEqual(self.store.count(), len(IDS))
+
+    def test_add_rejects_a_different_dimension(self):
+        with self.assertRaises(Exception):
+            self.store.add(ids=["wrong"], embeddings=np.ones((1, 4), dtype=np.float32), documents=["x"], metadatas=[{"type": "fact"}])
+
+    def test_update_merges_metadata(self):
+        self.store.update(ids=["memory-2"], metadatas=[{"duplicate_count": 3}])
+        self.assertEqual(self.store.get(ids=["memory-2"])["metadatas"][0], {**METADATAS[2], "duplicate_count": 3})
+
+    def test_delete(self):
+        self.store.delete(ids=["memory-4", "memory-5"])
+        self.assertEqual(self.store.count(), len(IDS) - 2)
+        self.assertEqual(self.store.get(ids=["memory-4"])["ids"], [])
+
+    def test_query_returns_exact_nearest_neighbours(self):
+        query = VECTORS[5] + 0.01
+        result = self.store.query(query_embeddings=[query], n_results=5, include=["distances", "documents"])
+        expected = np.sum((VECTORS - query) ** 2, axis=1)
+        order = np.argsort(expected)[:5]
+        self.assertEqual(result["ids"][0], [IDS[i] for i in order])
+        np.testing.assert_allclose(result["distances"][0], expected[order], rtol=1e-3, atol=1e-4)
+        self.assertEqual(result["documents"][0][0], "Document 5")
+
+    def test_query_with_where_filter(self):
+        where = {"$and": [{"type": {"$in": ["fact"]}}, {"index": {"$gte": 20}}]}
+        result = self.store.query(query_embeddings=[VECTORS[0]], n_results=50, where=where, include=["metadatas"])
+        self.assertEqual(len(result["ids"][0]), 10)
+        self.assertTrue(all(metadata["type"] == "fact" and metadata["index"] >= 20 for metadata in result["metadatas"][0]))
+        self.assertEqual(len(self.store.get(where={"index": {"$lt": 5}}, include=[])["ids"]), 5)
+
+    def test_records_persist_across_reopening(self):
+        self.store.delete(ids=["memory-0"])
+        self.store.update(ids=["memory-1"], metadatas=[{"type": "summary"}])
+        self.store.close()
+        self.store = self.open_store()
+        self.assertEqual(self.store.count(), len(IDS) - 1)
+        self.assertEqual(self.store.get(ids=["memory-1"])["metadatas"][0]["type"], "summary")
+        result = self.store.query(query_embeddings=[VECTORS[7]], n_results=1, include=[])
+        self.assertEqual(result["ids"][0], ["memory-7"])
+
+
+class TestChromaVectorStore(VectorStoreConformance, unittest.TestCase):
+
+    def open_store(self):
+        return ChromaVectorStore(self.temp_dir, "conformance")
+
+
+class TestNumpyVectorStore(VectorStoreConformance, unittest.TestCase):
+
+    def open_store(self):
+        return NumpyVectorStore(os.path.join(self.temp_dir, "native"), "conformance", use_hnsw=False, block_rows=7)
+
+    def test_compaction_drops_dead_rows(self):
+        for _ in range(2):
+            self.store.upsert(ids=IDS, embeddings=VECTORS, documents=DOCUMENTS, metadatas=METADATAS)
+        self.assertEqual(self.store.dead_rows(), 2 * len(IDS))
+        self.store.close()
+        self.store = self.open_store()
+        self.assertEqual(self.store.dead_rows(), 0)
+        self.assertEqual(self.store.count(), len(IDS))
+        self.assertEqual(self.store.query(query_embeddings=[VECTORS[12]], n_results=1, include=[])["ids"][0], ["memory-12"])
+        self.assertEqual(len([f for f in os.listdir(self.store.path) if f.startswith("vectors-")]), 1)
+
+    def test_torn_log_line_is_ignored(self):
+        self.store.close()
+        with open(os.path.join(self.store.path, NumpyVectorStore.LOG_FILE), "a", encoding="utf-8") as log:
+            log.write('{"op": "add", "id": "torn"')
+        self.store = self.open_store()
+        self.assertEqual(self.store.count(), len(IDS))
+
+        # The torn line is cut off, so later writes are not lost behind it.
+        self.store.add(ids=["after"], embeddings=VECTORS[:1], documents=["After"], metadatas=[{"type": "fact"}])
+        self.store.close()
+        self.store = self.open_store()
+        self.assertEqual(self.store.get(ids=["after"])["documents"], ["After"])
+
+    @unittest.skipUnless(importlib.util.find_spec("hnswlib"), "hnswlib is not installed")
+    def test_hnsw_agrees_with_exact_search(self):
+        hnsw_store = NumpyVectorStore(os.path.join(self.temp_dir, "hnsw"), "conformance", use_hnsw=True, hnsw_min_vectors=1)
+        hnsw_store.add(ids=IDS, embeddings=VECTORS, documents=DOCUMENTS, metadatas=METADATAS)
+        exact = self.store.query(query_embeddings=[VECTORS[9]], n_results=3, include=[])
+        approximate = hnsw_store.query(query_embeddings=[VECTORS[9]], n_results=3, include=[])
+        self.assertEqual(approximate["ids"][0][0], exact["ids"][0][0])
+        hnsw_store.close()
+
+
+class TestInt8NumpyVectorStore(VectorStoreConformance, unittest.TestCase):
+    """The native store with an int8 search copy and float32 rescoring."""
+
+    def open_store(self):
+        return NumpyVectorStore(os.path.join(self.temp_dir, "native"), "conformance", use_hnsw=False, block_rows=7, precision="int8")
+
+
+class TestMatchesWhere(unittest.TestCase):
+
+    def test_operators(self):
+        metadata = {"type": "fact", "index": 4}
+        self.assertTrue(matches_where(metadata, {"type": "fact"}))
+        self.assertTrue(matches_where(metadata, {"$or": [{"type": "summary"}, {"index": {"$lte": 4}}]}))
+        self.assertFalse(matches_where(metadata, {"type": {"$nin": ["fact"]}}))
+        self.assertFalse(matches_where(metadata, {"source": {"$ne": "chat"}}))
+
+
+class TestMemoryManagerOnNativeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_manager = MemoryManager(
+            db_path=self.temp_dir, embedding_backend=HashingEmbeddingBackend(),
+            vector_store=create_vector_store(self.temp_dir, "native_memory", backend="native"),
+        )
+
+    def tearDown(self):
+        self.memory_manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_add_and_retrieve(self):
+        self.memory_manager.add_memories([
+            {"text": "Ben's favorite drink is green tea.", "doc_id": "tea", "metadata": {"type": "fact"}},
+            {"text": "The S.P.A.R.K. Initiative builds local agents.", "doc_id": "spark", "metadata": {"type": "fact"}},
+        ], verbose=False)
+        retrieved = self.memory_manager.retrieve_relevant_memories("What is Ben's favorite drink?", num_results=1, memory_types=["fact"])
+        self.assertEqual(retrieved[0]['id'], "tea")
+
+
+if __name__ == "__main__":
+    print("--- Starting Isolated Vector Store Conformance Test ---")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
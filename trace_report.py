@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# trace_report.py
+#
+# Reads the per-turn latency traces written by Aurora and prints p50/p95/p99
+# durations for every stage (retrieve, embed, generate, emotion, summarize,
+# store, ...) across all recorded sessions. Background records (a batch of
+# narrative summaries) are not turns: they are reported separately, by kind,
+# and `--last` counts turns only.
+#
+# Usage:
+#   python trace_report.py
+#   python trace_report.py --session <session_id> --last 50
+
+import argparse
+
+from config import TRACE_FILE_PATH
+from aura_engine.tracing import load_traces, summarize_traces, percentile
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report per-stage turn latency from Aurora's trace file.")
+    parser.add_argument("--file", default=TRACE_FILE_PATH, help="Path to the JSONL trace file.")
+    parser.add_argument("--session", help="Only include turns from this session id.")
+    parser.add_argument("--last", type=int, help="Only include the most recent N turns.")
+    args = parser.parse_args(argv)
+
+    records = load_traces(args.file)
+    if args.session:
+        records = [record for record in records if record.get("session_id") == args.session]
+    turns = [record for record in records if record.get("kind", "turn") == "turn"]
+    background = [record for record in records if record.get("kind", "turn") != "turn"]
+    if args.last:
+        turns = turns[-args.last:]
+        # Only the background work that ran alongside the selected turns.
+        since = turns[0].get("timestamp", "") if turns else None
+        background = [record for record in background if since is not None and record.get("timestamp", "") >= since]
+
+    if not turns and not background:
+        print(f"No turn traces found in '{args.file}'.")
+        return
+
+    sessions = {record.get("session_id") for record in turns}
+    print(f"--- Turn Latency Report: {len(turns)} turns across {len(sessions)} sessions ---\n")
+    print_stage_table(turns)
+
+    first_token_times = [
+        entry["time_to_first_token"]
+        for record in turns for entry in record.get("spans", [])
+        if entry["name"] == "generate" and entry.get("time_to_first_token") is not None
+    ]
+    if first_token_times:
+        print(
+            f"\n   Time to first token: p50 {percentile(first_token_times, 50):.3f}s | "
+            f"p95 {percentile(first_token_times, 95):.3f}s | p99 {percentile(first_token_times, 99):.3f}s"
+        )
+
+    kinds = sorted({record["kind"] for record in background})
+    for kind in kinds:
+        records_of_kind = [record for record in background if record["kind"] == kind]
+        print(f"\n--- Background Work: {len(records_of_kind)} {kind} records ---\n")
+        print_stage_table(records_of_kind)
+
+
+def print_stage_table(records):
+    """Prints count, mean and p50/p95/p99 per stage, slowest median first."""
+    print(f"   {'stage':<14} {'count':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    summary = summarize_traces(records)
+    for name, stats in sorted(summary.items(), key=lambda item: item[1]["p50"], reverse=True):
+        print(
+            f"   {name:<14} {stats['count']:>6} {stats['mean']:>8.3f}s {stats['p50']:>8.3f}s "
+            f"{stats['p95']:>8.3f}s {stats['p99']:>8.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()